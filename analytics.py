@@ -0,0 +1,202 @@
+# analytics.py
+"""
+Thống kê hàng loạt các bản ghi trong một thư mục (snapshot CSV và .rec).
+
+Mỗi file được xử lý trong một tiến trình worker, giải mã vector hóa bằng NumPy,
+tính bộ chỉ số chuẩn cho trận đấu và cho từng robot, rồi gộp vào một bảng CSV.
+Kết quả từng file được cache theo hash nội dung nên lần chạy sau chỉ xử lý file mới.
+
+Ví dụ:
+    python analytics.py data/ --output data/summary.csv
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import SAVE_DIR, SCALE, TIMESTEP
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = ".analytics_cache"
+
+MATCH_FIELDS = ['file', 'scope', 'team', 'id', 'frames', 'duration',
+                'n_blue', 'n_red', 'breach_time', 'blocked_time', 'all_blocked_time']
+ROBOT_FIELDS = ['mean_dist_to_zone', 'min_dist_to_zone', 'time_in_zone',
+                'path_length', 'mean_speed', 'p50_speed', 'p90_speed', 'max_speed']
+FIELDS = MATCH_FIELDS + ROBOT_FIELDS
+
+
+def file_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_frames(path):
+    from recording import load_csv, open_recording
+    if path.endswith(".csv"):
+        return load_csv(path)
+    return open_recording(path, mmap=False)
+
+
+def compute_metrics(header, frames, zone, block_distance):
+    """
+    Bộ chỉ số chuẩn của một bản ghi.
+
+    Returns:
+        list các dict: một dòng scope='match' rồi một dòng scope='robot' mỗi robot
+    """
+    teams = np.array([r['team'] for r in header['robots']], dtype=int)
+    ids = [r['id'] for r in header['robots']]
+    n = len(frames)
+    t = np.asarray(frames['time'], dtype=np.float64)
+    pose = np.asarray(frames['pose'], dtype=np.float64)   # (frames, robots, 3)
+    x, y = pose[..., 0], pose[..., 1]
+
+    # Thời lượng mỗi frame (frame cuối lấy bằng bước trung vị)
+    if n > 1:
+        dt = np.diff(t)
+        dt = np.append(dt, np.median(dt))
+        dt[dt < 0] = 0
+    else:
+        dt = np.full(n, TIMESTEP)
+
+    in_zone = zone.contains_many(x, y)
+    dist_zone = np.hypot(x - zone.cx, y - zone.cy)
+
+    # Khoảng cách giữa robot đỏ và xanh: (frames, red, blue)
+    red = np.flatnonzero(teams == 2)
+    blue = np.flatnonzero(teams == 1)
+    blocked = np.zeros((n, len(red)), dtype=bool)
+    if len(red) and len(blue):
+        d = np.hypot(x[:, red, None] - x[:, None, blue], y[:, red, None] - y[:, None, blue])
+        blocked = (d <= block_distance).any(axis=2)
+
+    red_in_zone = in_zone[:, red].any(axis=1) if len(red) else np.zeros(n, dtype=bool)
+    breach = float(t[np.argmax(red_in_zone)] - t[0]) if red_in_zone.any() else None
+    all_blocked = blocked.all(axis=1) if len(red) else np.zeros(n, dtype=bool)
+
+    rows = [{
+        'scope': 'match',
+        'frames': n,
+        'duration': float(t[-1] - t[0]) if n else 0.0,
+        'n_blue': len(blue),
+        'n_red': len(red),
+        'breach_time': breach,
+        'blocked_time': float((blocked * dt[:, None]).sum()),
+        'all_blocked_time': float((all_blocked * dt).sum()),
+    }]
+
+    if n > 1:
+        step = np.hypot(np.diff(x, axis=0), np.diff(y, axis=0))    # (frames-1, robots)
+        step_dt = np.diff(t)[:, None]
+        valid = step_dt[:, 0] > 0
+        speed = step[valid] / step_dt[valid]
+    else:
+        step = np.zeros((0, len(teams)))
+        speed = np.zeros((0, len(teams)))
+
+    for k in range(len(teams)):
+        s = speed[:, k]
+        rows.append({
+            'scope': 'robot',
+            'team': int(teams[k]),
+            'id': int(ids[k]),
+            'mean_dist_to_zone': float(dist_zone[:, k].mean()) if n else None,
+            'min_dist_to_zone': float(dist_zone[:, k].min()) if n else None,
+            'time_in_zone': float((in_zone[:, k] * dt).sum()),
+            'path_length': float(step[:, k].sum()),
+            'mean_speed': float(s.mean()) if len(s) else None,
+            'p50_speed': float(np.percentile(s, 50)) if len(s) else None,
+            'p90_speed': float(np.percentile(s, 90)) if len(s) else None,
+            'max_speed': float(s.max()) if len(s) else None,
+        })
+    return rows
+
+
+def analyze_file(args):
+    """Worker: trả về (path, rows, status) với status là 'cached', 'computed' hoặc thông báo lỗi."""
+    path, cache_dir = args
+    from models.field import Field
+    from models.win_evaluator import BLOCK_DISTANCE
+
+    digest = file_hash(path)
+    cache_path = os.path.join(cache_dir, f"{digest}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached.get('version') == CACHE_VERSION:
+            return path, cached['rows'], 'cached'
+
+    try:
+        header, frames = load_frames(path)
+    except (ValueError, OSError, KeyError) as e:
+        return path, [], f"error: {e}"
+    zone = Field(SCALE).target_zone
+    rows = compute_metrics(header, frames, zone, BLOCK_DISTANCE)
+
+    if cache_path:
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'rows': rows}, f)
+        os.replace(tmp, cache_path)
+    return path, rows, 'computed'
+
+
+def find_recordings(directory):
+    files = glob.glob(os.path.join(directory, "*.csv")) + glob.glob(os.path.join(directory, "*.rec"))
+    return sorted(f for f in files if not os.path.basename(f).startswith(('.', 'summary')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thống kê các bản ghi trong một thư mục")
+    parser.add_argument("directory", nargs="?", default=SAVE_DIR)
+    parser.add_argument("--output", default=None, help="mặc định <directory>/summary.csv")
+    parser.add_argument("--workers", type=int, default=None, help="mặc định = số CPU")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    files = find_recordings(args.directory)
+    output = args.output or os.path.join(args.directory, "summary.csv")
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = os.path.join(args.directory, CACHE_DIRNAME)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    tasks = [(f, cache_dir) for f in files]
+    workers = args.workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        results = [analyze_file(t) for t in tasks]
+    else:
+        with Pool(workers) as pool:
+            results = list(pool.imap_unordered(analyze_file, tasks,
+                                               chunksize=max(1, len(tasks) // (workers * 8))))
+    results.sort(key=lambda r: r[0])
+
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for path, rows, _ in results:
+            for row in rows:
+                writer.writerow({'file': os.path.basename(path), **row})
+
+    hits = sum(1 for r in results if r[2] == 'cached')
+    for path, _, status in results:
+        if status.startswith("error"):
+            print(f"[Analytics] Skipped {path}: {status}")
+    print(f"[Analytics] {len(files)} recordings ({hits} cached) -> {output} "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# batch_runner.py
+"""
+Chạy hàng loạt trận đấu headless trên nhiều tiến trình.
+
+Ví dụ:
+    python batch_runner.py --matches 2000 --attack "Potential Field" --defense Random \\
+        --max-ticks 2000 --seed 42 --output data/batch_results.npy
+
+Với --process-mode lockstep mỗi strategy chạy trong tiến trình riêng nhưng kết
+quả vẫn chỉ phụ thuộc seed.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Pool
+
+import numpy as np
+
+from config import TIMESTEP
+from models.events import SHOT, PASS, CATCH, OVERRUN
+
+RESULT_DTYPE = np.dtype([
+    ('seed', np.int64),
+    ('winner', np.int8),        # 0 = hết giờ, 1 = xanh (phòng thủ), 2 = đỏ (tấn công)
+    ('ticks', np.int32),
+    ('breach_time', np.float32),  # thời điểm đỏ vào target zone (s), NaN nếu không
+    ('blocked_time', np.float32), # tổng (robot đỏ x giây) bị chặn
+    ('shots', np.int32),          # số lần sút / chuyền / bắt bóng thành công (luồng sự kiện)
+    ('passes', np.int32),
+    ('catches', np.int32),
+    ('flow_time', np.float32),    # tổng thời gian cập nhật flow field trong trận (s)
+    ('overruns', np.int32),       # số lần strategy vượt budget_ms (StrategyManager)
+])
+
+WINNER_CODES = {None: 0, "blue": 1, "red": 2}
+
+
+def run_chunk(args):
+    """Chạy một nhóm seed trong tiến trình worker, trả về mảng RESULT_DTYPE."""
+    seeds, attack, defense, max_ticks, dt, process_mode = args
+    from models.match import Match
+    from models.flow_field import flow_field_stats
+
+    out = np.zeros(len(seeds), dtype=RESULT_DTYPE)
+    for k, seed in enumerate(seeds):
+        match = Match(attack=attack, defense=defense, seed=int(seed), dt=dt,
+                      process_mode=process_mode)
+        try:
+            match.run(max_ticks)
+        finally:
+            match.close()
+        counts = match.event_counts
+        out[k] = (seed, WINNER_CODES[match.winner], match.world.tick,
+                  match.breach_time, match.blocked_time,
+                  counts[SHOT], counts[PASS], counts[CATCH],
+                  flow_field_stats(match.world)[0], counts[OVERRUN])
+    return out
+
+
+def run_batch(matches, attack="Random", defense="Random", max_ticks=2000, seed=0,
+              workers=None, dt=TIMESTEP, chunk_size=None, process_mode=None):
+    """
+    Chạy `matches` trận với seed = seed + i, chia đều cho `workers` tiến trình.
+
+    Returns:
+        np.ndarray kiểu RESULT_DTYPE, sắp xếp theo seed.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = np.arange(seed, seed + matches, dtype=np.int64)
+    if chunk_size is None:
+        # Vài chunk mỗi worker để cân bằng tải mà không tốn nhiều IPC
+        chunk_size = max(1, matches // (workers * 4))
+    tasks = [(seeds[i:i + chunk_size], attack, defense, max_ticks, dt, process_mode)
+             for i in range(0, matches, chunk_size)]
+
+    if workers == 1:
+        parts = [run_chunk(t) for t in tasks]
+    elif process_mode:
+        # Worker của Pool là daemon, không được tạo tiến trình strategy con
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(run_chunk, tasks))
+    else:
+        with Pool(workers) as pool:
+            parts = list(pool.imap_unordered(run_chunk, tasks))
+
+    results = np.concatenate(parts) if parts else np.zeros(0, dtype=RESULT_DTYPE)
+    return np.sort(results, order='seed')
+
+
+def summarize(results, dt=TIMESTEP):
+    """Gộp kết quả: tỉ lệ thắng mỗi bên, thời gian phá vùng, thời gian bị chặn."""
+    n = len(results)
+    winner = results['winner']
+    breach = results['breach_time'][winner == 2]
+    return {
+        'matches': n,
+        'blue_win_rate': float(np.mean(winner == 1)) if n else 0.0,
+        'red_win_rate': float(np.mean(winner == 2)) if n else 0.0,
+        'timeout_rate': float(np.mean(winner == 0)) if n else 0.0,
+        'mean_breach_time': float(np.mean(breach)) if len(breach) else None,
+        'median_breach_time': float(np.median(breach)) if len(breach) else None,
+        'mean_blocked_time': float(np.mean(results['blocked_time'])) if n else 0.0,
+        'mean_match_time': float(np.mean(results['ticks']) * dt) if n else 0.0,
+        'total_shots': int(results['shots'].sum()),
+        'total_passes': int(results['passes'].sum()),
+        'total_catches': int(results['catches'].sum()),
+        # Chi phí flow field trung bình mỗi tick (ms), 0 nếu strategy không dùng
+        'flow_update_ms': float(results['flow_time'].sum() * 1e3 / max(results['ticks'].sum(), 1)),
+        'total_overruns': int(results['overruns'].sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chạy hàng loạt trận đấu headless")
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--attack", default="Random")
+    parser.add_argument("--defense", default="Random")
+    parser.add_argument("--max-ticks", type=int, default=2000, help="giới hạn tick mỗi trận")
+    parser.add_argument("--seed", type=int, default=0, help="seed của trận đầu tiên")
+    parser.add_argument("--workers", type=int, default=None, help="mặc định = số CPU")
+    parser.add_argument("--dt", type=float, default=TIMESTEP)
+    parser.add_argument("--output", default=None, help="file .npy kết quả từng trận")
+    parser.add_argument("--process-mode", choices=("async", "lockstep"), default=None,
+                        help="chạy strategy trong tiến trình riêng")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    results = run_batch(args.matches, args.attack, args.defense, args.max_ticks,
+                        args.seed, args.workers, args.dt, process_mode=args.process_mode)
+    elapsed = time.perf_counter() - t0
+
+    summary = summarize(results, args.dt)
+    summary.update(attack=args.attack, defense=args.defense, seed=args.seed,
+                   max_ticks=args.max_ticks, wall_time=elapsed)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        np.save(args.output, results)
+        with open(os.path.splitext(args.output)[0] + ".json", "w") as f:
+            json.dump(summary, f, indent=2)
+
+    print(json.dumps(summary, indent=2))
+    print(f"[Batch] {len(results)} matches in {elapsed:.1f}s "
+          f"({len(results) / max(elapsed, 1e-9):.0f} matches/s)")
+
+
+if __name__ == "__main__":
+    main()
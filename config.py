@@ -3,8 +3,27 @@ SCALE = 80
 
 FIELD_WIDTH = 22
 FIELD_HEIGHT = 14
+# Vùng robot được đi (m): |x| <= FIELD_BOUND_X, |y| <= FIELD_BOUND_Y, rộng hơn sân vẽ
+FIELD_BOUND_X = 12.0
+FIELD_BOUND_Y = 8.0
 GOAL_HEIGHT = 2.5
 GOAL_DEPTH = 0.7
 
-TIMESTEP = 0.05
+TIMESTEP = 0.05          # bước mô phỏng cố định (s)
+RENDER_INTERVAL_MS = 16  # chu kỳ vẽ trong GUI (ms), độc lập với TIMESTEP
+TURBO_BUDGET_MS = 12     # thời gian chạy tick tối đa mỗi frame ở chế độ turbo "Max" (ms)
+STRATEGY_PROCESS_MODE = "async"  # strategy của GUI: None = luồng GUI, "async" / "lockstep" = tiến trình riêng
+# Chế độ tất định của GUI: strategy chạy trong luồng GUI với seed riêng mỗi trận, không
+# bỏ lượt theo thời gian CPU; nút Save ghi input log (.ilog) thay cho pose (.rec)
+DETERMINISTIC = False
+INPUT_RATE_HZ = 500      # tần số luồng đọc tay cầm (Hz), độc lập với TIMESTEP
+INPUT_DEAD_ZONE = 0.05   # |trục| nhỏ hơn mức này coi như 0
+INPUT_SMOOTHING = 0.03   # hằng số thời gian làm mượt trục tay cầm (s), 0 = tắt
+BOT_DEADLINE_MS = 8.0    # thời gian tối đa chờ câu trả lời của bot ngoài tiến trình mỗi tick (ms)
+BOT_MAX_SPEED = 3.0      # vận tốc lớn nhất (m/s) chấp nhận từ lệnh của bot
+# Bot ngoài tiến trình (tên hiển thị -> lệnh chạy, "{python}" = trình thông dịch hiện tại);
+# đường dẫn Unix socket được thêm vào cuối lệnh
+BOT_COMMANDS = {
+    "Reference Bot": ["{python}", "reference_bot.py"],
+}
 SAVE_DIR= "data/"
\ No newline at end of file
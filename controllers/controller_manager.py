@@ -1,25 +1,20 @@
 # controllers/controller_manager.py
 
 from controllers.xbox_controller import assign_xbox_controllers
-from strategies.defense.random_defense import RandomDefenseStrategy
-from strategies.attack.random_attack import RandomAttackStrategy
+from strategies.strategy_manager import create_strategy
 
-def ControllerManager(team, mode, strategy_name, side=None, field=None):
+def ControllerManager(team, mode, strategy_name, side=None, field=None, process=None, inputs=None,
+                      seed=None):
     controllers = []
     auto_robots = []
 
     if mode == "Xbox":
-        controllers, auto_robots = assign_xbox_controllers(team)
+        controllers, auto_robots = assign_xbox_controllers(team, inputs)
     else:
         auto_robots = team.robots
 
-    strategy = None
-    if strategy_name == "Random":
-        if side == 'defense':
-            from strategies.defense.random_defense import RandomDefenseStrategy
-            strategy = RandomDefenseStrategy(team, field)
-        elif side == 'attack':
-            from strategies.attack.random_attack import RandomAttackStrategy
-            strategy = RandomAttackStrategy(team, field)
+    strategy = create_strategy(strategy_name, side, team, field, process=process, seed=seed)
+    if strategy is not None and hasattr(strategy, 'skip'):
+        strategy.skip = {robot for robot, _ in controllers}
 
     return controllers, auto_robots, strategy
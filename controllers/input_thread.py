@@ -0,0 +1,291 @@
+# controllers/input_thread.py
+"""
+Luồng đọc tay cầm riêng, tần số cao, độc lập với vòng lặp GUI.
+
+Luồng này đọc các trục của mọi tay cầm với tần số `rate_hz`, lọc (dead zone +
+làm mượt) và giữ mẫu mới nhất của mỗi slot (thứ tự cắm tay cầm). Mỗi tick
+mô phỏng chỉ lấy mẫu mới nhất bằng latest(slot), không gọi pygame. Cắm / rút
+tay cầm được xử lý theo sự kiện JOYDEVICEADDED / JOYDEVICEREMOVED, không cần
+quit()/init() lại hệ joystick.
+
+Độ trễ từ lúc đọc mẫu tới lúc pose robot được cập nhật được ghi lại bằng
+applied() và tổng hợp thành phân vị bằng latency_stats().
+
+Ví dụ (kiểm thử không cần tay cầm thật):
+    backend = VirtualBackend([VirtualJoystick([(0.0, (1.0, 0.0, 0.0))])])
+    inputs = InputThread(backend)
+    inputs.start()
+"""
+
+import math
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from config import INPUT_DEAD_ZONE, INPUT_RATE_HZ, INPUT_SMOOTHING
+
+# Trục của tay cầm Xbox (pygame): 0 = trái ngang, 1 = trái dọc (hướng xuống dương), 3 = phải ngang
+AXIS_LX, AXIS_LY, AXIS_RX = 0, 1, 3
+LATENCY_CAPACITY = 4096     # số mẫu độ trễ giữ lại để tính phân vị
+AXIS_STEPS = 32767          # trục đã lọc được làm tròn theo độ phân giải 16 bit của SDL
+
+# Mẫu đã lọc: thời điểm đọc (time_source), số thứ tự trong slot, trục trái (x phải,
+# y lên trên) và trục phải ngang, mỗi trục trong [-1, 1] và là bội của 1 / AXIS_STEPS
+# (ghi được chính xác vào input log dưới dạng int16)
+InputSample = namedtuple('InputSample', 'time seq lx ly rx')
+
+
+class PygameBackend:
+    """Tay cầm thật qua pygame.joystick; chỉ được dùng từ luồng đọc."""
+
+    def __init__(self):
+        self.started = False
+
+    def events(self):
+        """Các thay đổi từ lần gọi trước: list ('added', joystick) / ('removed', instance_id)."""
+        import pygame
+        changes = []
+        if not self.started:
+            pygame.joystick.init()
+            self.started = True
+            for i in range(pygame.joystick.get_count()):
+                changes.append(('added', pygame.joystick.Joystick(i)))
+        for event in pygame.event.get():
+            if event.type == pygame.JOYDEVICEADDED:
+                changes.append(('added', pygame.joystick.Joystick(event.device_index)))
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                changes.append(('removed', event.instance_id))
+        return changes
+
+
+class VirtualJoystick:
+    """
+    Tay cầm giả theo kịch bản, có cùng giao diện với pygame.joystick.Joystick
+    (get_axis, get_instance_id, ...), dùng cho kiểm thử và chạy không có phần cứng.
+    """
+
+    _next_id = 1000
+
+    def __init__(self, script, name="Virtual Xbox", time_source=time.perf_counter):
+        """
+        Args:
+            script: list (t, (lx, ly, rx)) giữ nguyên giá trị từ giây t (tính từ
+                lúc init()), hoặc hàm f(t) -> (lx, ly, rx). ly theo quy ước
+                pygame: dương là đẩy cần xuống.
+        """
+        self.script = script
+        self.name = name
+        self.time_source = time_source
+        self.instance_id = VirtualJoystick._next_id
+        VirtualJoystick._next_id += 1
+        self.t0 = None
+
+    def init(self):
+        if self.t0 is None:
+            self.t0 = self.time_source()
+
+    def quit(self):
+        self.t0 = None
+
+    def get_instance_id(self):
+        return self.instance_id
+
+    def get_name(self):
+        return self.name
+
+    def get_numaxes(self):
+        return 4
+
+    def _axes(self):
+        t = self.time_source() - (self.t0 if self.t0 is not None else self.time_source())
+        if callable(self.script):
+            return self.script(t)
+        axes = (0.0, 0.0, 0.0)
+        for start, values in self.script:
+            if start > t:
+                break
+            axes = values
+        return axes
+
+    def get_axis(self, axis):
+        lx, ly, rx = self._axes()
+        return {AXIS_LX: lx, AXIS_LY: ly, AXIS_RX: rx}.get(axis, 0.0)
+
+
+class VirtualBackend:
+    """Nguồn tay cầm giả: cắm / rút VirtualJoystick bất cứ lúc nào (từ luồng khác)."""
+
+    def __init__(self, joysticks=()):
+        self.pending = deque(('added', j) for j in joysticks)
+
+    def plug(self, joystick):
+        self.pending.append(('added', joystick))
+
+    def unplug(self, joystick):
+        self.pending.append(('removed', joystick.get_instance_id()))
+
+    def events(self):
+        changes = []
+        while self.pending:
+            changes.append(self.pending.popleft())
+        return changes
+
+
+class AxisFilter:
+    """Dead zone theo từng trục rồi làm mượt hàm mũ với hằng số thời gian `smoothing` (s)."""
+
+    def __init__(self, dead_zone=INPUT_DEAD_ZONE, smoothing=INPUT_SMOOTHING):
+        self.dead_zone = dead_zone
+        self.smoothing = smoothing
+        self.value = None
+        self.last_time = None
+
+    def _dead(self, v):
+        if abs(v) < self.dead_zone:
+            return 0.0
+        # Co giãn lại để ra khỏi dead zone vẫn bắt đầu từ 0, không nhảy bậc
+        return math.copysign((abs(v) - self.dead_zone) / (1.0 - self.dead_zone), v)
+
+    def __call__(self, raw, now):
+        target = [self._dead(v) for v in raw]
+        if self.value is None or self.smoothing <= 0:
+            self.value = target
+        else:
+            alpha = 1.0 - math.exp(-(now - self.last_time) / self.smoothing)
+            self.value = [v + alpha * (t - v) for v, t in zip(self.value, target)]
+            # Về đúng 0 khi thả cần, tránh trôi rất chậm
+            self.value = [0.0 if t == 0.0 and abs(v) < 1e-3 else v
+                          for v, t in zip(self.value, target)]
+        self.last_time = now
+        return self.value
+
+
+class InputThread:
+    """Luồng daemon đọc và lọc mọi tay cầm; slot k là tay cầm thứ k đang cắm."""
+
+    def __init__(self, backend=None, rate_hz=INPUT_RATE_HZ, dead_zone=INPUT_DEAD_ZONE,
+                 smoothing=INPUT_SMOOTHING, time_source=time.perf_counter):
+        """
+        Args:
+            backend: PygameBackend (mặc định) hoặc VirtualBackend
+            rate_hz (float): tần số đọc (Hz)
+            dead_zone (float): |trục| nhỏ hơn mức này coi như 0
+            smoothing (float): hằng số thời gian làm mượt (s), 0 = tắt
+        """
+        self.backend = backend if backend is not None else PygameBackend()
+        self.rate_hz = rate_hz
+        self.dead_zone = dead_zone
+        self.smoothing = smoothing
+        self.time_source = time_source
+
+        self.devices = []           # joystick theo thứ tự slot
+        self.filters = []
+        self.samples = []           # InputSample mới nhất mỗi slot (thay nguyên tuple, không cần khóa)
+        self.device_version = 0     # tăng mỗi lần cắm / rút
+        self.polls = 0
+
+        self.latency = np.zeros(LATENCY_CAPACITY)
+        self.latency_count = 0
+        self.last_applied = {}      # slot -> seq của mẫu đã được áp dụng
+
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="InputThread", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        next_time = time.perf_counter()
+        while self.running:
+            self.poll_once()
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.perf_counter()   # tụt lại: không đọc dồn
+
+    def poll_once(self):
+        """Một vòng đọc: xử lý cắm / rút rồi đọc và lọc mọi tay cầm."""
+        changes = self.backend.events()
+        if changes:
+            self._apply_changes(changes)
+
+        now = self.time_source()
+        devices, filters, samples = self.devices, self.filters, self.samples
+        for k, joystick in enumerate(devices):
+            raw = (joystick.get_axis(AXIS_LX), joystick.get_axis(AXIS_LY),
+                   joystick.get_axis(AXIS_RX))
+            lx, ly, rx = (round(v * AXIS_STEPS) / AXIS_STEPS for v in filters[k](raw, now))
+            previous = samples[k]
+            samples[k] = InputSample(now, previous.seq + 1 if previous else 0, lx, -ly, rx)
+        self.polls += 1
+
+    def _apply_changes(self, changes):
+        devices = list(self.devices)
+        for kind, item in changes:
+            if kind == 'added':
+                if any(d.get_instance_id() == item.get_instance_id() for d in devices):
+                    continue
+                item.init()
+                devices.append(item)
+            else:
+                devices = [d for d in devices if d.get_instance_id() != item]
+        # Giữ bộ lọc / mẫu của tay cầm còn cắm, slot dồn lên theo thứ tự cắm
+        old = {d.get_instance_id(): (f, s) for d, f, s in zip(self.devices, self.filters, self.samples)}
+        filters, samples = [], []
+        for d in devices:
+            f, s = old.get(d.get_instance_id(), (AxisFilter(self.dead_zone, self.smoothing), None))
+            filters.append(f)
+            samples.append(s)
+        # Đổi cả bộ danh sách một lần để luồng chính không thấy trạng thái dở dang
+        self.devices, self.filters, self.samples = devices, filters, samples
+        self.last_applied = {}
+        self.device_version += 1
+
+    @property
+    def device_count(self):
+        return len(self.devices)
+
+    def latest(self, slot):
+        """Mẫu đã lọc mới nhất của slot, None nếu slot chưa có tay cầm / chưa đọc."""
+        samples = self.samples
+        return samples[slot] if slot < len(samples) else None
+
+    def applied(self, slot, sample, now=None):
+        """
+        Báo mẫu vừa được dùng để cập nhật pose: ghi độ trễ đọc -> pose một lần
+        cho mỗi mẫu mới có cần đang được đẩy.
+        """
+        if sample is None or self.last_applied.get(slot) == sample.seq:
+            return
+        self.last_applied[slot] = sample.seq
+        if sample.lx == 0.0 and sample.ly == 0.0 and sample.rx == 0.0:
+            return
+        now = self.time_source() if now is None else now
+        self.latency[self.latency_count % LATENCY_CAPACITY] = now - sample.time
+        self.latency_count += 1
+
+    def latency_stats(self):
+        """Phân vị độ trễ đọc -> pose (ms) trên tối đa LATENCY_CAPACITY mẫu gần nhất."""
+        held = min(self.latency_count, LATENCY_CAPACITY)
+        if not held:
+            return None
+        values = self.latency[:held] * 1e3
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        return {'count': self.latency_count, 'p50_ms': float(p50), 'p95_ms': float(p95),
+                'p99_ms': float(p99), 'max_ms': float(values.max())}
@@ -1,18 +1,25 @@
-import pygame
+from config import ROBOT_SIZE, TIMESTEP
+from models.world import collision_free, inside_field
 
-def assign_xbox_controllers(team):
+MOVE_SPEED = 2.0       # m/s khi đẩy hết cần trái
+ROTATE_SPEED = 10.0    # độ/s khi đẩy hết cần phải
+
+
+def assign_xbox_controllers(team, inputs=None):
     """
-    Gán joystick Xbox cho các robot trong team. Nếu số joystick ít hơn số robot,
-    phần còn lại sẽ điều khiển tự động (automation).
-    
+    Gán tay cầm Xbox cho các robot trong team theo slot của luồng đọc tay cầm:
+    robot thứ i dùng slot i. Nếu số tay cầm ít hơn số robot, phần còn lại sẽ
+    điều khiển tự động (automation). Không khởi động lại hệ joystick; khi cắm /
+    rút tay cầm chỉ cần gọi lại hàm này.
+
+    Args:
+        inputs (InputThread): luồng đọc tay cầm, None = không có tay cầm
+
     Returns:
-        controllers: list of (robot, joystick) tuples
-        auto_robots: list of robots không có joystick
+        controllers: list of (robot, slot) tuples
+        auto_robots: list of robots không có tay cầm
     """
-    pygame.joystick.quit()
-    pygame.joystick.init()
-
-    num_joysticks = pygame.joystick.get_count()
+    num_joysticks = inputs.device_count if inputs is not None else 0
     print(f"[Xbox Controller] Found {num_joysticks} joysticks for team {team.team_id}")
 
     controllers = []
@@ -20,10 +27,28 @@ def assign_xbox_controllers(team):
 
     for i, robot in enumerate(team.robots):
         if i < num_joysticks:
-            joystick = pygame.joystick.Joystick(i)
-            joystick.init()
-            controllers.append((robot, joystick))
+            controllers.append((robot, i))
         else:
             auto_robots.append(robot)
 
     return controllers, auto_robots
+
+
+def drive_robot(world, index, lx, ly, rx, dt=TIMESTEP):
+    """
+    Di chuyển robot `index` theo trục tay cầm đã lọc (lx, ly, rx trong [-1, 1],
+    ly dương là lên trên) trong dt giây. Bỏ bước đi nếu va robot khác hoặc ra
+    ngoài sân. Dùng chung cho GUI và Match để mô phỏng lại cho cùng kết quả.
+    """
+    x_m = world.x[index] + lx * MOVE_SPEED * dt
+    y_m = world.y[index] - ly * MOVE_SPEED * dt
+
+    safe = collision_free(world, index, x_m, y_m, ROBOT_SIZE + 0.05)
+
+    if safe and inside_field(x_m, y_m):
+        world.x[index] = x_m
+        world.y[index] = y_m
+        world.grid.move(index)
+
+    if rx != 0:
+        world.theta[index] = (world.theta[index] + ROTATE_SPEED * rx * dt) % 360
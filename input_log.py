@@ -0,0 +1,419 @@
+# input_log.py
+"""
+Input log (.ilog): ghi trận đấu bằng đầu vào thay vì pose.
+
+Ở chế độ tất định (config.DETERMINISTIC) mỗi strategy có luồng ngẫu nhiên
+riêng theo seed, bước thời gian cố định và không bỏ lượt theo thời gian CPU,
+nên trận đấu chỉ phụ thuộc kịch bản + seed + tay cầm. File chỉ lưu những thứ
+đó cùng một dòng checksum để phát hiện lệch khi mô phỏng lại:
+
+    MAGIC (8 byte) | độ dài header (uint32 LE) | header JSON (utf-8)
+    | checksums (uint32 mỗi tick) | controls (CONTROL_DTYPE) | assignments (ASSIGN_DTYPE)
+
+- header: strategy hai đội, seed, dt, trạng thái lúc bắt đầu (thời gian, tick,
+  bóng, pose từng robot theo thứ tự team.robots của đội xanh rồi đội đỏ)
+  và số phần tử của ba mảng.
+- checksums[k]: CRC32 của pose robot + bóng sau tick k.
+- controls: trục tay cầm (int16, xem input_thread.AXIS_STEPS) của một robot,
+  chỉ ghi khi đổi so với lần trước; robot giữ giá trị cũ tới bản ghi kế tiếp.
+- assignments: tập robot điều khiển bằng tay của một đội, từ tick đó.
+
+Resimulation dựng lại trạng thái ở tick bất kỳ bằng cách mô phỏng lại từ
+keyframe gần nhất phía trước (bản sao đầy đủ của Match, giữ trong bộ nhớ);
+SimulatedFrames bọc nó thành nguồn frame cho Replayer.
+
+    python input_log.py info data/match_20250618_005910.ilog
+    python input_log.py verify data/match_20250618_005910.ilog
+    python input_log.py export data/match_20250618_005910.ilog   # ra .rec pose
+"""
+
+import argparse
+import copy
+import json
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from controllers.input_thread import AXIS_STEPS
+from models.events import events
+from models.flow_field import shared_flow_fields, set_shared_flow_fields
+from recording import EXTENSION as POSE_EXTENSION, frame_dtype, make_header, write_header
+
+MAGIC = b"RSIMLOG1"
+EXTENSION = ".ilog"
+KEYFRAME_INTERVAL = 100     # số tick giữa hai keyframe khi mô phỏng lại
+
+CONTROL_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('robot', 'u1'),            # vị trí trong header['robots']
+    ('axes', '<i2', (3,)),      # lx, ly, rx * AXIS_STEPS
+])
+ASSIGN_DTYPE = np.dtype([
+    ('tick', '<u4'),
+    ('team', 'u1'),
+    ('mask', '<u8'),            # bit k = robot thứ k trong header['robots']
+])
+
+
+def checksum(world, indices):
+    """CRC32 của pose các robot `indices` (theo thứ tự đó) và vị trí bóng."""
+    crc = zlib.crc32(world.x[indices].tobytes())
+    crc = zlib.crc32(world.y[indices].tobytes(), crc)
+    crc = zlib.crc32(world.theta[indices].tobytes(), crc)
+    return zlib.crc32(world.ball_pos.tobytes(), crc)
+
+
+class InputLogRecorder:
+    """
+    Ghi input log trong GUI: start() lúc bắt đầu trận (ngay sau khi tạo
+    strategy), assign() khi đổi robot điều khiển tay, control() mỗi lần áp
+    dụng tay cầm, record() sau mỗi tick; stop() ghi file.
+    """
+
+    def __init__(self, world, directory="data"):
+        self.world = world
+        self.directory = directory
+        self.armed = False      # chờ trận kế tiếp để bắt đầu ghi
+        self.saving = False
+
+    def arm(self):
+        self.armed = True
+
+    def start(self, team1, team2, attack, defense, seed, dt, path=None):
+        """Bắt đầu ghi từ trạng thái hiện tại của World (strategy vừa được tạo)."""
+        world = self.world
+        if path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.directory, f"match_{timestamp}{EXTENSION}")
+        robots = team1.robots + team2.robots
+        if len(robots) > 64:
+            raise ValueError("Input log supports at most 64 robots")
+        self.robots = robots
+        self.layout = (world.version, len(world.handles))
+        self.indices = np.array([robot.index for robot in robots], dtype=np.intp)
+        self.position = {int(i): k for k, i in enumerate(self.indices)}
+        self.header = {
+            'version': 1,
+            'attack': attack,
+            'defense': defense,
+            'seed': seed,
+            'dt': dt,
+            'start': {
+                'time': world.time,
+                'tick': world.tick,
+                'ball_pos': world.ball_pos.tolist(),
+                'ball_vel': world.ball_vel.tolist(),
+            },
+            'robots': [{'team': int(world.team[i]), 'id': int(world.robot_id[i]),
+                        'x': float(world.x[i]), 'y': float(world.y[i]),
+                        'theta': float(world.theta[i]), 'active': bool(world.active[i]),
+                        'has_ball': bool(world.has_ball[i])} for i in self.indices],
+        }
+        self.path = path
+        self.checksums = []
+        self.controls = []
+        self.assignments = []
+        self.last_axes = {}
+        self.armed = False
+        self.saving = True
+        print(f"[InputLog] Started saving to {path} (seed {seed})")
+
+    def assign(self, team_id, indices):
+        if not self.saving:
+            return
+        mask = 0
+        for i in indices:
+            mask |= 1 << self.position[int(i)]
+        self.assignments.append((len(self.checksums), team_id, mask))
+
+    def control(self, index, lx, ly, rx):
+        if not self.saving:
+            return
+        k = self.position[int(index)]
+        axes = (round(lx * AXIS_STEPS), round(ly * AXIS_STEPS), round(rx * AXIS_STEPS))
+        if self.last_axes.get(k) != axes:
+            self.last_axes[k] = axes
+            self.controls.append((len(self.checksums), k, axes))
+
+    def record(self):
+        """Gọi sau mỗi tick mô phỏng."""
+        if not self.saving:
+            return
+        world = self.world
+        if world.version != self.layout[0]:
+            # Đổi active thì vẫn ghi tiếp được; thêm / xóa robot thì không
+            if len(world.handles) != self.layout[1] or \
+                    [r.index for r in self.robots] != self.indices.tolist():
+                print("[InputLog] Robot layout changed, stopping.")
+                self.stop()
+                return
+            self.layout = (world.version, len(world.handles))
+        self.checksums.append(checksum(world, self.indices))
+
+    def stop(self):
+        """Ghi file và dừng; trả về đường dẫn file hoặc None nếu không đang ghi."""
+        self.armed = False
+        if not self.saving:
+            return None
+        self.saving = False
+        checksums = np.array(self.checksums, dtype='<u4')
+        controls = np.array(self.controls, dtype=CONTROL_DTYPE)
+        assignments = np.array(self.assignments, dtype=ASSIGN_DTYPE)
+        self.header.update(ticks=len(checksums), controls=len(controls),
+                           assignments=len(assignments))
+        data = json.dumps(self.header).encode('utf-8')
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(data)))
+            f.write(data)
+            f.write(checksums.tobytes())
+            f.write(controls.tobytes())
+            f.write(assignments.tobytes())
+        print(f"[InputLog] Stopped saving ({len(checksums)} ticks, "
+              f"{os.path.getsize(self.path)} bytes).")
+        return self.path
+
+
+def open_input_log(path):
+    """
+    Đọc file .ilog.
+
+    Returns:
+        (header, checksums, controls, assignments)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not an input log (bad magic)")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length).decode('utf-8'))
+        checksums = np.fromfile(f, dtype='<u4', count=header['ticks'])
+        controls = np.fromfile(f, dtype=CONTROL_DTYPE, count=header['controls'])
+        assignments = np.fromfile(f, dtype=ASSIGN_DTYPE, count=header['assignments'])
+    return header, checksums, controls, assignments
+
+
+class Resimulation:
+    """
+    Mô phỏng lại một input log bằng Match headless (strategy trong tiến trình,
+    không bỏ lượt theo CPU). Mỗi KEYFRAME_INTERVAL tick một bản sao đầy đủ của
+    Match được giữ lại để seek() lùi / nhảy xa chỉ phải chạy lại tối đa chừng
+    đó tick.
+    """
+
+    def __init__(self, header, controls, assignments, keyframe_interval=KEYFRAME_INTERVAL):
+        from models.match import Match
+
+        self.header = header
+        self.ticks = header['ticks']
+        self.dt = header['dt']
+        self.keyframe_interval = keyframe_interval
+
+        robots = header['robots']
+        blue = [(r['x'], r['y'], r['theta']) for r in robots if r['team'] == 1]
+        red = [(r['x'], r['y'], r['theta']) for r in robots if r['team'] == 2]
+        with events.muted():
+            match = Match(header['attack'], header['defense'], seed=header['seed'],
+                          dt=self.dt, positions_blue=blue, positions_red=red)
+        # Robot thứ k trong header <-> robot cùng vị trí trong team.robots của Match
+        self.indices = np.array([r.index for r in match.team1.robots + match.team2.robots],
+                                dtype=np.intp)
+        world = match.world
+        for k, r in enumerate(robots):
+            i = self.indices[k]
+            world.x[i], world.y[i], world.theta[i] = r['x'], r['y'], r['theta']
+            world.has_ball[i] = r['has_ball']
+            if not r['active']:
+                world.handles[i].active = False
+        start = header['start']
+        world.time = start['time']
+        world.tick = start['tick']
+        world.ball_pos[:] = start['ball_pos']
+        world.ball_vel[:] = start['ball_vel']
+        world.grid.refresh()
+        self.match = match
+
+        self.controls_at = {}
+        for tick, k, axes in controls.tolist():
+            self.controls_at.setdefault(tick, []).append((int(self.indices[k]),
+                                                          tuple(a / AXIS_STEPS for a in axes)))
+        self.assign_at = {}
+        for tick, team, mask in assignments.tolist():
+            members = {int(self.indices[k]) for k in range(len(robots)) if mask >> k & 1}
+            self.assign_at.setdefault(tick, []).append((team, members))
+
+        self.held = {}                   # chỉ số robot -> trục tay cầm đang giữ
+        self.controlled = {1: [], 2: []}  # robot điều khiển tay, theo thứ tự team.robots
+        self.done = 0                    # số tick đã chạy
+        self.keyframes = {0: self._snapshot()}
+
+    def _static(self):
+        # Field và target zone là tĩnh, dùng chung thay vì sao chép (FlowField so
+        # zone bằng `is`, bản sao sẽ làm nó tính lại từ đầu)
+        field = self.match.field
+        return {id(field): field, id(field.target_zone): field.target_zone}
+
+    def _snapshot(self):
+        # FlowField dùng chung của World được sao chép cùng Match để giữ đúng
+        # trạng thái cập nhật dần của nó
+        state = (self.match, shared_flow_fields(self.match.world), self.held,
+                 self.controlled, self.done)
+        return copy.deepcopy(state, self._static())
+
+    def _restore(self, snapshot):
+        match, flows, held, controlled, done = copy.deepcopy(snapshot, self._static())
+        set_shared_flow_fields(match.world, flows)
+        self.match, self.held, self.controlled, self.done = match, held, controlled, done
+
+    @property
+    def world(self):
+        return self.match.world
+
+    def step(self):
+        """Chạy tick kế tiếp với đúng tay cầm và robot điều khiển tay đã ghi."""
+        match = self.match
+        for team, members in self.assign_at.get(self.done, ()):
+            robots = match.team1.robots if team == 1 else match.team2.robots
+            self.controlled[team] = [r.index for r in robots if r.index in members]
+            match.set_controlled(team, self.controlled[team])
+        for index, axes in self.controls_at.get(self.done, ()):
+            self.held[index] = axes
+        controls = [(i,) + self.held.get(i, (0.0, 0.0, 0.0))
+                    for team in (1, 2) for i in self.controlled[team]]
+        with events.muted():
+            match.step(controls)
+        self.done += 1
+        if self.done % self.keyframe_interval == 0 and self.done not in self.keyframes:
+            self.keyframes[self.done] = self._snapshot()
+
+    def seek(self, frame):
+        """World sau tick `frame` (0 = sau tick đầu tiên của bản ghi)."""
+        target = frame + 1
+        base = max(k for k in self.keyframes if k <= target)
+        if target < self.done or base > self.done:
+            self._restore(self.keyframes[base])
+        while self.done < target:
+            self.step()
+        return self.match.world
+
+    def checksum(self):
+        return checksum(self.match.world, self.indices)
+
+    def verify(self, checksums):
+        """Tick đầu tiên lệch checksum so với bản ghi, None nếu khớp hết."""
+        for frame, expected in enumerate(checksums.tolist()):
+            self.seek(frame)
+            if self.checksum() != expected:
+                return frame
+        return None
+
+    def close(self):
+        self.match.close()
+
+
+class SimulatedFrames:
+    """
+    Nguồn frame pose cho Replayer dựng lại theo yêu cầu từ input log: có giao
+    diện như mảng frame_dtype của file .rec (len, ['time'], [k]).
+    """
+
+    def __init__(self, resim):
+        self.resim = resim
+        self.dtype = frame_dtype(len(resim.indices))
+        start = resim.header['start']['time']
+        self.times = start + resim.dt * np.arange(1, resim.ticks + 1)
+
+    def __len__(self):
+        return self.resim.ticks
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key == 'time':
+                return self.times
+            raise KeyError(key)
+        k = int(key)
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(key)
+        world = self.resim.seek(k)
+        idx = self.resim.indices
+        frame = np.zeros((), dtype=self.dtype)
+        frame['time'] = self.times[k]
+        frame['ball'] = world.ball_pos
+        pose = frame['pose']
+        pose[:, 0] = world.x[idx]
+        pose[:, 1] = world.y[idx]
+        pose[:, 2] = world.theta[idx]
+        return frame
+
+
+def open_input_log_frames(path):
+    """
+    Mở file .ilog cho Replayer.
+
+    Returns:
+        (header có 'robots' như file .rec, SimulatedFrames)
+    """
+    header, _, controls, assignments = open_input_log(path)
+    return header, SimulatedFrames(Resimulation(header, controls, assignments))
+
+
+def export_poses(path, out_path=None):
+    """Mô phỏng lại toàn bộ input log ra file pose .rec, trả về đường dẫn file mới."""
+    header, _, controls, assignments = open_input_log(path)
+    frames = SimulatedFrames(Resimulation(header, controls, assignments))
+    robots = header['robots']
+    data = np.zeros(len(frames), dtype=frames.dtype)
+    for k in range(len(frames)):
+        data[k] = frames[k]
+    frames.resim.close()
+    if out_path is None:
+        out_path = os.path.splitext(path)[0] + POSE_EXTENSION
+    with open(out_path, 'wb') as f:
+        write_header(f, make_header([r['team'] for r in robots], [r['id'] for r in robots],
+                                    source=os.path.basename(path)))
+        f.write(data.tobytes())
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Công cụ cho input log .ilog")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, text in (("info", "in header và kích thước"),
+                       ("verify", "mô phỏng lại và so checksum từng tick"),
+                       ("export", "mô phỏng lại ra file pose .rec")):
+        sub.add_parser(name, help=text).add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        header, checksums, controls, assignments = open_input_log(args.path)
+        print(json.dumps(header, indent=2))
+        size = os.path.getsize(args.path)
+        pose_size = len(checksums) * frame_dtype(len(header['robots'])).itemsize
+        print(f"{len(checksums)} ticks, {len(controls)} controller samples, {size} bytes "
+              f"(pose recording ~{pose_size} bytes)")
+    elif args.command == "verify":
+        header, checksums, controls, assignments = open_input_log(args.path)
+        resim = Resimulation(header, controls, assignments)
+        t0 = time.perf_counter()
+        frame = resim.verify(checksums)
+        resim.close()
+        elapsed = time.perf_counter() - t0
+        if frame is None:
+            print(f"[InputLog] OK: {len(checksums)} ticks match ({elapsed:.2f}s)")
+        else:
+            print(f"[InputLog] Diverged at tick {frame} "
+                  f"(t = {header['start']['time'] + (frame + 1) * header['dt']:.2f}s)")
+            raise SystemExit(1)
+    elif args.command == "export":
+        t0 = time.perf_counter()
+        out = export_poses(args.path)
+        print(f"[InputLog] {args.path} -> {out} ({time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
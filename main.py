@@ -2,17 +2,32 @@
 
 import sys
 import math
+import time
 import pygame
-from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsScene, QGraphicsView, QFileDialog
+from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsView, QFileDialog
 from PyQt5.QtCore import Qt, QRectF, QTimer
 from PyQt5.QtGui import QPainter
 from PyQt5 import uic
 
 from models.field import Field
 from models.team import Team
+from models.world import World
+from models.match import DEFAULT_BLUE_POSITIONS, DEFAULT_RED_POSITIONS
+from models.win_evaluator import WinEvaluator
+from models.sim_clock import SimClock
+from models.flow_field import flow_field_stats, set_shared_flow_fields
+from views.world_view import WorldView
+from views.field_scene import FieldScene
 from recorder import Recorder, Replayer
-from config import SCALE, ROBOT_SIZE
+from recording import FlightRecorder
+from input_log import InputLogRecorder
+from models.events import events, describe, INFO, WIN
+from config import (SCALE, TIMESTEP, RENDER_INTERVAL_MS, TURBO_BUDGET_MS, STRATEGY_PROCESS_MODE,
+                    DETERMINISTIC, BOT_COMMANDS)
 from controllers.controller_manager import ControllerManager
+from controllers.input_thread import InputThread
+from controllers.xbox_controller import assign_xbox_controllers, drive_robot
+from strategies.strategy_manager import StrategyManager, new_seed
 
 class TestWindow(QMainWindow):
     def __init__(self):
@@ -20,14 +35,16 @@ class TestWindow(QMainWindow):
         uic.loadUi("ui/Interface.ui", self)
 
         self.SCALE = SCALE
-        self.setup_scene()
-
         self.field = Field(self.SCALE)
-        self.field.draw(self.scene)
+        self.setup_scene()
         self.graphicsView.fitInView(QRectF(0, 0, *self.field.get_dimensions()), Qt.KeepAspectRatio)
 
-        self.team1 = Team(1, Qt.blue, self.field.MARGIN, self.scene)
-        self.team2 = Team(2, Qt.red, self.field.MARGIN, self.scene)
+        self.world = World()
+        self.team1 = Team(1, Qt.blue, self.field.MARGIN, self.scene, world=self.world)
+        self.team2 = Team(2, Qt.red, self.field.MARGIN, self.scene, world=self.world)
+        self.view = WorldView(self.world, self.SCALE, self.field.MARGIN, self.team1.robot_size,
+                              scene=self.scene, zone=self.field.target_zone)
+        self.win_evaluator = WinEvaluator(self.field.target_zone)
 
         #positions_blue = [(6, 1, 180), (6, -1, 180), (6, 2, 180), (6, -3, 180), (6, -7, 180)]
         positions_blue = [(6, 1, 180)]
@@ -38,30 +55,48 @@ class TestWindow(QMainWindow):
         self.team2.create_robots(len(positions_red), positions=positions_red)
 
         self.recorder = Recorder(self.team1, self.team2)
+        # Chế độ tất định: ghi input log (.ilog) từ đầu trận kế tiếp thay cho pose
+        self.input_log = InputLogRecorder(self.world)
+        self.flight_recorder = FlightRecorder(self.world, seconds=30.0, dt=TIMESTEP)
         self.replayer = Replayer(self.scene, self.team1, self.team2,
-                                  scale=self.SCALE, margin=self.field.MARGIN, robot_size=self.team1.robot_size)
+                                  scale=self.SCALE, margin=self.field.MARGIN, robot_size=self.team1.robot_size,
+                                  view=self.view)
+
+        events.subscribe(self.show_event, INFO)
 
         self.pushButton_Save.clicked.connect(self.toggle_recording)
         self.pushButton_Replay.clicked.connect(self.load_replay_file)
         self.pushButton_Reset.clicked.connect(self.reset_game)
         self.pushButton_Start.clicked.connect(self.start_game)
+        self.comboBox_Speed.currentTextChanged.connect(self.set_turbo)
 
         pygame.init()
-        pygame.joystick.init()
+        # Tay cầm được đọc và lọc trong luồng riêng; tick chỉ lấy mẫu mới nhất
+        self.inputs = InputThread().start()
+        self.input_version = None
 
         self.is_running = False
         self.game_state = "stopped"
 
+        # Timer chỉ chạy khi game đang chạy; mỗi lần gọi là một frame vẽ,
+        # số tick mô phỏng trong frame do SimClock quyết định
+        self.clock = SimClock(TIMESTEP)
+        self.turbo = None   # None = thời gian thực, int K = K tick/frame, "max" = theo TURBO_BUDGET_MS
+        self.speed_window = None
+        # Strategy của hai đội chạy theo tần số / ngân sách CPU riêng
+        self.strategy_manager = StrategyManager(TIMESTEP, enforce_budgets=not DETERMINISTIC)
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.game_loop)
-        self.timer.start(50)
 
     def setup_scene(self):
-        self.scene = QGraphicsScene()
+        # Sân tĩnh nằm trong pixmap nền của FieldScene, scene chỉ chứa item động
+        self.scene = FieldScene(self.field)
         self.graphicsView.setScene(self.scene)
         self.graphicsView.setRenderHint(QPainter.Antialiasing)
         self.graphicsView.setRenderHint(QPainter.SmoothPixmapTransform)
-        self.graphicsView.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.graphicsView.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.graphicsView.setOptimizationFlag(QGraphicsView.DontSavePainterState)
         self.graphicsView.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.graphicsView.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.graphicsView.setAlignment(Qt.AlignCenter)
@@ -71,6 +106,16 @@ class TestWindow(QMainWindow):
         self.graphicsView.fitInView(QRectF(0, 0, *self.field.get_dimensions()), Qt.KeepAspectRatio)
 
     def toggle_recording(self):
+        if DETERMINISTIC:
+            # Input log chỉ mô phỏng lại được từ lúc strategy được tạo, nên bắt
+            # đầu ghi ở lần Start / Reset kế tiếp
+            if self.input_log.saving or self.input_log.armed:
+                self.input_log.stop()
+                self.pushButton_Save.setText("Save")
+            else:
+                self.input_log.arm()
+                self.pushButton_Save.setText("Armed...")
+            return
         if not self.recorder.saving:
             self.recorder.start()
             self.pushButton_Save.setText("Saving...")
@@ -79,41 +124,109 @@ class TestWindow(QMainWindow):
             self.pushButton_Save.setText("Save")
 
     def load_replay_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Chọn file replay", "data", "CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getOpenFileName(self, "Chọn file replay", "data", "Recordings (*.rec *.ilog *.csv)")
         if not file_path:
             return
-        self.replayer.load_csv(file_path)
+        self.replayer.load(file_path)
         self.replayer.start()
+        self.show_replay_state()
+
+    def show_replay_state(self):
+        state = "Replay" if self.replayer.is_playing() else "Replay paused"
+        self.labelGameState.setText(f"{state} x{self.replayer.speed:g}")
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_F9:
+            self.flight_recorder.dump("hotkey")
+            return
+
+        # Điều khiển replay: Space dừng/chạy, ←/→ lùi/tiến 1 frame,
+        # ↑/↓ tăng/giảm tốc độ, R đảo chiều phát, Home về đầu
+        if not len(self.replayer.frames) or self.is_running:
+            super().keyPressEvent(event)
+            return
+
+        key = event.key()
+        replayer = self.replayer
+        if key == Qt.Key_Space:
+            replayer.stop() if replayer.is_playing() else replayer.start()
+        elif key == Qt.Key_Left:
+            replayer.stop()
+            replayer.step(-1)
+        elif key == Qt.Key_Right:
+            replayer.stop()
+            replayer.step(1)
+        elif key == Qt.Key_Up:
+            replayer.set_speed(replayer.speed * 2)
+        elif key == Qt.Key_Down:
+            replayer.set_speed(replayer.speed / 2)
+        elif key == Qt.Key_R:
+            replayer.set_speed(-replayer.speed)
+        elif key == Qt.Key_Home:
+            replayer.seek(replayer.start_time)
+        else:
+            super().keyPressEvent(event)
+            return
+        self.show_replay_state()
 
     def reset_game(self):
         self.team1.clear_robots()
         self.team2.clear_robots()
 
-        positions_blue = [(6, 1, 180), (6, -1, 180), (6, 2, 180), (6, -3, 180), (6, -7, 180)]
-        self.team1.create_robots(len(positions_blue), positions=positions_blue)
-
-        positions_red = [(-7, 0, 180), (-7, 2, 180), (-7, 4, 180), (-7, -2, 180), (-7, -4, 180)]
-        self.team2.create_robots(len(positions_red), positions=positions_red)
+        self.team1.create_robots(len(DEFAULT_BLUE_POSITIONS), positions=DEFAULT_BLUE_POSITIONS)
+        self.team2.create_robots(len(DEFAULT_RED_POSITIONS), positions=DEFAULT_RED_POSITIONS)
+        self.view.sync()
 
         self.setup_controls()
 
     def start_game(self):
+        self.replayer.stop()
         if self.game_state == "stopped":
             self.game_state = "running"
             self.is_running = True
             self.labelGameState.setText("Game Running...")
             self.pushButton_Start.setText("Pause")
             self.setup_controls()
+            self.resume_loop()
         elif self.game_state == "running":
             self.game_state = "paused"
             self.is_running = False
             self.labelGameState.setText("Game Pause...")
             self.pushButton_Start.setText("Continue")
+            self.stop_loop()
         elif self.game_state == "paused":
             self.game_state = "running"
             self.is_running = True
             self.labelGameState.setText("Game Running...")
             self.pushButton_Start.setText("Pause")
+            self.resume_loop()
+
+    def set_turbo(self, text):
+        """Chọn tốc độ từ comboBox_Speed: "x1" = thời gian thực, "xK" = K tick mỗi frame, "Max"."""
+        if text == "Max":
+            self.turbo = "max"
+        else:
+            k = int(text.lstrip("x"))
+            self.turbo = None if k <= 1 else k
+        self.clock.reset()
+        self.view.capture()
+
+    def resume_loop(self):
+        self.clock.reset()
+        self.view.capture()
+        self.speed_window = (time.perf_counter(), self.world.time) + flow_field_stats(self.world)
+        self.timer.start(RENDER_INTERVAL_MS)
+
+    def stop_loop(self):
+        self.timer.stop()
+        self.view.sync()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.strategy_manager.clear()   # dừng các tiến trình strategy
+        self.inputs.stop()
+        self.input_log.stop()
+        super().closeEvent(event)
 
     def setup_controls(self):
         from controllers.controller_manager import ControllerManager
@@ -122,100 +235,162 @@ class TestWindow(QMainWindow):
         mode2 = self.comboBox_ModeRed.currentText()
         strat2 = self.comboBox_StrategyRed.currentText()
 
-        self.team1_controllers, self.team1_auto_robots, self.team1_strategy = ControllerManager(self.team1, mode1, strat1, side='defense', field=self.field)
-        self.team2_controllers, self.team2_auto_robots, self.team2_strategy = ControllerManager(self.team2, mode2, strat2, side='attack', field=self.field)
+        # Dừng worker của strategy cũ trước khi tạo strategy mới
+        self.strategy_manager.clear()
+        self.input_version = self.inputs.device_version
+        # Mỗi trận một seed mới cho strategy của hai đội
+        seed = new_seed()
+        if DETERMINISTIC:
+            # Strategy chạy trong luồng GUI và flow field tính lại từ đầu,
+            # giống hệt Match(seed=seed) khi mô phỏng lại
+            process = None
+            set_shared_flow_fields(self.world, [])
+        else:
+            process = STRATEGY_PROCESS_MODE
+        self.team1_controllers, self.team1_auto_robots, self.team1_strategy = ControllerManager(
+            self.team1, mode1, strat1, side='defense', field=self.field, process=process,
+            inputs=self.inputs, seed=seed)
+        self.team2_controllers, self.team2_auto_robots, self.team2_strategy = ControllerManager(
+            self.team2, mode2, strat2, side='attack', field=self.field, process=process,
+            inputs=self.inputs, seed=seed + 1)
+
+        self.strategy_manager.add(self.team1_strategy)
+        self.strategy_manager.add(self.team2_strategy)
+
+        if DETERMINISTIC and (self.input_log.armed or self.input_log.saving):
+            self.input_log.stop()
+            if strat1 in BOT_COMMANDS or strat2 in BOT_COMMANDS:
+                # Bot ngoài tiến trình không tất định, không ghi input log được
+                print("[InputLog] Bot strategies cannot be re-simulated, not recording.")
+                self.pushButton_Save.setText("Save")
+                return
+            self.input_log.start(self.team1, self.team2, attack=strat2, defense=strat1,
+                                 seed=seed, dt=TIMESTEP)
+            self.pushButton_Save.setText("Saving...")
+            self.input_log.assign(1, [robot.index for robot, _ in self.team1_controllers])
+            self.input_log.assign(2, [robot.index for robot, _ in self.team2_controllers])
+
+    def refresh_controllers(self):
+        """Cắm / rút tay cầm: gán lại slot cho đội chế độ Xbox, giữ nguyên strategy."""
+        self.input_version = self.inputs.device_version
+        if self.comboBox_ModeBlue.currentText() == "Xbox":
+            self.team1_controllers, self.team1_auto_robots = assign_xbox_controllers(self.team1, self.inputs)
+            if self.team1_strategy is not None and hasattr(self.team1_strategy, 'skip'):
+                self.team1_strategy.skip = {robot for robot, _ in self.team1_controllers}
+            self.input_log.assign(1, [robot.index for robot, _ in self.team1_controllers])
+        if self.comboBox_ModeRed.currentText() == "Xbox":
+            self.team2_controllers, self.team2_auto_robots = assign_xbox_controllers(self.team2, self.inputs)
+            if self.team2_strategy is not None and hasattr(self.team2_strategy, 'skip'):
+                self.team2_strategy.skip = {robot for robot, _ in self.team2_controllers}
+            self.input_log.assign(2, [robot.index for robot, _ in self.team2_controllers])
 
     def game_loop(self):
+        """Một frame vẽ: chạy các tick mô phỏng đã đến hạn rồi vẽ vị trí nội suy."""
         if not self.is_running:
+            self.stop_loop()
             return
 
-        pygame.event.pump()
-
-        for robot, joystick in self.team1_controllers:
-            self.poll_xbox_single(robot, joystick)
-
-        for robot, joystick in self.team2_controllers:
-            self.poll_xbox_single(robot, joystick)
-
-        if self.team1_strategy:
-            self.team1_strategy.apply()
-        if self.team2_strategy:
-            self.team2_strategy.apply()
-
+        if self.turbo is None:
+            for _ in range(self.clock.advance()):
+                self.view.capture()
+                self.simulate_tick()
+                if not self.is_running:
+                    self.stop_loop()
+                    return
+            self.view.sync(self.clock.alpha)
+        else:
+            # Turbo: chạy liền nhiều tick, chỉ vẽ trạng thái cuối. Mỗi tick vẫn
+            # qua check_game_state và recorder như khi chạy thời gian thực.
+            start = time.perf_counter()
+            if self.turbo == "max":
+                count, deadline = sys.maxsize, start + TURBO_BUDGET_MS / 1000.0
+            else:
+                count, deadline = self.turbo, math.inf
+            for _ in range(count):
+                self.simulate_tick()
+                if not self.is_running:
+                    self.stop_loop()
+                    return
+                if time.perf_counter() >= deadline:
+                    break
+            self.view.sync()
+        self.show_speed()
+
+    def show_event(self, event):
+        self.statusbar.showMessage(describe(event), 5000)
+
+    def show_speed(self):
+        """
+        Hiển thị tốc độ thực tế (giây mô phỏng / giây thực), cập nhật mỗi ~0.5 s,
+        kèm chi phí cập nhật flow field mỗi lần (ms) nếu strategy có dùng và
+        độ trễ tay cầm -> pose (p95, ms) nếu có tay cầm đang điều khiển.
+        """
+        wall0, sim0, flow_time0, flow_count0 = self.speed_window
+        now = time.perf_counter()
+        if now - wall0 < 0.5:
+            return
+        text = f"x{(self.world.time - sim0) / (now - wall0):.1f}"
+        flow_time, flow_count = flow_field_stats(self.world)
+        if flow_count > flow_count0:
+            text += f"  flow {(flow_time - flow_time0) * 1e3 / (flow_count - flow_count0):.2f} ms"
+        latency = self.inputs.latency_stats()
+        if latency is not None:
+            text += f"  input p95 {latency['p95_ms']:.1f} ms"
+        self.labelSpeed.setText(text)
+        self.speed_window = (now, self.world.time, flow_time, flow_count)
+
+    def simulate_tick(self):
+        """Một tick TIMESTEP: điều khiển, strategy, vật lý, ghi hình, luật thắng."""
+        self.world.grid.refresh()
+
+        if self.inputs.device_version != self.input_version:
+            self.refresh_controllers()
+
+        for robot, slot in self.team1_controllers:
+            self.poll_xbox_single(robot, slot)
+
+        for robot, slot in self.team2_controllers:
+            self.poll_xbox_single(robot, slot)
+
+        self.strategy_manager.step()
+
+        self.world.step(TIMESTEP)
+        self.recorder.record()
+        self.input_log.record()
+        self.flight_recorder.record()
         self.check_game_state()
 
-    def poll_xbox_single(self, robot, joystick):
-        DEAD_ZONE = 0.05
-        MOVE_SPEED = 2.0
-        ROTATE_SPEED = 10.0
-
-        lx = joystick.get_axis(0)
-        ly = -joystick.get_axis(1)
-        rx = joystick.get_axis(3)
-
-        if abs(lx) < DEAD_ZONE: lx = 0
-        if abs(ly) < DEAD_ZONE: ly = 0
-        if abs(rx) < DEAD_ZONE: rx = 0
-
-        dx = lx * MOVE_SPEED * 0.05
-        dy = ly * MOVE_SPEED * 0.05
-
-        pos = robot.pos()
-        new_x = pos.x() + dx * self.SCALE
-        new_y = pos.y() - dy * self.SCALE
-
-        x_m = (new_x + ROBOT_SIZE / 2 - self.field.MARGIN) / self.SCALE - 11.0
-        y_m = (new_y + ROBOT_SIZE / 2 - self.field.MARGIN) / self.SCALE - 7.0
-
-        safe = True
-        all_robots = self.team1.robots + self.team2.robots
-
-        for other in all_robots:
-            if other == robot:
-                continue
-            ox = other.pose['x']
-            oy = other.pose['y']
-            dist_to_other = math.hypot(x_m - ox, y_m - oy)
-            if dist_to_other < ROBOT_SIZE + 0.05:
-                safe = False
-                break
-
-        if safe and self.is_inside_field(x_m, y_m):
-            robot.setPos(new_x, new_y)
-            robot.pose['x'] = x_m
-            robot.pose['y'] = y_m
-
-        if rx != 0:
-            theta = (robot.rotation() + ROTATE_SPEED * rx * 0.05) % 360
-            robot.setRotation(theta)
-            robot.pose['theta'] = theta
+    def poll_xbox_single(self, robot, slot):
+        """Điều khiển robot theo mẫu đã lọc mới nhất của slot tay cầm."""
+        sample = self.inputs.latest(slot)
+        if sample is None:
+            return
+        drive_robot(self.world, robot.index, sample.lx, sample.ly, sample.rx, TIMESTEP)
+        self.input_log.control(robot.index, sample.lx, sample.ly, sample.rx)
+        self.inputs.applied(slot, sample)
 
     def is_inside_field(self, x, y):
-        return -12.0 <= x <= 12.0 and -8.0 <= y <= 8.0
+        return self.field.is_inside_field(x, y)
 
     def check_game_state(self):
-        for red_robot in self.team2.robots:
-            if self.field.target_zone.contains(red_robot.pose['x'], red_robot.pose['y']):
-                self.labelGameState.setText("Team Red Wins!")
-                self.is_running = False
-                self.pushButton_Start.setText("Start")
-                return
-
-        blocked = 0
-        block_distance = 0.5
+        winner, _ = self.win_evaluator.evaluate_world(self.world)
 
-        for red_robot in self.team2.robots:
-            for blue_robot in self.team1.robots:
-                dx = red_robot.pose['x'] - blue_robot.pose['x']
-                dy = red_robot.pose['y'] - blue_robot.pose['y']
-                dist = math.hypot(dx, dy)
-                if dist <= block_distance:
-                    blocked += 1
-                    break
+        # Hộp đen: lưu lại các giây cuối khi có đội thắng. Robot đỏ vào zone là
+        # đội đỏ thắng ngay (WinEvaluator), nên dump "red_wins" cũng là lúc vào zone
+        if winner is not None:
+            events.emit(WIN, INFO, time=self.world.time, value=2 if winner == "red" else 1)
+            self.flight_recorder.dump(f"{winner}_wins")
+        self.view.set_zone_active(self.win_evaluator.in_zone.any())
 
-        if blocked == len(self.team2.robots):
+        if winner == "red":
+            self.labelGameState.setText("Team Red Wins!")
+            self.is_running = False
+            self.game_state = "stopped"
+            self.pushButton_Start.setText("Start")
+        elif winner == "blue":
             self.labelGameState.setText("Team Blue Wins!")
             self.is_running = False
+            self.game_state = "stopped"
             self.pushButton_Start.setText("Start")
         else:
             self.labelGameState.setText("Game Running...")
@@ -1,12 +1,39 @@
 import math
 
+import numpy as np
+
+from models.pass_evaluator import PassEvaluator, ATTACK_GOALS
+from models.events import (events, DEBUG, INFO, SHOT, PASS, CATCH, POSSESSION,
+                           NO_BALL, TOO_FAR, NOT_IN_FRONT, NO_TEAMMATE, NO_LANE)
+
+_pass_evaluator = PassEvaluator()
+
+
+def _now(robot):
+    world = getattr(robot, 'world', None)
+    return world.time if world is not None else 0.0
+
+
+def _fail(kind, robot, reason):
+    """Lần thử thất bại: sự kiện mức DEBUG, bị bỏ ngay nếu không ai cần."""
+    if events.level <= DEBUG:
+        events.emit(kind, DEBUG, ok=False, reason=reason, time=_now(robot),
+                    team=robot.team, robot=robot.robot_id)
+
+
+def _possession(robot, has_ball, x, y):
+    """Ghi sự kiện khi robot có/mất bóng (chỉ khi trạng thái thực sự đổi)."""
+    if bool(getattr(robot, 'has_ball', False)) != has_ball and events.level <= INFO:
+        events.emit(POSSESSION, INFO, ok=has_ball, time=_now(robot),
+                    team=robot.team, robot=robot.robot_id, x=x, y=y)
+
 class Action:
     
     @staticmethod
     def shoot(robot, ball, power: float = 5.0):
         """Robot thực hiện sút bóng nếu có bóng và bóng ở gần phía trước."""
         if not getattr(robot, 'has_ball', False):
-            print("[Shoot] ❌ Robot không có bóng để sút.")
+            _fail(SHOT, robot, NO_BALL)
             return False
 
         rx, ry = robot.pose['x'], robot.pose['y']
@@ -22,7 +49,7 @@ class Action:
         max_shoot_dist = robot_radius + ball_radius + 0.05
 
         if dist > max_shoot_dist:
-            print("[Shoot] ❌ Quá xa để sút.")
+            _fail(SHOT, robot, TOO_FAR)
             return False
 
         
@@ -31,12 +58,13 @@ class Action:
         dot = front_dx * dx + front_dy * dy
 
         if dot < 0:
-            print("[Shoot] ❌ Bóng không ở phía trước.")
+            _fail(SHOT, robot, NOT_IN_FRONT)
             return False
 
         ball.kick(power, theta_rad, robot.team)
         robot.has_ball = False
-        print(f"[Shoot] ✅ Robot {robot.robot_id} (Team {robot.team}) đã sút bóng với lực {power:.1f}N.")
+        events.emit(SHOT, INFO, time=_now(robot), team=robot.team, robot=robot.robot_id,
+                    x=rx, y=ry, value=power)
         return True
    
    
@@ -85,54 +113,53 @@ class Action:
         return True
     '''
     @staticmethod
-    def pass_ball(robot, teammates, ball, power=4.0):
+    def pass_ball(robot, teammates, ball, power=4.0, opponents=None):
+        """
+        Chuyền cho đồng đội có phương án tốt nhất theo PassEvaluator (hành lang
+        an toàn với đối thủ, thời gian bóng tới, gần khung thành).
+
+        Args:
+            opponents: list robot đối phương; None = lấy mọi robot đang hoạt động
+                của đội kia trong World của robot
+        """
         if not getattr(robot, 'has_ball', False):
-            print("[Pass] ❌ Robot không có bóng để chuyền.")
+            _fail(PASS, robot, NO_BALL)
             return False
 
         if not teammates:
-            print("[Pass] ❌ Không có đồng đội nào để chuyền.")
+            _fail(PASS, robot, NO_TEAMMATE)
             return False
 
         rx, ry = robot.pose['x'], robot.pose['y']
-        theta_rad = math.radians(robot.pose['theta'])
-         
-        front_dx =  math.cos(theta_rad)
-        front_dy =  math.sin(theta_rad)
-
-        # Tìm teammate gần nhất phía trước
-        min_dist = float("inf")
-        target = None
-        for mate in teammates:
-            mx, my = mate.pose['x'], mate.pose['y']
-            dx = mx - rx
-            dy = my - ry
-            dot = front_dx * dx + front_dy * dy
-            if dot > 0.1:  # teammate phía trước
-                dist = math.hypot(dx, dy)
-                if dist < min_dist:
-                    min_dist = dist
-                    target = mate
-
-        if target is None:
-            print("[Pass] ❌ Không tìm thấy đồng đội phía trước.")
+        mates_x = np.array([mate.pose['x'] for mate in teammates])
+        mates_y = np.array([mate.pose['y'] for mate in teammates])
+        if opponents is None and getattr(robot, 'world', None) is not None:
+            world = robot.world
+            others = np.flatnonzero((world.team != robot.team) & world.active)
+            opp_x, opp_y = world.x[others], world.y[others]
+        else:
+            opp_x = np.array([o.pose['x'] for o in opponents or ()])
+            opp_y = np.array([o.pose['y'] for o in opponents or ()])
+
+        goal = ATTACK_GOALS.get(robot.team, ATTACK_GOALS[1])
+        k = _pass_evaluator.best(rx, ry, robot.pose['theta'], mates_x, mates_y,
+                                 opp_x, opp_y, power, goal)
+        if k is None:
+            _fail(PASS, robot, NO_LANE)
             return False
+        target = teammates[k]
 
         # Tính góc sút hướng về teammate
         tx, ty = target.pose['x'], target.pose['y']
         dx = tx - rx
         dy = ty - ry
         angle_rad = math.atan2(dy, dx)
-        '''
-        if robot.team == 1:
-            angle_rad = math.atan2(dy, dx)
-        else: 
-            angle_rad = math.atan2(dy, dx)+ math.pi
-        '''
+
         # Thực hiện chuyền bóng
         ball.kick(power, angle_rad, robot.team)
         robot.has_ball = False
-        print(f"[Pass] ✅ Robot {robot.robot_id} Team {robot.team} chuyền cho Robot {target.robot_id}")
+        events.emit(PASS, INFO, time=_now(robot), team=robot.team, robot=robot.robot_id,
+                    target=target.robot_id, x=rx, y=ry, value=power)
         return True
 
 
@@ -153,7 +180,7 @@ class Action:
         max_catch_dist = robot_radius + ball_radius + 0.1
 
         if dist > max_catch_dist:
-            print("[Catch] ❌ Quá xa để bắt bóng.")
+            _fail(CATCH, robot, TOO_FAR)
             return False
 
         front_dx = math.cos(theta_rad)
@@ -161,7 +188,7 @@ class Action:
         dot = front_dx * dx + front_dy * dy
 
         if dot < 0.2:
-            print("[Catch] ❌ Bóng không ở phía trước.")
+            _fail(CATCH, robot, NOT_IN_FRONT)
             return False
 
         hold_dist = robot_radius + ball_radius + 0.01
@@ -171,8 +198,10 @@ class Action:
         ball.set_position(new_bx, new_by)
         ball.vx = 0
         ball.vy = 0
+        _possession(robot, True, new_bx, new_by)
         robot.has_ball = True
-        print(f"[Catch] ✅ Robot {robot.robot_id} đã bắt bóng.")
+        events.emit(CATCH, INFO, time=_now(robot), team=robot.team, robot=robot.robot_id,
+                    x=new_bx, y=new_by)
         return True
 
     @staticmethod
@@ -203,9 +232,11 @@ class Action:
                 ball.set_position(hold_x, hold_y)
                 ball.vx = 0
                 ball.vy = 0
+                _possession(robot, True, hold_x, hold_y)
                 robot.has_ball = True
                 return True
 
+        _possession(robot, False, bx, by)
         robot.has_ball = False
         return False
 
@@ -0,0 +1,96 @@
+# models/assignment.py
+
+import math
+
+import numpy as np
+
+
+def solve_assignment(cost, potentials=None):
+    """
+    Bài toán phân công chi phí nhỏ nhất (thuật toán Hungary, đường tăng ngắn nhất).
+
+    Ma trận chữ nhật được hỗ trợ: mỗi hàng được gán tối đa một cột và ngược
+    lại, số cặp = min(hàng, cột). Với kích thước đội hình (n ~ 11) vòng lặp
+    trên list thuần nhanh hơn gọi NumPy theo từng hàng (~0.1 ms so với ~0.7 ms).
+
+    Thế vị cột (biến đối ngẫu) có thể lấy từ lần giải trước (warm start): khi
+    chi phí chỉ đổi ít, cột rẻ nhất theo chi phí rút gọn của mỗi hàng thường đã
+    đúng nên đường tăng ngắn hơn. Thế vị ban đầu bất kỳ chỉ đúng khi mọi cột
+    đều được gán, nên ma trận chữ nhật được thêm hàng giả chi phí 0 cho vuông.
+
+    Args:
+        cost: ma trận (n, m) hữu hạn
+        potentials: None hoặc mảng float64 độ dài max(n, m) chứa thế vị cột
+            của lần giải trước; được ghi đè tại chỗ bằng thế vị của lần giải này
+
+    Returns:
+        (rows, cols): hai mảng chỉ số, rows tăng dần (giống scipy linear_sum_assignment)
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    rows_cost = cost.tolist()
+    if potentials is not None and n < m:
+        rows_cost += [[0.0] * m] * (m - n)
+        real_rows, n = n, m
+    else:
+        real_rows = n
+
+    # Chỉ số 1..n / 1..m, cột 0 là cột giả của thuật toán
+    u = [0.0] * (n + 1)
+    v = [0.0] + (potentials.tolist() if potentials is not None else [0.0] * m)
+    p = [0] * (m + 1)       # p[j] = hàng đang giữ cột j (0 = trống)
+    way = [0] * (m + 1)
+    columns = range(1, m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [math.inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = rows_cost[i0 - 1]
+            ui = u[i0]
+            delta = math.inf
+            j1 = 0
+            for j in columns:
+                if not used[j]:
+                    reduced = row[j - 1] - ui - v[j]
+                    if reduced < minv[j]:
+                        minv[j] = reduced
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Lật đường tăng
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    if potentials is not None:
+        potentials[:] = v[1:]
+    pairs = sorted((p[j] - 1, j - 1) for j in columns if 0 < p[j] <= real_rows)
+    rows = np.array([r for r, _ in pairs], dtype=np.intp)
+    cols = np.array([c for _, c in pairs], dtype=np.intp)
+    if transposed:
+        rows, cols = cols, rows
+        order = np.argsort(rows)
+        rows, cols = rows[order], cols[order]
+    return rows, cols
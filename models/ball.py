@@ -3,8 +3,11 @@
 from PyQt5.QtWidgets import QGraphicsEllipseItem
 from PyQt5.QtGui import QBrush, QPen, QColor
 import math
+import numpy as np
 from PyQt5.QtCore import Qt
 
+from models.ball_physics import BallPhysics
+
 class Ball:
     def __init__(self, x, y, scene, scale, margin):
         self.x = x
@@ -19,6 +22,7 @@ class Ball:
         self.scale = scale
         self.margin = margin
         self.graphic = None
+        self.physics = None
         self.draw()  # vẽ ban đầu
 
     def get_position(self):
@@ -58,45 +62,37 @@ class Ball:
         self.vy = direction * speed * math.sin(angle_rad)  # y ngược trục Qt
 
 
-    def update(self, dt):
+    def update(self, dt, robots_x=(), robots_y=()):
         """
-        Cập nhật vị trí bóng theo thời gian.
+        Cập nhật vị trí bóng theo thời gian (xem models.ball_physics.BallPhysics).
         Args:
             dt (float): delta time (s)
+            robots_x, robots_y: tọa độ robot để tính va chạm (m)
+        Returns:
+            list[Impact] các va chạm trong bước
         """
-        speed = math.hypot(self.vx, self.vy)
-        if speed < 0.01:
-            self.vx = self.vy = 0
-            return
-
-        # Lực ma sát gây giảm tốc
-        friction_acc = self.friction * 9.81
-        decel = friction_acc * dt
-
-        new_speed = max(0, speed - decel)
-        if new_speed == 0:
-            self.vx = self.vy = 0
-        else:
-            self.vx *= new_speed / speed
-            self.vy *= new_speed / speed
-
-        # Cập nhật vị trí
-        self.x += self.vx * dt
-        self.y += self.vy * dt
+        if self.physics is None:
+            self.physics = BallPhysics(self.radius, self.friction)
+        pos = np.array([self.x, self.y])
+        vel = np.array([self.vx, self.vy])
+        events = self.physics.step(pos, vel, dt, robots_x, robots_y)
+        self.x, self.y = float(pos[0]), float(pos[1])
+        self.vx, self.vy = float(vel[0]), float(vel[1])
+        return events
 
     def draw(self):
-        if self.graphic:
-            self.scene.removeItem(self.graphic)
-
-        radius_pix = self.radius * self.scale
+        """Tạo graphic một lần, các lần sau chỉ di chuyển nó (không xóa/tạo lại item)."""
         cx = self.margin + (self.x + 11.0) * self.scale
         cy = self.margin + (self.y + 7.0) * self.scale
 
-        self.graphic = QGraphicsEllipseItem(
-            cx - radius_pix, cy - radius_pix,
-            2 * radius_pix, 2 * radius_pix
-        )
-        self.graphic.setBrush(QBrush(QColor("orange")))
-        self.graphic.setPen(QPen(Qt.black, 1))
-        self.scene.addItem(self.graphic)
-
+        if self.graphic is None:
+            radius_pix = self.radius * self.scale
+            self.graphic = QGraphicsEllipseItem(
+                -radius_pix, -radius_pix,
+                2 * radius_pix, 2 * radius_pix
+            )
+            self.graphic.setBrush(QBrush(QColor("orange")))
+            self.graphic.setPen(QPen(Qt.black, 1))
+            self.scene.addItem(self.graphic)
+
+        self.graphic.setPos(cx, cy)
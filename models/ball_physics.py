@@ -0,0 +1,236 @@
+# models/ball_physics.py
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from config import FIELD_WIDTH, FIELD_HEIGHT, GOAL_HEIGHT, GOAL_DEPTH, ROBOT_SIZE
+
+GRAVITY = 9.81
+STOP_SPEED = 0.01          # dưới tốc độ này bóng coi như dừng (m/s)
+WALL_RESTITUTION = 0.6     # hệ số nảy với đường biên / khung thành
+ROBOT_RESTITUTION = 0.5    # hệ số nảy với thân robot
+MAX_EVENTS = 8             # số va chạm tối đa xử lý trong một bước
+
+# Một sự kiện trong bước mô phỏng: thời điểm (s), loại ('robot', 'wall',
+# 'goal_frame', 'goal'), chỉ số robot / đoạn thẳng, và vị trí tâm bóng lúc đó
+Impact = namedtuple('Impact', 'time kind index x y')
+
+
+def stop_time(speed, deceleration):
+    """Thời gian để bóng dừng hẳn khi giảm tốc đều (s)."""
+    return speed / deceleration if deceleration > 0 else math.inf
+
+
+def stop_distance(speed, deceleration):
+    """Quãng đường bóng lăn tới khi dừng (m)."""
+    return speed * speed / (2 * deceleration) if deceleration > 0 else math.inf
+
+
+def field_segments():
+    """
+    Các đoạn thẳng tĩnh của sân (mét, gốc giữa sân, y hướng xuống).
+
+    Returns:
+        (segments (n, 4) [x1, y1, x2, y2], kinds list[str])
+        kind là 'wall' (đường biên), 'goal_frame' (khung thành) hoặc 'goal'
+        (vạch cầu môn: chỉ báo sự kiện, bóng đi xuyên qua)
+    """
+    hx, hy = FIELD_WIDTH / 2, FIELD_HEIGHT / 2
+    gy = GOAL_HEIGHT / 2
+    segments, kinds = [], []
+
+    def add(x1, y1, x2, y2, kind):
+        segments.append((x1, y1, x2, y2))
+        kinds.append(kind)
+
+    add(-hx, -hy, hx, -hy, 'wall')
+    add(-hx, hy, hx, hy, 'wall')
+    for side in (-1, 1):
+        x = side * hx
+        back = side * (hx + GOAL_DEPTH)
+        add(x, -hy, x, -gy, 'wall')
+        add(x, gy, x, hy, 'wall')
+        add(x, -gy, back, -gy, 'goal_frame')
+        add(x, gy, back, gy, 'goal_frame')
+        add(back, -gy, back, gy, 'goal_frame')
+        add(x, -gy, x, gy, 'goal')
+    return np.array(segments, dtype=np.float64), kinds
+
+
+def _ray_circles(px, py, ux, uy, cx, cy, radius):
+    """
+    Quãng đường d >= 0 dọc tia p + u*d tới khi chạm lần đầu các đường tròn
+    (cx, cy, radius); inf nếu không chạm. Tâm đã nằm trong đường tròn thì bỏ
+    qua (bóng đang tách ra, tránh bị kẹt).
+    """
+    fx = px - cx
+    fy = py - cy
+    b = fx * ux + fy * uy
+    c = fx * fx + fy * fy - radius * radius
+    disc = b * b - c
+    d = np.full(np.shape(cx), np.inf)
+    ok = (c >= 0) & (b < 0) & (disc >= 0)
+    d[ok] = -b[ok] - np.sqrt(disc[ok])
+    return d
+
+
+class BallPhysics:
+    """
+    Chuyển động bóng với ma sát giảm tốc đều và va chạm liên tục (swept).
+
+    Trong một bước bóng đi thẳng, tốc độ giảm đều a = mu * g nên quãng đường
+    sau thời gian t là s(t) = v0*t - a*t^2/2 và dừng sau v0/a giây. Va chạm
+    được tìm theo quãng đường dọc tia (robot là hình tròn, biên và khung
+    thành là đoạn thẳng có bề dày bằng bán kính bóng), rồi đổi ngược ra thời
+    điểm chính xác bằng nghiệm của s(t) = d. Vì vậy bóng không xuyên qua robot
+    dù dt lớn, và dt lớn vẫn cho cùng quỹ đạo như dt nhỏ.
+    """
+
+    def __init__(self, radius=0.12, friction=0.4, robot_radius=ROBOT_SIZE / 2):
+        """
+        Args:
+            radius (float): bán kính bóng (m)
+            friction (float): hệ số ma sát lăn mu
+            robot_radius (float): bán kính va chạm của robot (m)
+        """
+        self.radius = radius
+        self.friction = friction
+        self.robot_radius = robot_radius
+        self.segments, self.kinds = field_segments()
+
+        seg = self.segments
+        self.ax, self.ay = seg[:, 0], seg[:, 1]
+        dx, dy = seg[:, 2] - seg[:, 0], seg[:, 3] - seg[:, 1]
+        self.length = np.hypot(dx, dy)
+        self.ex, self.ey = dx / self.length, dy / self.length
+        self.nx, self.ny = -self.ey, self.ex
+        self.sensor = np.array([k == 'goal' for k in self.kinds])
+        # Vạch cầu môn báo sự kiện khi tâm bóng đi qua (bề dày 0)
+        self.thickness = np.where(self.sensor, 0.0, radius)
+
+    @property
+    def deceleration(self):
+        return self.friction * GRAVITY
+
+    def _segment_hits(self, px, py, ux, uy, skip):
+        """Quãng đường tới từng đoạn thẳng và pháp tuyến tại điểm chạm."""
+        h0 = (px - self.ax) * self.nx + (py - self.ay) * self.ny
+        rate = ux * self.nx + uy * self.ny
+        approaching = h0 * rate < 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d = np.where(approaching & (np.abs(h0) >= self.thickness),
+                         (np.abs(h0) - self.thickness) / np.abs(rate), np.inf)
+            # Điểm chạm phải nằm trong đoạn, ngoài đoạn thì xét đầu mút
+            along = (px + ux * d - self.ax) * self.ex + (py + uy * d - self.ay) * self.ey
+        d = np.where((along >= 0) & (along <= self.length), d, np.inf)
+        sign = np.sign(h0)
+        nx, ny = sign * self.nx, sign * self.ny
+
+        # Đầu mút (cột dọc khung thành, góc sân): hình tròn bán kính bóng
+        solid = ~self.sensor
+        for ex_, ey_ in ((self.ax, self.ay), (self.segments[:, 2], self.segments[:, 3])):
+            de = _ray_circles(px, py, ux, uy, ex_, ey_, self.thickness)
+            de[~solid] = np.inf
+            better = de < d
+            if better.any():
+                d = np.where(better, de, d)
+                hx = px + ux * de - ex_
+                hy = py + uy * de - ey_
+                norm = np.hypot(hx, hy)
+                norm[norm == 0] = 1.0
+                nx = np.where(better, hx / norm, nx)
+                ny = np.where(better, hy / norm, ny)
+
+        if skip is not None:
+            d[skip] = np.inf
+        return d, nx, ny
+
+    def step(self, pos, vel, dt, robots_x=(), robots_y=(), t0=0.0):
+        """
+        Tiến bóng thêm dt giây, cập nhật pos và vel tại chỗ.
+
+        Args:
+            pos, vel: mảng (2,) vị trí (m) và vận tốc (m/s) của bóng
+            dt (float): bước thời gian (s)
+            robots_x, robots_y: tọa độ các robot có thể va chạm (m)
+            t0 (float): thời điểm đầu bước, dùng để ghi time của Impact
+
+        Returns:
+            list[Impact] theo thứ tự thời gian
+        """
+        events = []
+        a = self.deceleration
+        rx = np.asarray(robots_x, dtype=np.float64)
+        ry = np.asarray(robots_y, dtype=np.float64)
+        reach = self.radius + self.robot_radius
+        t = 0.0
+        skip_segment = None
+
+        while len(events) < MAX_EVENTS:
+            speed = math.hypot(vel[0], vel[1])
+            if speed < STOP_SPEED:
+                vel[:] = 0.0
+                break
+            remaining = dt - t
+            if remaining <= 0:
+                break
+            ux, uy = vel[0] / speed, vel[1] / speed
+            tau = min(remaining, stop_time(speed, a))
+            travel = speed * tau - 0.5 * a * tau * tau
+            px, py = float(pos[0]), float(pos[1])
+
+            d_robot = _ray_circles(px, py, ux, uy, rx, ry, reach) if len(rx) else np.zeros(0)
+            d_seg, seg_nx, seg_ny = self._segment_hits(px, py, ux, uy, skip_segment)
+
+            best = travel
+            hit = None
+            if len(d_robot):
+                j = int(np.argmin(d_robot))
+                if d_robot[j] <= best:
+                    best, hit = float(d_robot[j]), ('robot', j)
+            k = int(np.argmin(d_seg))
+            if d_seg[k] <= best:
+                best, hit = float(d_seg[k]), (self.kinds[k], k)
+
+            if hit is None:
+                pos[0] = px + ux * travel
+                pos[1] = py + uy * travel
+                new_speed = speed - a * tau
+                if new_speed < STOP_SPEED or tau < remaining:
+                    vel[:] = 0.0
+                else:
+                    vel[0], vel[1] = ux * new_speed, uy * new_speed
+                break
+
+            # Thời điểm chạm: nghiệm nhỏ của v0*t - a*t^2/2 = best
+            if a > 0:
+                t_hit = (speed - math.sqrt(max(speed * speed - 2 * a * best, 0.0))) / a
+            else:
+                t_hit = best / speed
+            t += t_hit
+            pos[0] = px + ux * best
+            pos[1] = py + uy * best
+            speed_hit = max(speed - a * t_hit, 0.0)
+            vx, vy = ux * speed_hit, uy * speed_hit
+
+            kind, index = hit
+            events.append(Impact(t0 + t, kind, index, float(pos[0]), float(pos[1])))
+            skip_segment = None
+            if kind == 'goal':
+                skip_segment = index
+                vel[0], vel[1] = vx, vy
+                continue
+            if kind == 'robot':
+                nx, ny = pos[0] - rx[index], pos[1] - ry[index]
+                norm = math.hypot(nx, ny) or 1.0
+                nx, ny = nx / norm, ny / norm
+                e = ROBOT_RESTITUTION
+            else:
+                nx, ny = float(seg_nx[index]), float(seg_ny[index])
+                e = WALL_RESTITUTION
+            vn = vx * nx + vy * ny
+            vel[0] = vx - (1 + e) * vn * nx
+            vel[1] = vy - (1 + e) * vn * ny
+        return events
@@ -0,0 +1,183 @@
+# models/bot_protocol.py
+"""
+Giao thức nhị phân giữa trình mô phỏng và bot chạy ngoài tiến trình
+(Unix domain socket, kiểu stream). Mọi số đều little-endian.
+
+Khung (frame): <u32 length><u8 type><payload>, length = 1 + len(payload).
+
+    HELLO    bot -> sim   <4s magic "RBOT"><u16 version> + tên bot (utf-8)
+    WELCOME  sim -> bot   <u8 team_id><u8 side: 0 attack, 1 defense><f4 dt (s)>
+                          <f4 deadline (ms)><u64 seed><f4 field_x><f4 field_y>
+                          <f4 zone_cx><f4 zone_cy>
+    STATE    sim -> bot   <u64 seq><f8 time><u16 n><f4 ball x, y, vx, vy>
+                          + n bản ghi ROBOT_DTYPE (15 byte, theo chỉ số robot)
+    COMMAND  bot -> sim   <u64 seq của STATE được trả lời><u16 n>
+                          + n bản ghi COMMAND_DTYPE (14 byte)
+    BYE      sim -> bot   rỗng; bot đóng kết nối và thoát
+
+Lệnh là vận tốc (m/s) và hướng (độ, NaN = giữ hướng) cho robot có chỉ số
+`index` trong STATE; robot được giữ vận tốc này cho tới lệnh mới hơn. Chỉ
+robot của đội mình, đang active và không có cờ CONTROLLED mới nhận lệnh.
+
+Pipelining: trình mô phỏng gửi STATE mỗi tick mà không chờ câu trả lời của
+tick trước; câu trả lời cho tick k cần tới trước deadline tính từ lúc gửi.
+Bot nên trả lời STATE mới nhất đang có trong bộ đệm và bỏ các STATE cũ hơn.
+"""
+
+import select
+import socket
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b"RBOT"
+PROTOCOL_VERSION = 1
+
+HELLO, WELCOME, STATE, COMMAND, BYE = range(1, 6)
+
+FRAME_HEADER = struct.Struct('<IB')
+HELLO_HEADER = struct.Struct('<4sH')
+WELCOME_FORMAT = struct.Struct('<BBffQffff')
+STATE_HEADER = struct.Struct('<QdH4f')
+COMMAND_HEADER = struct.Struct('<QH')
+
+# Cờ trong ROBOT_DTYPE['flags']
+ACTIVE, HAS_BALL, CONTROLLED = 1, 2, 4
+
+ROBOT_DTYPE = np.dtype([
+    ('x', '<f4'), ('y', '<f4'), ('theta', '<f4'),
+    ('robot_id', 'u1'), ('team', 'u1'), ('flags', 'u1'),
+])
+COMMAND_DTYPE = np.dtype([
+    ('index', '<u2'), ('vx', '<f4'), ('vy', '<f4'), ('theta', '<f4'),
+])
+
+
+def frame(kind, payload=b""):
+    return FRAME_HEADER.pack(len(payload) + 1, kind) + payload
+
+
+def encode_hello(name):
+    return frame(HELLO, HELLO_HEADER.pack(MAGIC, PROTOCOL_VERSION) + name.encode('utf-8'))
+
+
+def decode_hello(payload):
+    magic, version = HELLO_HEADER.unpack_from(payload)
+    if magic != MAGIC or version != PROTOCOL_VERSION:
+        raise ConnectionError(f"Unsupported bot protocol {magic!r} v{version}")
+    return payload[HELLO_HEADER.size:].decode('utf-8', 'replace')
+
+
+def encode_welcome(team_id, side, dt, deadline_ms, seed, field_x, field_y, zone_cx, zone_cy):
+    return frame(WELCOME, WELCOME_FORMAT.pack(team_id, 0 if side == 'attack' else 1, dt,
+                                              deadline_ms, seed, field_x, field_y, zone_cx, zone_cy))
+
+
+def decode_welcome(payload):
+    team_id, side, dt, deadline_ms, seed, field_x, field_y, zone_cx, zone_cy = \
+        WELCOME_FORMAT.unpack(payload)
+    return {'team_id': team_id, 'side': 'attack' if side == 0 else 'defense', 'dt': dt,
+            'deadline_ms': deadline_ms, 'seed': seed, 'field_x': field_x, 'field_y': field_y,
+            'zone_cx': zone_cx, 'zone_cy': zone_cy}
+
+
+def encode_state(world, seq, controlled=()):
+    """STATE của toàn bộ World; controlled = chỉ số robot đang điều khiển bằng tay."""
+    n = len(world.x)
+    robots = np.empty(n, dtype=ROBOT_DTYPE)
+    robots['x'] = world.x
+    robots['y'] = world.y
+    robots['theta'] = world.theta
+    robots['robot_id'] = world.robot_id
+    robots['team'] = world.team
+    flags = world.active * ACTIVE + world.has_ball * HAS_BALL
+    if len(controlled):
+        flags[np.asarray(controlled, dtype=np.intp)] |= CONTROLLED
+    robots['flags'] = flags
+    header = STATE_HEADER.pack(seq, world.time, n, *world.ball_pos, *world.ball_vel)
+    return frame(STATE, header + robots.tobytes())
+
+
+def decode_state(payload):
+    """(seq, time, ball [x, y, vx, vy], mảng ROBOT_DTYPE chỉ đọc)."""
+    seq, t, n, bx, by, bvx, bvy = STATE_HEADER.unpack_from(payload)
+    robots = np.frombuffer(payload, dtype=ROBOT_DTYPE, count=n, offset=STATE_HEADER.size)
+    return seq, t, (bx, by, bvx, bvy), robots
+
+
+def encode_command(seq, index, vx, vy, theta):
+    commands = np.empty(len(index), dtype=COMMAND_DTYPE)
+    commands['index'] = index
+    commands['vx'] = vx
+    commands['vy'] = vy
+    commands['theta'] = theta
+    return frame(COMMAND, COMMAND_HEADER.pack(seq, len(commands)) + commands.tobytes())
+
+
+def decode_command(payload):
+    seq, n = COMMAND_HEADER.unpack_from(payload)
+    return seq, np.frombuffer(payload, dtype=COMMAND_DTYPE, count=n, offset=COMMAND_HEADER.size)
+
+
+class FrameReader:
+    """Tách các khung hoàn chỉnh khỏi luồng byte nhận được (có thể bị cắt bất kỳ đâu)."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = bytearray()
+        self.closed = False
+
+    def _frames(self):
+        frames = []
+        buffer = self.buffer
+        pos = 0
+        while len(buffer) - pos >= FRAME_HEADER.size:
+            length, kind = FRAME_HEADER.unpack_from(buffer, pos)
+            end = pos + 4 + length
+            if end > len(buffer):
+                break
+            frames.append((kind, bytes(buffer[pos + FRAME_HEADER.size:end])))
+            pos = end
+        del buffer[:pos]
+        return frames
+
+    def poll(self):
+        """Các khung đã tới, không chờ (socket phải ở chế độ non-blocking)."""
+        while True:
+            try:
+                data = self.sock.recv(1 << 16)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.closed = True
+                break
+            self.buffer += data
+        return self._frames()
+
+    def wait(self, timeout):
+        """Chờ tới khi có ít nhất một khung hoặc hết timeout (s); trả về các khung đã tới."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            frames = self.poll()
+            if frames or self.closed:
+                return frames
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return []
+            select.select([self.sock], [], [], remaining)
+
+
+def connect(path, name):
+    """Phía bot: kết nối tới trình mô phỏng, gửi HELLO, trả về (socket, reader, thông tin WELCOME)."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    sock.sendall(encode_hello(name))
+    sock.setblocking(False)
+    reader = FrameReader(sock)
+    frames = reader.wait(10.0)
+    if not frames or frames[0][0] != WELCOME:
+        raise ConnectionError("Simulator did not send WELCOME")
+    return sock, reader, decode_welcome(frames[0][1]), frames[1:]
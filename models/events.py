@@ -0,0 +1,154 @@
+# models/events.py
+"""
+Luồng sự kiện có cấu trúc cho mô phỏng (sút, chuyền, bắt bóng, đổi quyền
+kiểm soát bóng, thắng trận, strategy chạy quá ngân sách) thay cho print().
+
+Sự kiện được ghi vào một vòng đệm NumPy cấp phát sẵn và chuyển cho các
+subscriber (nhãn GUI, Recorder, thống kê batch). Mỗi sự kiện có một mức;
+sự kiện dưới mức thấp nhất đang được dùng (mức lưu vòng đệm và mức của các
+subscriber) bị bỏ ngay ở dòng đầu của emit(), nên gần như không tốn gì.
+
+Ví dụ:
+    from models.events import events, WIN
+    events.subscribe(lambda e: print(describe(e)), kinds=(WIN,))
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+# Mức sự kiện (giống logging)
+DEBUG = 10      # lần thử thất bại, lặp lại mỗi tick
+INFO = 20       # hành động thành công
+WARNING = 30
+
+# Loại sự kiện
+SHOT, PASS, CATCH, POSSESSION, WIN, OVERRUN = range(6)
+KIND_NAMES = ("shot", "pass", "catch", "possession", "win", "overrun")
+
+# Lý do thất bại (cột reason)
+REASONS = ("", "no_ball", "too_far", "not_in_front", "no_teammate", "no_lane")
+NO_BALL, TOO_FAR, NOT_IN_FRONT, NO_TEAMMATE, NO_LANE = range(1, 6)
+
+EVENT_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('kind', 'u1'),
+    ('level', 'u1'),
+    ('ok', '?'),
+    ('reason', 'u1'),
+    ('team', 'i1'),
+    ('robot', 'i2'),     # robot thực hiện, -1 nếu không có
+    ('target', 'i2'),    # robot nhận (chuyền) / robot mất bóng, -1 nếu không có
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('value', '<f4'),    # lực sút/chuyền (N); đội thắng; thời gian chạy strategy (ms)
+])
+
+Event = namedtuple('Event', EVENT_DTYPE.names)
+
+
+def describe(event):
+    """Một dòng mô tả dễ đọc của Event (dùng cho nhãn GUI / log)."""
+    name = KIND_NAMES[event.kind]
+    if event.kind == WIN:
+        return f"{event.time:.2f}s team {int(event.value)} wins"
+    if event.kind == OVERRUN:
+        return f"{event.time:.2f}s team {event.team} strategy overran ({event.value:.1f} ms)"
+    status = "ok" if event.ok else f"failed ({REASONS[event.reason]})"
+    text = f"{event.time:.2f}s {name} team {event.team} robot {event.robot} {status}"
+    if event.target >= 0:
+        text += f" -> {event.target}"
+    return text
+
+
+class EventStream:
+    """
+    Vòng đệm sự kiện kích thước cố định + danh sách subscriber.
+
+    Thuộc tính `level` là mức thấp nhất còn được xử lý; có thể kiểm tra
+    `events.level <= DEBUG` trước khi dựng tham số tốn kém.
+    """
+
+    def __init__(self, capacity=4096, record_level=INFO):
+        """
+        Args:
+            capacity (int): số sự kiện giữ trong vòng đệm
+            record_level (int): mức tối thiểu được ghi vào vòng đệm
+        """
+        self.buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.capacity = capacity
+        self.pos = 0
+        self.count = 0       # tổng số sự kiện đã ghi (kể cả đã bị ghi đè)
+        self.record_level = record_level
+        self.subscribers = []
+        self._muted = 0
+        self._update_level()
+
+    def _update_level(self):
+        levels = [self.record_level] + [level for _, level, _ in self.subscribers]
+        self.level = min(levels) if not self._muted else float('inf')
+
+    def set_record_level(self, level):
+        self.record_level = level
+        self._update_level()
+
+    @contextmanager
+    def muted(self):
+        """Bỏ mọi sự kiện trong khối with (ví dụ khi mô phỏng lại một bản ghi)."""
+        self._muted += 1
+        self._update_level()
+        try:
+            yield
+        finally:
+            self._muted -= 1
+            self._update_level()
+
+    def subscribe(self, callback, level=INFO, kinds=None):
+        """
+        Gọi callback(Event) cho mỗi sự kiện có mức >= level (và thuộc kinds nếu có).
+
+        Returns:
+            hàm không tham số để hủy đăng ký
+        """
+        entry = (callback, level, None if kinds is None else frozenset(kinds))
+        self.subscribers.append(entry)
+        self._update_level()
+
+        def unsubscribe():
+            if entry in self.subscribers:
+                self.subscribers.remove(entry)
+                self._update_level()
+        return unsubscribe
+
+    def emit(self, kind, level=INFO, ok=True, reason=0, time=0.0, team=0,
+             robot=-1, target=-1, x=np.nan, y=np.nan, value=np.nan):
+        if level < self.level:
+            return
+        record = (time, kind, level, ok, reason, team, robot, target, x, y, value)
+        if level >= self.record_level:
+            self.buffer[self.pos] = record
+            self.pos += 1
+            if self.pos == self.capacity:
+                self.pos = 0
+            self.count += 1
+        if self.subscribers:
+            event = Event(*record)
+            for callback, min_level, kinds in self.subscribers:
+                if level >= min_level and (kinds is None or kind in kinds):
+                    callback(event)
+
+    def recent(self, n=None):
+        """Các sự kiện trong vòng đệm (tối đa n sự kiện mới nhất), cũ nhất trước."""
+        held = min(self.count, self.capacity)
+        n = held if n is None else min(n, held)
+        idx = (self.pos - n + np.arange(n)) % self.capacity
+        return self.buffer[idx]
+
+    def clear(self):
+        self.pos = 0
+        self.count = 0
+
+
+# Luồng dùng chung trong tiến trình (Action không giữ tham chiếu tới World/scene)
+events = EventStream()
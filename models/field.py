@@ -6,6 +6,8 @@ from zones.target_zone import CircleZone, RectangleZone, DiamondZone, SemiCircle
 from zones.target_zone_drawer import draw_target_zone
 import math
 
+from config import FIELD_BOUND_X, FIELD_BOUND_Y
+
 class Field:
     def __init__(self, scale: float):
         self.SCALE = scale
@@ -140,4 +142,4 @@ class Field:
         draw_target_zone(scene, self.target_zone, self.SCALE, self.MARGIN)
 
     def is_inside_field(self, x, y):
-        return -12.0 <= x <= 12.0 and -8.0 <= y <= 8.0
+        return -FIELD_BOUND_X <= x <= FIELD_BOUND_X and -FIELD_BOUND_Y <= y <= FIELD_BOUND_Y
@@ -0,0 +1,343 @@
+# models/flow_field.py
+
+import copy
+import heapq
+import math
+import time
+import weakref
+from functools import lru_cache
+
+import numpy as np
+
+from config import FIELD_WIDTH, FIELD_HEIGHT, ROBOT_SIZE
+
+# 8 hướng lân cận (cột, hàng) và độ dài bước tương ứng (theo ô)
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+STEP = tuple(math.hypot(dc, dr) for dc, dr in DIRECTIONS)
+
+
+@lru_cache(maxsize=4)
+def _grid_tables(cell_size):
+    """
+    Bảng tĩnh của lưới (dùng chung giữa các FlowField cùng cell_size): số cột,
+    số hàng, tâm ô, bảng lân cận (n, 8) (-1 nếu ra ngoài lưới) và danh sách
+    (lân cận, độ dài bước) cho Dijkstra.
+    """
+    cols = int(math.ceil(FIELD_WIDTH / cell_size))
+    rows = int(math.ceil(FIELD_HEIGHT / cell_size))
+    n = cols * rows
+    col = np.arange(n) % cols
+    row = np.arange(n) // cols
+    center_x = -FIELD_WIDTH / 2 + (col + 0.5) * cell_size
+    center_y = -FIELD_HEIGHT / 2 + (row + 0.5) * cell_size
+
+    nc = col[:, None] + np.array([d[0] for d in DIRECTIONS])[None, :]
+    nr = row[:, None] + np.array([d[1] for d in DIRECTIONS])[None, :]
+    inside = (nc >= 0) & (nc < cols) & (nr >= 0) & (nr < rows)
+    neighbor_table = np.where(inside, nr * cols + nc, -1)
+    step = [s * cell_size for s in STEP]
+    neighbors = [[(nb, step[k]) for k, nb in enumerate(nbs) if nb >= 0]
+                 for nbs in neighbor_table.tolist()]
+    return cols, rows, center_x, center_y, neighbor_table, neighbors
+
+
+class FlowField:
+    """
+    Trường hướng đi chung về target zone trên lưới đều phủ sân.
+
+    Mỗi ô giữ khoảng cách đường đi ngắn nhất (Dijkstra 8 hướng) tới các ô nằm
+    trong Field.target_zone và ô cha trên đường đi đó. Robot là vật cản được
+    nới rộng thêm `inflate` mét. Tra hướng của bất kỳ số robot nào là O(1) mỗi
+    robot (chỉ đánh chỉ số mảng).
+
+    update() chỉ tính lại phần bị ảnh hưởng khi ô vật cản thay đổi: các ô có
+    đường đi đi qua ô vừa bị chặn được xóa (sóng "raise"), rồi Dijkstra được
+    chạy tiếp từ biên của vùng đó và từ các ô vừa được giải phóng (sóng "lower").
+    Khi robot không đổi ô vật cản, update() chỉ tốn một phép so sánh mảng.
+    """
+
+    def __init__(self, field, world, cell_size=0.25, inflate=ROBOT_SIZE,
+                 obstacle_team=None, lookahead=2):
+        """
+        Args:
+            field: Field có target_zone
+            world: World cung cấp vị trí robot
+            cell_size (float): cạnh ô lưới (m)
+            inflate (float): bán kính vật cản quanh tâm robot (m); mặc định bằng
+                tổng hai bán kính robot để tâm robot đi theo trường không chạm nhau
+            obstacle_team (int): chỉ robot của đội này là vật cản; None = mọi robot
+            lookahead (int): hướng trả về trỏ tới ô tổ tiên cách chừng này bước
+                (mượt hơn 8 hướng thô)
+        """
+        self.field = field
+        self.world = world
+        self.cell_size = cell_size
+        self.inflate = inflate
+        self.obstacle_team = obstacle_team
+        self.lookahead = lookahead
+
+        self.x_min = -FIELD_WIDTH / 2
+        self.y_min = -FIELD_HEIGHT / 2
+        self.cols, self.rows, self.center_x, self.center_y, self.neighbor_table, \
+            self._neighbors = _grid_tables(cell_size)
+        n = self.cols * self.rows
+
+        # Mẫu ô (lệch cột, lệch hàng) bị một robot chặn
+        reach = int(math.ceil(inflate / cell_size)) + 1
+        dc, dr = np.meshgrid(np.arange(-reach, reach + 1), np.arange(-reach, reach + 1))
+        self._stencil_c = dc.ravel()
+        self._stencil_r = dr.ravel()
+
+        self.zone = None
+        self.blocked = np.zeros(n, dtype=bool)
+        self.dist = np.full(n, np.inf)
+        self.parent = np.full(n, -1, dtype=np.intp)   # ô nguồn trỏ về chính nó
+        self._dist = self.dist.tolist()
+        self._parent = self.parent.tolist()
+        self._blocked = self.blocked.tolist()
+
+        # Thống kê chi phí update() (báo trong batch_runner / nhãn tốc độ)
+        self.update_time = 0.0      # tổng thời gian (s)
+        self.update_count = 0       # số lần gọi
+        self.last_update_time = 0.0
+        self.last_cells = 0         # số ô tính lại ở lần gọi gần nhất
+
+    def __deepcopy__(self, memo):
+        # Bảng tĩnh của lưới (_grid_tables) dùng chung giữa các bản sao
+        for table in (self.center_x, self.center_y, self.neighbor_table, self._neighbors):
+            memo[id(table)] = table
+        clone = FlowField.__new__(FlowField)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    def cell_index(self, xs, ys):
+        """Chỉ số ô chứa các điểm (m), điểm ngoài lưới lấy ô gần nhất."""
+        c = ((np.asarray(xs, dtype=np.float64) - self.x_min) / self.cell_size).astype(np.intp)
+        r = ((np.asarray(ys, dtype=np.float64) - self.y_min) / self.cell_size).astype(np.intp)
+        np.clip(c, 0, self.cols - 1, out=c)
+        np.clip(r, 0, self.rows - 1, out=r)
+        return r * self.cols + c
+
+    def _obstacles(self):
+        """Mặt nạ ô bị chặn bởi robot ở vị trí hiện tại."""
+        world = self.world
+        mask = world.active.copy()
+        if self.obstacle_team is not None:
+            mask &= world.team == self.obstacle_team
+        blocked = np.zeros(self.cols * self.rows, dtype=bool)
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return blocked
+        x = world.x[idx]
+        y = world.y[idx]
+        c = np.floor((x - self.x_min) / self.cell_size).astype(np.intp)[:, None] + self._stencil_c
+        r = np.floor((y - self.y_min) / self.cell_size).astype(np.intp)[:, None] + self._stencil_r
+        ok = (c >= 0) & (c < self.cols) & (r >= 0) & (r < self.rows)
+        cells = (r * self.cols + c)[ok]
+        px = np.broadcast_to(x[:, None], ok.shape)[ok]
+        py = np.broadcast_to(y[:, None], ok.shape)[ok]
+        near = np.hypot(self.center_x[cells] - px, self.center_y[cells] - py) <= self.inflate
+        blocked[cells[near]] = True
+        return blocked
+
+    def update(self):
+        """
+        Đồng bộ trường với vị trí robot hiện tại.
+
+        Returns:
+            số ô được tính lại (0 nếu không có gì thay đổi)
+        """
+        t0 = time.perf_counter()
+        blocked = self._obstacles()
+        if self.zone is not self.field.target_zone:
+            touched = self._rebuild(blocked)
+        else:
+            changed = np.flatnonzero(blocked != self.blocked)
+            touched = self._repair(blocked, changed) if len(changed) else []
+
+        if touched:
+            touched = np.array(touched, dtype=np.intp)
+            self.dist[touched] = [self._dist[c] for c in touched.tolist()]
+            self.parent[touched] = [self._parent[c] for c in touched.tolist()]
+
+        elapsed = time.perf_counter() - t0
+        self.update_time += elapsed
+        self.update_count += 1
+        self.last_update_time = elapsed
+        self.last_cells = len(touched)
+        return self.last_cells
+
+    def _rebuild(self, blocked):
+        """Tính lại toàn bộ trường (lần đầu hoặc khi target zone đổi)."""
+        self.zone = self.field.target_zone
+        self.sources = self.zone.contains_many(self.center_x, self.center_y)
+        n = self.cols * self.rows
+        self.blocked = blocked
+        self._blocked = blocked.tolist()
+        self._dist = [math.inf] * n
+        self._parent = [-1] * n
+        heap = []
+        for c in np.flatnonzero(self.sources & ~blocked).tolist():
+            self._dist[c] = 0.0
+            self._parent[c] = c
+            heap.append((0.0, c))
+        self._propagate(heap, set())
+        return list(range(n))
+
+    def _repair(self, blocked, changed):
+        """Sửa trường quanh các ô vật cản vừa đổi trạng thái."""
+        dist, parent, neighbors = self._dist, self._parent, self._neighbors
+        is_blocked = self._blocked
+        for c, b in zip(changed.tolist(), blocked[changed].tolist()):
+            is_blocked[c] = b
+        self.blocked = blocked
+
+        # Sóng raise: xóa các ô có đường đi qua ô vừa bị chặn. Trên lưới 8 hướng
+        # nhiều ô có cha khác cùng khoảng cách; chuyển sang cha đó thay vì xóa
+        # giữ sóng nhỏ (nếu cha mới sau đó bị xóa, ô này cũng bị xóa theo).
+        invalid = []
+        moved = []
+        stack = [c for c in changed.tolist() if is_blocked[c]]
+        for c in stack:
+            dist[c] = math.inf
+            parent[c] = -1
+        while stack:
+            c = stack.pop()
+            invalid.append(c)
+            for nb, _ in neighbors[c]:
+                if parent[nb] != c or nb == c:
+                    continue
+                d_nb = dist[nb]
+                for q, w in neighbors[nb]:
+                    if abs(dist[q] + w - d_nb) < 1e-9 and parent[q] != nb and not is_blocked[q]:
+                        parent[nb] = q
+                        moved.append(nb)
+                        break
+                else:
+                    dist[nb] = math.inf
+                    parent[nb] = -1
+                    stack.append(nb)
+
+        # Sóng lower: gieo lại từ lân cận còn hợp lệ và từ ô vừa được giải phóng
+        heap = []
+        touched = set(invalid)
+        sources = self.sources
+        for c in changed.tolist():
+            if not is_blocked[c]:
+                touched.add(c)
+                if sources[c]:
+                    dist[c] = 0.0
+                    parent[c] = c
+                    heap.append((0.0, c))
+        for c in touched:
+            if is_blocked[c] or dist[c] == 0.0:
+                continue
+            best, best_nb = math.inf, -1
+            for nb, w in neighbors[c]:
+                d = dist[nb] + w
+                if d < best:
+                    best, best_nb = d, nb
+            dist[c] = best
+            parent[c] = best_nb
+            if best < math.inf:
+                heap.append((best, c))
+        heapq.heapify(heap)
+        self._propagate(heap, touched)
+        touched.update(moved)
+        return list(touched)
+
+    def _propagate(self, heap, touched):
+        """Dijkstra từ các ô trong heap; ghi các ô đã đổi vào touched."""
+        dist, parent, neighbors, is_blocked = self._dist, self._parent, self._neighbors, self._blocked
+        heapq.heapify(heap)
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            d, c = pop(heap)
+            if d > dist[c]:
+                continue
+            for nb, w in neighbors[c]:
+                nd = d + w
+                if nd < dist[nb] and not is_blocked[nb]:
+                    dist[nb] = nd
+                    parent[nb] = c
+                    touched.add(nb)
+                    push(heap, (nd, nb))
+
+    def headings(self, xs, ys):
+        """
+        Hướng đi (vector đơn vị) tại các điểm (m).
+
+        Ô nằm trong vật cản lấy hướng của ô lân cận tự do gần zone nhất; ô
+        không tới được zone (hoặc đã trong zone) thì hướng thẳng về tâm zone.
+
+        Returns:
+            (ux, uy) mảng cùng độ dài với xs
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        cells = self.cell_index(xs, ys)
+
+        inside = self.blocked[cells]
+        if inside.any():
+            nbs = self.neighbor_table[cells[inside]]
+            nd = np.where(nbs >= 0, self.dist[nbs], np.inf)
+            nd[self.blocked[nbs]] = np.inf
+            k = np.argmin(nd, axis=1)
+            best = nbs[np.arange(len(nbs)), k]
+            cells = cells.copy()
+            cells[inside] = np.where(np.isfinite(nd[np.arange(len(nbs)), k]), best, cells[inside])
+
+        target = cells
+        for _ in range(self.lookahead):
+            p = self.parent[target]
+            target = np.where(p >= 0, p, target)
+        tx = self.center_x[target] - xs
+        ty = self.center_y[target] - ys
+        direct = (target == cells) | ~np.isfinite(self.dist[cells])
+        if direct.any():
+            tx = np.where(direct, self.zone.cx - xs, tx)
+            ty = np.where(direct, self.zone.cy - ys, ty)
+        norm = np.hypot(tx, ty)
+        norm[norm == 0] = 1.0
+        return tx / norm, ty / norm
+
+    def distances(self, xs, ys):
+        """Khoảng cách đường đi (m) tới zone tại các điểm, inf nếu không tới được."""
+        return self.dist[self.cell_index(xs, ys)]
+
+
+# Trường dùng chung theo World: mọi strategy (GUI lẫn Match headless) trên cùng
+# một World cùng tham số dùng chung một FlowField
+_shared = weakref.WeakKeyDictionary()
+
+
+def shared_flow_field(world, field, obstacle_team=None, cell_size=0.25, inflate=ROBOT_SIZE):
+    """FlowField dùng chung cho `world`, tạo mới nếu chưa có."""
+    fields = _shared.setdefault(world, {})
+    key = (id(field), obstacle_team, cell_size, inflate)
+    flow = fields.get(key)
+    if flow is None:
+        flow = FlowField(field, world, cell_size, inflate, obstacle_team)
+        fields[key] = flow
+    return flow
+
+
+def shared_flow_fields(world):
+    """Các FlowField dùng chung đang gắn với `world` (để chụp keyframe)."""
+    return list(_shared.get(world, {}).values())
+
+
+def set_shared_flow_fields(world, fields):
+    """
+    Thay các FlowField dùng chung của `world` bằng `fields` (ví dụ bản sao
+    trong keyframe); list rỗng = bỏ hết, lần dùng tới sẽ tính lại từ đầu.
+    """
+    _shared[world] = {(id(f.field), f.obstacle_team, f.cell_size, f.inflate): f for f in fields}
+
+
+def flow_field_stats(world):
+    """(tổng thời gian update (s), số lần update) của mọi FlowField gắn với `world`."""
+    fields = _shared.get(world, {}).values()
+    return sum(f.update_time for f in fields), sum(f.update_count for f in fields)
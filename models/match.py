@@ -0,0 +1,111 @@
+# models/match.py
+
+import math
+import random
+
+import numpy as np
+
+from config import SCALE, TIMESTEP
+from models.field import Field
+from models.team import Team
+from models.win_evaluator import WinEvaluator, BLOCK_DISTANCE
+from models.world import World
+from models.events import events, KIND_NAMES, INFO, WIN
+from controllers.xbox_controller import drive_robot
+from strategies.strategy_manager import create_strategy, new_seed, StrategyManager
+
+DEFAULT_BLUE_POSITIONS = [(6, 1, 180), (6, -1, 180), (6, 2, 180), (6, -3, 180), (6, -7, 180)]
+DEFAULT_RED_POSITIONS = [(-7, 0, 180), (-7, 2, 180), (-7, 4, 180), (-7, -2, 180), (-7, -4, 180)]
+
+class Match:
+    """Một trận đấu headless: World + hai Team + strategy, không cần scene."""
+
+    def __init__(self, attack="Random", defense="Random", seed=None, dt=TIMESTEP,
+                 positions_blue=None, positions_red=None, field=None, process_mode=None):
+        """
+        Args:
+            attack (str): tên strategy của đội đỏ (xem ATTACK_STRATEGIES)
+            defense (str): tên strategy của đội xanh (xem DEFENSE_STRATEGIES)
+            seed (int): seed cho trận đấu, None = seed mới mỗi trận (không lặp lại được)
+            dt (float): bước thời gian mỗi tick (s)
+            process_mode (str): None, "async" hoặc "lockstep" (xem ProcessStrategy);
+                nhớ gọi close() khi xong
+        """
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed % 2**32)
+
+        self.field = field if field is not None else Field(SCALE)
+        self.world = World()
+        self.team1 = Team(1, None, self.field.MARGIN, world=self.world)
+        self.team2 = Team(2, None, self.field.MARGIN, world=self.world)
+        self.team1.create_robots(0, positions=positions_blue or DEFAULT_BLUE_POSITIONS)
+        self.team2.create_robots(0, positions=positions_red or DEFAULT_RED_POSITIONS)
+
+        worker_seed = seed if seed is not None else new_seed()
+        self.defense = create_strategy(defense, 'defense', self.team1, self.field, dt,
+                                       process_mode, worker_seed)
+        self.attack = create_strategy(attack, 'attack', self.team2, self.field, dt,
+                                      process_mode, worker_seed + 1)
+        # Không bỏ lượt theo thời gian CPU để kết quả lặp lại được theo seed;
+        # overrun vẫn được đo (scheduler.report(), sự kiện OVERRUN)
+        self.scheduler = StrategyManager(dt, enforce_budgets=False)
+        self.scheduler.add(self.defense)
+        self.scheduler.add(self.attack)
+
+        self.evaluator = WinEvaluator(self.field.target_zone)
+        self.dt = dt
+        self.seed = seed
+        self.winner = None
+        self.breach_time = math.nan
+        self.blocked_time = 0.0  # tổng (robot đỏ x giây) bị chặn
+        self.event_counts = np.zeros(len(KIND_NAMES), dtype=np.int64)  # theo loại sự kiện
+
+    def set_controlled(self, team_id, indices):
+        """Đánh dấu robot (chỉ số trong World) của đội team_id đang điều khiển bằng tay."""
+        strategy = self.defense if team_id == 1 else self.attack
+        if strategy is not None and hasattr(strategy, 'skip'):
+            strategy.skip = {self.world.handles[i] for i in indices}
+
+    def step(self, controls=None):
+        """
+        Chạy một tick, trả về đội thắng hoặc None.
+
+        Args:
+            controls: None, hoặc list (chỉ số robot, lx, ly, rx) điều khiển bằng
+                tay trong tick này, theo đúng thứ tự GUI áp dụng (xem drive_robot)
+        """
+        if controls is not None:
+            # Giống simulate_tick của GUI: làm mới lưới rồi áp dụng tay cầm trước strategy
+            self.world.grid.refresh()
+            for index, lx, ly, rx in controls:
+                drive_robot(self.world, index, lx, ly, rx, self.dt)
+        self.scheduler.step()
+        self.world.step(self.dt)
+
+        winner, blocked = self.evaluator.evaluate_world(self.world)
+        self.blocked_time += blocked * self.dt
+        if winner == "red":
+            self.breach_time = self.world.time
+        if winner is not None:
+            events.emit(WIN, INFO, time=self.world.time, value=2 if winner == "red" else 1)
+        self.winner = winner
+        return winner
+
+    def run(self, max_ticks):
+        """Chạy đến khi có đội thắng hoặc hết max_ticks."""
+        unsubscribe = events.subscribe(self.count_event, INFO)
+        try:
+            while self.world.tick < max_ticks:
+                if self.step() is not None:
+                    break
+        finally:
+            unsubscribe()
+        return self.winner
+
+    def close(self):
+        """Dừng các strategy chạy ở tiến trình riêng (nếu có)."""
+        self.scheduler.clear()
+
+    def count_event(self, event):
+        self.event_counts[event.kind] += 1
@@ -0,0 +1,108 @@
+# models/pass_evaluator.py
+
+import numpy as np
+
+from config import ROBOT_SIZE, FIELD_WIDTH
+from models.ball_physics import GRAVITY
+
+# Khung thành đội đó tấn công (mét): đội đỏ (2) đánh sang phải, đội xanh (1) sang trái
+ATTACK_GOALS = {1: (-FIELD_WIDTH / 2, 0.0), 2: (FIELD_WIDTH / 2, 0.0)}
+
+MAX_MARGIN = 1.0    # thời gian dư (s) vượt quá mức này coi như hành lang hoàn toàn trống
+W_TIME = 0.5        # trọng số thời gian bóng tới người nhận (điểm / s)
+W_GOAL = 1.0        # trọng số khoảng cách người nhận tới khung thành (điểm / chiều dài sân)
+
+
+class PassEvaluator:
+    """
+    Chấm điểm mọi phương án chuyền cùng lúc trên mảng (teammates x opponents).
+
+    Với mỗi đồng đội: thời gian bóng lăn tới (mô hình ma sát giảm tốc đều như
+    BallPhysics), mức an toàn của hành lang chuyền so với mọi đối thủ và
+    khoảng cách người nhận tới khung thành. Đối thủ cắt được đường chuyền nếu
+    nó chạy tới điểm gần nhất trên hành lang trước khi bóng tới đó.
+    """
+
+    def __init__(self, ball_mass=0.5, friction=0.4, ball_radius=0.12,
+                 robot_radius=ROBOT_SIZE / 2, opponent_speed=1.0, min_forward=0.1):
+        """
+        Args:
+            ball_mass (float): khối lượng bóng (kg), tốc độ sút = lực / khối lượng
+            friction (float): hệ số ma sát lăn
+            ball_radius, robot_radius (float): bán kính (m)
+            opponent_speed (float): tốc độ giả định của đối thủ (m/s)
+            min_forward (float): đồng đội phải nằm phía trước ít nhất chừng này
+                (m, theo hướng robot); None = chuyền mọi hướng
+        """
+        self.ball_mass = ball_mass
+        self.deceleration = friction * GRAVITY
+        self.reach = ball_radius + robot_radius
+        self.opponent_speed = opponent_speed
+        self.min_forward = min_forward
+
+        # Kết quả lần evaluate() gần nhất, để strategy xem chi tiết
+        self.travel_time = self.lane_margin = self.goal_distance = self.scores = None
+
+    def _ball_time(self, speed, distance):
+        """Thời gian bóng lăn hết `distance` với tốc độ đầu `speed`; inf nếu dừng trước."""
+        a = self.deceleration
+        disc = speed * speed - 2 * a * distance
+        t = (speed - np.sqrt(np.maximum(disc, 0.0))) / a
+        t[disc < 0] = np.inf
+        return t
+
+    def evaluate(self, px, py, theta_deg, mates_x, mates_y, opp_x, opp_y, power, goal):
+        """
+        Args:
+            px, py, theta_deg: pose người chuyền (m, độ)
+            mates_x, mates_y: tọa độ các đồng đội (k,)
+            opp_x, opp_y: tọa độ đối thủ (m,)
+            power (float): lực sút (N)
+            goal: (x, y) khung thành cần tấn công
+
+        Returns:
+            scores (k,): điểm mỗi phương án, -inf nếu không chuyền được
+        """
+        mx = np.asarray(mates_x, dtype=np.float64) - px
+        my = np.asarray(mates_y, dtype=np.float64) - py
+        ox = np.asarray(opp_x, dtype=np.float64) - px
+        oy = np.asarray(opp_y, dtype=np.float64) - py
+        speed = power / self.ball_mass
+
+        dist = np.hypot(mx, my)
+        safe = np.where(dist > 0, dist, 1.0)
+        ux, uy = mx / safe, my / safe
+        travel = self._ball_time(speed, dist)
+
+        # Điểm gần nhất trên hành lang của mỗi đối thủ: (k, m)
+        along = ux[:, None] * ox[None, :] + uy[:, None] * oy[None, :]
+        along = np.minimum(np.maximum(along, 0.0), dist[:, None])
+        perp = np.hypot(ox[None, :] - ux[:, None] * along, oy[None, :] - uy[:, None] * along)
+        t_ball = self._ball_time(speed, along)
+        t_opp = np.maximum(perp - self.reach, 0.0) / self.opponent_speed
+        margin = (t_opp - t_ball).min(axis=1) if len(ox) else np.full(len(mx), MAX_MARGIN)
+        margin = np.minimum(margin, MAX_MARGIN)
+
+        goal_dist = np.hypot(mx + px - goal[0], my + py - goal[1])
+
+        valid = np.isfinite(travel) & (dist > 0) & (margin > 0)
+        if self.min_forward is not None:
+            theta = np.radians(theta_deg)
+            valid &= mx * np.cos(theta) + my * np.sin(theta) > self.min_forward
+
+        scores = margin - W_TIME * travel - W_GOAL * goal_dist / FIELD_WIDTH
+        scores = np.where(valid, scores, -np.inf)
+
+        self.travel_time = travel
+        self.lane_margin = margin
+        self.goal_distance = goal_dist
+        self.scores = scores
+        return scores
+
+    def best(self, *args, **kwargs):
+        """Chỉ số phương án tốt nhất của evaluate(...), None nếu không có."""
+        scores = self.evaluate(*args, **kwargs)
+        if not len(scores):
+            return None
+        k = int(np.argmax(scores))
+        return k if np.isfinite(scores[k]) else None
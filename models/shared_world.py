@@ -0,0 +1,169 @@
+# models/shared_world.py
+"""
+Ảnh chụp World và hộp thư lệnh trên bộ nhớ chia sẻ giữa các tiến trình.
+
+SharedSnapshot: tiến trình chính ghi pose robot + bóng mỗi lần publish() vào
+một trong hai bộ đệm (double buffer) rồi mới đổi chỉ số bộ đệm mới nhất; tiến
+trình worker đọc trực tiếp view NumPy trên bộ nhớ chia sẻ, không pickle, không
+copy. Mỗi bộ đệm có số thứ tự `seq` kiểu seqlock: bị đặt -1 khi đang ghi, nên
+người đọc kiểm tra seq trước và sau khi đọc để phát hiện bản ghi bị ghi đè.
+
+CommandMailbox: mỗi worker một hộp thư hai ngăn, chỉ worker ghi và chỉ tiến
+trình chính đọc, cùng cơ chế seq. Không dùng khóa ở đường dữ liệu.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAX_ROBOTS = 64     # số robot tối đa trong một ảnh chụp
+
+SNAPSHOT_DTYPE = np.dtype([
+    ('seq', '<i8'),             # -1 khi đang ghi
+    ('version', '<i8'),         # world.version, đổi khi thêm/xóa robot
+    ('n', '<i8'),
+    ('time', '<f8'),
+    ('dt', '<f8'),              # bước thời gian strategy cần mô phỏng
+    ('seed', '<i8'),
+    ('x', '<f8', (MAX_ROBOTS,)),
+    ('y', '<f8', (MAX_ROBOTS,)),
+    ('theta', '<f8', (MAX_ROBOTS,)),
+    ('team', 'i1', (MAX_ROBOTS,)),
+    ('robot_id', '<i2', (MAX_ROBOTS,)),
+    ('active', '?', (MAX_ROBOTS,)),
+    ('has_ball', '?', (MAX_ROBOTS,)),
+    ('skip', '?', (MAX_ROBOTS,)),   # robot điều khiển bằng tay, strategy không được đụng
+    ('ball_pos', '<f8', (2,)),
+    ('ball_vel', '<f8', (2,)),
+])
+
+COMMAND_DTYPE = np.dtype([
+    ('seq', '<i8'),             # seq của ảnh chụp đã trả lời, -1 khi đang ghi
+    ('dt', '<f8'),
+    ('x0', '<f8', (MAX_ROBOTS,)),   # pose đầu vào (để đổi ra vận tốc)
+    ('y0', '<f8', (MAX_ROBOTS,)),
+    ('x', '<f8', (MAX_ROBOTS,)),    # pose sau khi strategy chạy
+    ('y', '<f8', (MAX_ROBOTS,)),
+    ('theta', '<f8', (MAX_ROBOTS,)),
+])
+
+HEADER_DTYPE = np.dtype([
+    ('latest', '<i8'),          # seq mới nhất đã ghi xong, -1 = chưa có
+    ('stop', '<i8'),            # 1 = worker cần thoát
+])
+
+
+class _SharedBlock:
+    """Một header + hai ngăn kiểu `dtype` trên một vùng SharedMemory."""
+
+    def __init__(self, dtype, name=None):
+        size = HEADER_DTYPE.itemsize + 2 * dtype.itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        self.slots = np.ndarray((2,), dtype=dtype, buffer=self.shm.buf,
+                                offset=HEADER_DTYPE.itemsize)
+        if self.owner:
+            self.header['latest'] = -1
+            self.header['stop'] = 0
+            self.slots['seq'] = -1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def latest(self):
+        return int(self.header['latest'])
+
+    def close(self):
+        # View NumPy phải được bỏ trước khi đóng mmap
+        self.header = self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedSnapshot(_SharedBlock):
+    """Ảnh chụp World double-buffered; tiến trình chính ghi, worker đọc."""
+
+    def __init__(self, name=None):
+        super().__init__(SNAPSHOT_DTYPE, name)
+
+    def publish(self, world, seq, dt, seed=0, skip=()):
+        """Ghi trạng thái World vào bộ đệm không được đọc gần nhất rồi công bố seq."""
+        n = len(world.x)
+        if n > MAX_ROBOTS:
+            raise ValueError(f"Too many robots for shared snapshot ({n} > {MAX_ROBOTS})")
+        slot = self.slots[seq % 2]
+        slot['seq'] = -1
+        slot['version'] = world.version
+        slot['n'] = n
+        slot['time'] = world.time
+        slot['dt'] = dt
+        slot['seed'] = seed
+        slot['x'][:n] = world.x
+        slot['y'][:n] = world.y
+        slot['theta'][:n] = world.theta
+        slot['team'][:n] = world.team
+        slot['robot_id'][:n] = world.robot_id
+        slot['active'][:n] = world.active
+        slot['has_ball'][:n] = world.has_ball
+        slot['skip'][:n] = False
+        if len(skip):
+            slot['skip'][np.asarray(skip, dtype=np.intp)] = True
+        slot['ball_pos'] = world.ball_pos
+        slot['ball_vel'] = world.ball_vel
+        slot['seq'] = seq
+        self.header['latest'] = seq
+
+    def read(self):
+        """
+        Bộ đệm mới nhất (view, không copy) hoặc None nếu chưa có / đang bị ghi.
+        Sau khi dùng xong gọi valid(slot, seq) để chắc dữ liệu không bị ghi đè.
+        """
+        seq = self.latest
+        if seq < 0:
+            return None
+        slot = self.slots[seq % 2]
+        if int(slot['seq']) != seq:
+            return None
+        return slot
+
+    @staticmethod
+    def valid(slot, seq):
+        return int(slot['seq']) == seq
+
+
+class CommandMailbox(_SharedBlock):
+    """Hộp thư lệnh của một worker: worker ghi pose kết quả, tiến trình chính đọc."""
+
+    def __init__(self, name=None):
+        super().__init__(COMMAND_DTYPE, name)
+
+    def begin(self, seq):
+        """Ngăn để worker ghi câu trả lời cho ảnh chụp seq (đánh dấu đang ghi)."""
+        slot = self.slots[seq % 2]
+        slot['seq'] = -1
+        return slot
+
+    def commit(self, slot, seq):
+        slot['seq'] = seq
+        self.header['latest'] = seq
+
+    def read(self, n):
+        """
+        Bản sao câu trả lời mới nhất cho n robot đầu: (seq, dt, x0, y0, x, y, theta),
+        hoặc None nếu chưa có hoặc ngăn bị ghi đè trong lúc đọc.
+        """
+        seq = self.latest
+        if seq < 0:
+            return None
+        slot = self.slots[seq % 2]
+        if int(slot['seq']) != seq:
+            return None
+        out = (seq, float(slot['dt']), slot['x0'][:n].copy(), slot['y0'][:n].copy(),
+               slot['x'][:n].copy(), slot['y'][:n].copy(), slot['theta'][:n].copy())
+        if int(slot['seq']) != seq:
+            return None
+        return out
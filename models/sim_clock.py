@@ -0,0 +1,55 @@
+# models/sim_clock.py
+
+import time
+
+from config import TIMESTEP
+
+
+class SimClock:
+    """
+    Đồng hồ mô phỏng bước cố định.
+
+    Mỗi frame hiển thị gọi advance(): thời gian thực trôi qua được cộng vào bộ
+    tích lũy và trả về số tick TIMESTEP cần chạy. Phần dư (alpha, 0..1) dùng để
+    nội suy vị trí khi vẽ, nên tốc độ mô phỏng không phụ thuộc vào tốc độ vẽ.
+    """
+
+    def __init__(self, dt=TIMESTEP, max_steps=10, time_source=time.perf_counter):
+        """
+        Args:
+            dt (float): bước mô phỏng (s)
+            max_steps (int): số tick tối đa mỗi frame; GUI bị nghẽn lâu hơn thế
+                thì phần thời gian tồn đọng bị bỏ thay vì chạy dồn
+            time_source: hàm trả về thời gian thực (s)
+        """
+        self.dt = dt
+        self.max_steps = max_steps
+        self.time_source = time_source
+        self.reset()
+
+    def reset(self):
+        """Bỏ thời gian đã tích lũy (gọi khi bắt đầu hoặc tiếp tục sau khi dừng)."""
+        self.accumulator = 0.0
+        self.last = None
+
+    def advance(self):
+        """Số tick cần chạy cho frame này."""
+        now = self.time_source()
+        if self.last is None:
+            self.last = now
+            return 0
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.dt
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Vị trí của frame giữa tick trước và tick hiện tại, trong [0, 1)."""
+        return min(self.accumulator / self.dt, 1.0)
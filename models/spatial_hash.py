@@ -0,0 +1,171 @@
+# models/spatial_hash.py
+
+import math
+import numpy as np
+
+from config import FIELD_BOUND_X, FIELD_BOUND_Y
+
+
+class SpatialHash:
+    """
+    Lưới đều (uniform grid) phủ sân để tìm nhanh các robot lân cận.
+
+    Mỗi ô giữ tập chỉ số robot (chỉ số trong các mảng của World). refresh() chỉ
+    chuyển ô cho những robot đã đổi ô kể từ lần trước, move() cập nhật một robot.
+    """
+
+    def __init__(self, world, cell_size=1.0, x_min=-FIELD_BOUND_X, y_min=-FIELD_BOUND_Y,
+                 width=2 * FIELD_BOUND_X, height=2 * FIELD_BOUND_Y):
+        """
+        Args:
+            world: World chứa các mảng x, y, active
+            cell_size (float): cạnh ô lưới (m), nên >= bán kính truy vấn thường dùng
+            x_min, y_min, width, height: vùng phủ (m), mặc định là vùng robot được đi (inside_field)
+        """
+        self.world = world
+        self.cell_size = cell_size
+        self.inv_cell = 1.0 / cell_size
+        self.x_min = x_min
+        self.y_min = y_min
+        self.cols = int(math.ceil(width / cell_size))
+        self.rows = int(math.ceil(height / cell_size))
+
+        self.cells = {}
+        self.cell_of = np.zeros(0, dtype=np.int64)
+
+    def _cells(self, x, y, active):
+        cx = ((x - self.x_min) * self.inv_cell).astype(np.int64)
+        cy = ((y - self.y_min) * self.inv_cell).astype(np.int64)
+        np.minimum(np.maximum(cx, 0, out=cx), self.cols - 1, out=cx)
+        np.minimum(np.maximum(cy, 0, out=cy), self.rows - 1, out=cy)
+        cells = cy * self.cols + cx
+        cells[~active] = -1
+        return cells
+
+    def _col(self, x):
+        c = int((x - self.x_min) * self.inv_cell)
+        if c < 0:
+            return 0
+        return c if c < self.cols else self.cols - 1
+
+    def _row(self, y):
+        r = int((y - self.y_min) * self.inv_cell)
+        if r < 0:
+            return 0
+        return r if r < self.rows else self.rows - 1
+
+    def _cell(self, x, y):
+        return self._row(y) * self.cols + self._col(x)
+
+    def rebuild(self):
+        world = self.world
+        self.cell_of = self._cells(world.x, world.y, world.active)
+        self.cells = {}
+        for i, c in enumerate(self.cell_of.tolist()):
+            if c >= 0:
+                self.cells.setdefault(c, set()).add(i)
+
+    def refresh(self):
+        """Đồng bộ lưới với World; chỉ robot đổi ô mới bị chuyển."""
+        world = self.world
+        if len(self.cell_of) != len(world.x):
+            self.rebuild()
+            return self
+
+        new = self._cells(world.x, world.y, world.active)
+        changed = np.flatnonzero(new != self.cell_of)
+        if len(changed):
+            old_cells = self.cell_of[changed].tolist()
+            new_cells = new[changed].tolist()
+            for i, old_c, new_c in zip(changed.tolist(), old_cells, new_cells):
+                if old_c >= 0:
+                    self.cells[old_c].discard(i)
+                if new_c >= 0:
+                    self.cells.setdefault(new_c, set()).add(i)
+            self.cell_of = new
+        return self
+
+    def move(self, i):
+        """Cập nhật ô của robot i sau khi nó vừa di chuyển."""
+        world = self.world
+        new_c = self._cell(world.x[i], world.y[i]) if world.active[i] else -1
+        old_c = int(self.cell_of[i])
+        if new_c != old_c:
+            if old_c >= 0:
+                self.cells[old_c].discard(i)
+            if new_c >= 0:
+                self.cells.setdefault(new_c, set()).add(i)
+            self.cell_of[i] = new_c
+
+    def query(self, x, y, r, exclude=None, team=None):
+        """
+        Các robot có khoảng cách tới (x, y) <= r.
+
+        Returns:
+            list các tuple (index, dist)
+        """
+        world = self.world
+        c0 = self._col(x - r)
+        c1 = self._col(x + r)
+        r0 = self._row(y - r)
+        r1 = self._row(y + r)
+
+        xs = world.x
+        ys = world.y
+        teams = world.team
+        out = []
+        cells = self.cells
+        for row in range(r0, r1 + 1):
+            base = row * self.cols
+            for col in range(c0, c1 + 1):
+                members = cells.get(base + col)
+                if not members:
+                    continue
+                for j in members:
+                    if j == exclude or (team is not None and teams[j] != team):
+                        continue
+                    d = math.hypot(xs[j] - x, ys[j] - y)
+                    if d <= r:
+                        out.append((j, d))
+        return out
+
+    def candidates(self, indices, r):
+        """
+        Các cặp ứng viên lân cận cho nhiều robot cùng lúc (vector hóa): mọi robot
+        nằm trong các ô phủ hình vuông cạnh 2r quanh từng robot trong `indices`,
+        trừ chính nó. Người gọi tự lọc theo khoảng cách thật.
+
+        Args:
+            indices: mảng chỉ số robot (trong World) cần tìm lân cận
+            r (float): bán kính truy vấn (m)
+
+        Returns:
+            (rows, cols): rows là vị trí trong `indices`, cols là chỉ số robot lân cận
+        """
+        world = self.world
+        indices = np.asarray(indices, dtype=np.intp)
+        order = np.argsort(self.cell_of, kind='stable')
+        sorted_cells = self.cell_of[order]
+        all_cells = np.arange(self.rows * self.cols)
+        starts = np.searchsorted(sorted_cells, all_cells, side='left')
+        ends = np.searchsorted(sorted_cells, all_cells, side='right')
+
+        home = self._cells(world.x[indices], world.y[indices], np.ones(len(indices), dtype=bool))
+        k = int(math.ceil(r * self.inv_cell))
+        offset = np.arange(-k, k + 1)
+        ox, oy = (a.ravel() for a in np.meshgrid(offset, offset))
+        cx = (home % self.cols)[:, None] + ox[None, :]
+        cy = (home // self.cols)[:, None] + oy[None, :]
+        valid = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        query = np.broadcast_to(np.arange(len(indices))[:, None], valid.shape)[valid]
+        cell = (cy * self.cols + cx)[valid]
+
+        first = starts[cell]
+        counts = ends[cell] - first
+        total = int(counts.sum())
+        rows = np.repeat(query, counts)
+        position = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) \
+            + np.repeat(first, counts)
+        cols = order[position]
+        keep = cols != indices[rows]
+        return rows[keep], cols[keep]
@@ -1,15 +1,25 @@
-from PyQt5.QtWidgets import QGraphicsItemGroup, QGraphicsRectItem, QGraphicsPathItem
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsItemGroup, QGraphicsRectItem, QGraphicsPathItem
 from PyQt5.QtGui import QBrush, QPen, QPainterPath
 from PyQt5.QtCore import Qt
 from config import SCALE, ROBOT_SIZE
+from models.world import World
 
 class Team:
-    def __init__(self, team_id: int, color: Qt.GlobalColor, margin: float, scene, y_start=2.0):
+    def __init__(self, team_id: int, color: Qt.GlobalColor, margin: float, scene=None, y_start=2.0, world=None):
+        """
+        Args:
+            team_id (int): 1 (xanh) hoặc 2 (đỏ)
+            color: màu robot trên scene
+            margin (float): khoảng lề sân (pixel)
+            scene: QGraphicsScene, None khi chạy headless
+            world: World dùng chung giữa hai team (tự tạo nếu None)
+        """
         self.team_id = team_id
         self.color = color
         self.margin = margin
         self.scene = scene
         self.y_start = y_start
+        self.world = world if world is not None else World()
 
         self.robots = []
         self.robot_size = ROBOT_SIZE * SCALE  # pixel
@@ -35,6 +45,10 @@ class Team:
         triangle.setBrush(QBrush(Qt.white))
         triangle.setPen(QPen(Qt.NoPen))
 
+        # Mỗi item tự cache hình đã vẽ ở độ phân giải màn hình, chỉ vẽ lại khi xoay/đổi tỉ lệ
+        body.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        triangle.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
         group = QGraphicsItemGroup()
         group.addToGroup(body)
         group.addToGroup(triangle)
@@ -42,42 +56,41 @@ class Team:
         group.setTransformOriginPoint(self.robot_size / 2, self.robot_size / 2)
         group.setRotation(theta % 360)
 
-        group.pose = {'x': x_meter, 'y': y_meter, 'theta': theta % 360}
-        group.team = self.team_id
-        group.robot_id = robot_id
-        group.has_ball = False
-        #group.active = True
-
         return group
 
+    def add_robot(self, x, y, theta=0.0, robot_id=None):
+        """Thêm robot vào World và (nếu có scene) tạo graphic tương ứng."""
+        if robot_id is None:
+            robot_id = len(self.robots)
+        robot = self.world.add_robot(self.team_id, robot_id, x, y, theta)
+        if self.scene is not None:
+            robot.graphic = self.create_robot_graphic(x, y, robot_id, theta)
+            self.scene.addItem(robot.graphic)
+        self.robots.append(robot)
+        return robot
+
     def create_robots(self, number: int, positions=None, on_created=None):
         self.clear_robots()
-        self.robots = []
 
         if positions is None:
             # Mặc định sinh tự động như hiện tại
+            positions = []
             for i in range(number):
                 x = -7.0 if self.team_id == 1 else 7.0
                 y = self.y_start + i * 1.5
                 theta = 0 if self.team_id == 1 else 180
+                positions.append((x, y, theta))
 
-                robot = self.create_robot_graphic(x, y, i, theta)
-                robot.active = True
-                self.robots.append(robot)
-                self.scene.addItem(robot)
-                if on_created:
-                    on_created(robot)
-        else:
-            # Sinh theo vị trí chỉ định
-            for i, (x, y, theta) in enumerate(positions):
-                robot = self.create_robot_graphic(x, y, i, theta)
-                robot.active = True
-                self.robots.append(robot)
-                self.scene.addItem(robot)
-                if on_created:
-                    on_created(robot)
+        # Sinh theo vị trí chỉ định
+        for i, (x, y, theta) in enumerate(positions):
+            robot = self.add_robot(x, y, theta, robot_id=i)
+            if on_created:
+                on_created(robot)
 
     def clear_robots(self):
-        for robot in self.robots:
-            self.scene.removeItem(robot)
+        if self.scene is not None:
+            for robot in self.robots:
+                if robot.graphic is not None:
+                    self.scene.removeItem(robot.graphic)
+        self.world.remove_team(self.team_id)
         self.robots = []
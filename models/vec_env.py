@@ -0,0 +1,209 @@
+# models/vec_env.py
+
+import numpy as np
+
+from models.match import DEFAULT_BLUE_POSITIONS, DEFAULT_RED_POSITIONS
+from models.win_evaluator import BLOCK_DISTANCE
+from models.world import inside_field
+
+_U64 = np.uint64
+_GOLDEN = _U64(0x9E3779B97F4A7C15)
+
+
+def _splitmix64(z):
+    """Hàm băm splitmix64 trên mảng uint64 (tràn số là có chủ đích)."""
+    z = z + _GOLDEN
+    z = (z ^ (z >> _U64(30))) * _U64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> _U64(27))) * _U64(0x94D049BB133111EB)
+    return z ^ (z >> _U64(31))
+
+
+def _uniform(keys, counters):
+    """Số ngẫu nhiên [0, 1) dựa trên (key, counter): mỗi env có luồng riêng, không cần vòng lặp."""
+    z = _splitmix64(keys ^ _splitmix64(counters))
+    return (z >> _U64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class VecMatchEnv:
+    """
+    N bản sao độc lập của trận đấu, bước cùng lúc trên mảng NumPy (N, robots, ...).
+
+    Giao diện kiểu vectorized gym: reset() -> obs, step(actions) -> (obs, reward, done, info).
+    Robot 0..n_blue-1 là đội xanh (phòng thủ), phần còn lại là đội đỏ (tấn công).
+    Env nào kết thúc sẽ tự reset; pose cuối nằm trong info['final_obs'].
+    Mỗi obs trả về là một mảng riêng, giữ lại qua các bước được.
+    """
+
+    def __init__(self, num_envs, field, control='attack', opponent='random',
+                 positions_blue=None, positions_red=None, max_ticks=2000, dt=0.05,
+                 max_speed=1.0, reset_noise=0.0, seed=None):
+        """
+        Args:
+            num_envs (int): số env N
+            field: Field (dùng target_zone)
+            control (str): 'attack' (điều khiển đội đỏ) hoặc 'defense' (đội xanh)
+            opponent (str): 'random' (như RandomStrategy) hoặc 'none' (đứng yên)
+            max_ticks (int): số tick tối đa mỗi ván
+            dt (float): bước thời gian (s)
+            max_speed (float): tốc độ tối đa của action (m/s)
+            reset_noise (float): nhiễu đều ±reset_noise (m) cho vị trí ban đầu
+            seed (int): seed gốc, mỗi env có luồng RNG riêng
+        """
+        blue = np.asarray(positions_blue or DEFAULT_BLUE_POSITIONS, dtype=np.float64)
+        red = np.asarray(positions_red or DEFAULT_RED_POSITIONS, dtype=np.float64)
+
+        self.num_envs = num_envs
+        self.zone = field.target_zone
+        self.n_blue = len(blue)
+        self.n_red = len(red)
+        self.n_robots = self.n_blue + self.n_red
+        self.team = np.array([1] * self.n_blue + [2] * self.n_red, dtype=np.int8)
+        self.initial = np.concatenate([blue, red])        # (R, 3)
+
+        self.control = control
+        self.opponent = opponent
+        if control == 'attack':
+            self.controlled = slice(self.n_blue, self.n_robots)
+            self.others = slice(0, self.n_blue)
+        else:
+            self.controlled = slice(0, self.n_blue)
+            self.others = slice(self.n_blue, self.n_robots)
+        self.n_controlled = self.controlled.stop - self.controlled.start
+        self.n_others = self.n_robots - self.n_controlled
+
+        self.max_ticks = max_ticks
+        self.dt = dt
+        self.max_speed = max_speed
+        self.reset_noise = reset_noise
+
+        shape = (num_envs, self.n_robots)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.theta = np.zeros(shape)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.episodes = np.zeros(num_envs, dtype=np.uint64)
+        self.obs = np.zeros(shape + (3,), dtype=np.float32)
+
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Tạo khóa RNG độc lập cho từng env từ một seed gốc."""
+        children = np.random.SeedSequence(seed).spawn(self.num_envs)
+        self.keys = np.array([c.generate_state(1, np.uint64)[0] for c in children], dtype=np.uint64)
+        self.episodes[:] = 0
+
+    def _episode_keys(self, envs):
+        return _splitmix64(self.keys[envs] ^ (self.episodes[envs] * _GOLDEN))
+
+    def _reset_envs(self, envs):
+        self.x[envs] = self.initial[:, 0]
+        self.y[envs] = self.initial[:, 1]
+        self.theta[envs] = self.initial[:, 2] % 360
+        self.ticks[envs] = 0
+        self.episodes[envs] += _U64(1)
+
+        if self.reset_noise > 0 and len(envs):
+            keys = self._episode_keys(envs)[:, None]
+            counters = np.arange(2 * self.n_robots, dtype=np.uint64) | _U64(1 << 63)
+            u = _uniform(keys, counters[None, :]).reshape(len(envs), self.n_robots, 2)
+            self.x[envs] += (2 * u[..., 0] - 1) * self.reset_noise
+            self.y[envs] += (2 * u[..., 1] - 1) * self.reset_noise
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed(seed)
+        self._reset_envs(np.arange(self.num_envs))
+        return self.observe()
+
+    def observe(self):
+        """
+        Pose hiện tại dạng (N, robots, 3): x, y, theta (độ).
+
+        Trả về mảng mới mỗi lần nên obs của các bước trước (vòng (s, a, r, s'))
+        không bị bước sau ghi đè.
+        """
+        self.obs[..., 0] = self.x
+        self.obs[..., 1] = self.y
+        self.obs[..., 2] = self.theta
+        return self.obs.copy()
+
+    def _move(self, sl, vx, vy):
+        """Di chuyển nhóm robot `sl`, bỏ qua bước nào đi ra ngoài sân (như strategy)."""
+        new_x = self.x[:, sl] + vx * self.dt
+        new_y = self.y[:, sl] + vy * self.dt
+        inside = inside_field(new_x, new_y)
+        self.x[:, sl] = np.where(inside, new_x, self.x[:, sl])
+        self.y[:, sl] = np.where(inside, new_y, self.y[:, sl])
+
+        moving = (vx != 0) | (vy != 0)
+        heading = np.degrees(np.arctan2(vy, vx)) % 360
+        self.theta[:, sl] = np.where(moving, heading, self.theta[:, sl])
+
+    def _opponent_velocity(self):
+        if self.opponent != 'random':
+            return None
+        keys = self._episode_keys(np.arange(self.num_envs))[:, None]
+        counters = (self.ticks[:, None].astype(np.uint64) * _U64(2 * self.n_others) +
+                    np.arange(2 * self.n_others, dtype=np.uint64)[None, :])
+        u = _uniform(keys, counters).reshape(self.num_envs, self.n_others, 2)
+        d = 2 * u - 1
+        norm = np.hypot(d[..., 0], d[..., 1])
+        norm[norm == 0] = 1.0
+        # RandomStrategy đi 0.05 m mỗi tick
+        speed = 0.05 / self.dt
+        return d[..., 0] / norm * speed, d[..., 1] / norm * speed
+
+    def evaluate(self):
+        """
+        Luật thắng của WinEvaluator cho mọi env.
+
+        Returns:
+            winner (N,): 0 = chưa có, 1 = xanh, 2 = đỏ
+        """
+        rx = self.x[:, self.n_blue:]
+        ry = self.y[:, self.n_blue:]
+        bx = self.x[:, :self.n_blue]
+        by = self.y[:, :self.n_blue]
+
+        red_in_zone = self.zone.contains_many(rx, ry).any(axis=1)
+        d = np.hypot(rx[:, :, None] - bx[:, None, :], ry[:, :, None] - by[:, None, :])
+        all_blocked = (d <= BLOCK_DISTANCE).any(axis=2).all(axis=1)
+
+        winner = np.zeros(self.num_envs, dtype=np.int8)
+        winner[all_blocked] = 1
+        winner[red_in_zone] = 2
+        return winner
+
+    def step(self, actions):
+        """
+        Args:
+            actions: (N, n_controlled, 2) vận tốc (vx, vy) m/s, bị giới hạn bởi max_speed
+
+        Returns:
+            obs (N, robots, 3), reward (N,), done (N,), info (dict mảng)
+        """
+        actions = np.asarray(actions, dtype=np.float64)
+        speed = np.hypot(actions[..., 0], actions[..., 1])
+        scale = np.minimum(1.0, self.max_speed / np.maximum(speed, 1e-12))
+        self._move(self.controlled, actions[..., 0] * scale, actions[..., 1] * scale)
+
+        opp = self._opponent_velocity()
+        if opp is not None:
+            self._move(self.others, *opp)
+
+        self.ticks += 1
+        winner = self.evaluate()
+        truncated = (winner == 0) & (self.ticks >= self.max_ticks)
+        done = (winner != 0) | truncated
+
+        my_team = 2 if self.control == 'attack' else 1
+        reward = np.where(winner == my_team, 1.0, np.where(winner != 0, -1.0, 0.0))
+
+        info = {'winner': winner, 'truncated': truncated, 'ticks': self.ticks.copy()}
+        envs = np.flatnonzero(done)
+        if len(envs):
+            info['final_obs'] = self.observe()[envs]
+            info['final_envs'] = envs
+            self._reset_envs(envs)
+
+        return self.observe(), reward, done, info
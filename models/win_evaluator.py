@@ -0,0 +1,142 @@
+# models/win_evaluator.py
+
+import numpy as np
+
+from zones.target_zone import CircleZone, RectangleZone, DiamondZone, SemiCircleZone
+
+BLOCK_DISTANCE = 0.5
+
+
+class WinEvaluator:
+    """
+    Đánh giá luật thắng bằng một phép tính khoảng cách cặp (đỏ x [xanh..., tâm zone]).
+
+    Cột cuối của ma trận là tâm target zone nên cùng một lần tính vừa cho biết
+    robot đỏ nào bị chặn (và bởi robot xanh nào), vừa cho biết robot đỏ nào đã
+    vào zone. Mọi buffer được cấp phát sẵn, chỉ cấp phát lại khi số robot đổi.
+
+    Sau evaluate(): self.in_zone, self.blocked (bool, theo robot đỏ) và
+    self.blocker (chỉ số robot xanh đang chặn, -1 nếu không) được cập nhật.
+    """
+
+    def __init__(self, target_zone, block_distance=BLOCK_DISTANCE):
+        self.zone = target_zone
+        self.block_distance = block_distance
+        self._shape = None
+        self._version = None
+        self._alloc(0, 0)
+
+    def _alloc(self, n_red, n_blue):
+        self._shape = (n_red, n_blue)
+        cols = n_blue + 1
+        self.targets_x = np.empty(cols)
+        self.targets_y = np.empty(cols)
+        self.targets_x[n_blue] = self.zone.cx
+        self.targets_y[n_blue] = self.zone.cy
+        self._abs_dx = np.empty(n_red)
+        self._abs_dy = np.empty(n_red)
+
+        self.dx = np.empty((n_red, cols))
+        self.dy = np.empty((n_red, cols))
+        self.dist = np.empty((n_red, cols))
+
+        self.in_zone = np.zeros(n_red, dtype=bool)
+        self._tmp = np.zeros(n_red, dtype=bool)
+        self.nearest = np.zeros(n_red, dtype=np.intp)
+        self.min_dist = np.empty(n_red)
+        self.blocked = np.zeros(n_red, dtype=bool)
+        self.not_blocked = np.zeros(n_red, dtype=bool)
+        self.blocker = np.full(n_red, -1, dtype=np.intp)
+
+    def evaluate(self, red_x, red_y, blue_x, blue_y):
+        """
+        Args:
+            red_x, red_y: tọa độ robot đỏ (tấn công), mảng (n_red,)
+            blue_x, blue_y: tọa độ robot xanh (phòng thủ), mảng (n_blue,)
+
+        Returns:
+            (winner, blocked): winner là "red", "blue" hoặc None;
+            blocked là số robot đỏ đang bị chặn.
+        """
+        n_red, n_blue = len(red_x), len(blue_x)
+        if self._shape != (n_red, n_blue):
+            self._alloc(n_red, n_blue)
+
+        self.targets_x[:n_blue] = blue_x
+        self.targets_y[:n_blue] = blue_y
+        np.subtract(red_x[:, None], self.targets_x[None, :], out=self.dx)
+        np.subtract(red_y[:, None], self.targets_y[None, :], out=self.dy)
+        np.hypot(self.dx, self.dy, out=self.dist)
+
+        self._zone_mask(red_x, red_y)
+
+        # Cột zone đã dùng xong: đặt inf để argmin chạy trên cả ma trận liền bộ nhớ
+        self.dist[:, -1] = np.inf
+        np.argmin(self.dist, axis=1, out=self.nearest)
+        np.min(self.dist, axis=1, out=self.min_dist)
+        np.less_equal(self.min_dist, self.block_distance, out=self.blocked)
+        np.logical_not(self.blocked, out=self.not_blocked)
+        self.blocker[:] = self.nearest
+        np.copyto(self.blocker, -1, where=self.not_blocked)
+
+        if self.in_zone.any():
+            return "red", 0
+        blocked = int(np.count_nonzero(self.blocked))
+        if blocked == n_red:
+            return "blue", blocked
+        return None, blocked
+
+    def _zone_mask(self, red_x, red_y):
+        """Robot đỏ nào nằm trong zone, đọc từ cột cuối (độ lệch so với tâm zone)."""
+        zone = self.zone
+        dx = self.dx[:, -1]
+        dy = self.dy[:, -1]
+        out = self.in_zone
+        tmp = self._tmp
+
+        if isinstance(zone, (CircleZone, SemiCircleZone)):
+            np.less_equal(self.dist[:, -1], zone.radius, out=out)
+            if isinstance(zone, SemiCircleZone):
+                if zone.direction == 'right':
+                    np.greater_equal(dx, 0, out=tmp)
+                elif zone.direction == 'left':
+                    np.less_equal(dx, 0, out=tmp)
+                elif zone.direction == 'up':
+                    np.greater_equal(dy, 0, out=tmp)
+                elif zone.direction == 'down':
+                    np.less_equal(dy, 0, out=tmp)
+                else:
+                    tmp[:] = False
+                np.logical_and(out, tmp, out=out)
+        elif isinstance(zone, RectangleZone):
+            np.less_equal(np.abs(dx, out=self._abs_dx), zone.w / 2, out=out)
+            np.less_equal(np.abs(dy, out=self._abs_dy), zone.h / 2, out=tmp)
+            np.logical_and(out, tmp, out=out)
+        elif isinstance(zone, DiamondZone):
+            ax = np.abs(dx, out=self._abs_dx)
+            ay = np.abs(dy, out=self._abs_dy)
+            ax /= zone.w / 2
+            ay /= zone.h / 2
+            ax += ay
+            np.less_equal(ax, 1, out=out)
+        else:
+            for i in range(len(out)):
+                out[i] = zone.contains(red_x[i], red_y[i])
+
+    def evaluate_world(self, world):
+        """Như evaluate() nhưng đọc thẳng từ World (robot không active bị bỏ qua)."""
+        if self._version != world.version:
+            self.red_index = world.team_indices(2)
+            self.blue_index = world.team_indices(1)
+            self._version = world.version
+            self._world_red_x = np.empty(len(self.red_index))
+            self._world_red_y = np.empty(len(self.red_index))
+            self._world_blue_x = np.empty(len(self.blue_index))
+            self._world_blue_y = np.empty(len(self.blue_index))
+
+        np.take(world.x, self.red_index, out=self._world_red_x)
+        np.take(world.y, self.red_index, out=self._world_red_y)
+        np.take(world.x, self.blue_index, out=self._world_blue_x)
+        np.take(world.y, self.blue_index, out=self._world_blue_y)
+        return self.evaluate(self._world_red_x, self._world_red_y,
+                             self._world_blue_x, self._world_blue_y)
@@ -0,0 +1,274 @@
+# models/world.py
+
+import math
+import numpy as np
+
+from config import ROBOT_SIZE, FIELD_BOUND_X, FIELD_BOUND_Y
+from models.spatial_hash import SpatialHash
+from models.ball_physics import BallPhysics
+
+
+class World:
+    """
+    Trạng thái mô phỏng thuần Python/NumPy, không phụ thuộc Qt.
+
+    Mỗi thuộc tính robot là một mảng (struct-of-arrays), chỉ số i của mọi mảng
+    ứng với cùng một robot. Scene Qt chỉ đọc lại các mảng này mỗi frame.
+    """
+
+    def __init__(self, ball_x=0.0, ball_y=0.0):
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.theta = np.zeros(0, dtype=np.float64)   # độ, [0, 360)
+        self.team = np.zeros(0, dtype=np.int8)
+        self.robot_id = np.zeros(0, dtype=np.int16)
+        self.active = np.zeros(0, dtype=bool)
+        self.has_ball = np.zeros(0, dtype=bool)
+        self.handles = []
+        self.grid = SpatialHash(self)
+        self.version = 0    # tăng mỗi khi thêm/xóa robot hoặc đổi active
+
+        # Trạng thái bóng
+        self.ball_pos = np.array([ball_x, ball_y], dtype=np.float64)
+        self.ball_vel = np.zeros(2, dtype=np.float64)
+        self.ball_radius = 0.12
+        self.ball_mass = 0.5
+        self.ball_friction = 0.4
+        self.ball_physics = BallPhysics(self.ball_radius, self.ball_friction)
+        self.ball_events = []   # các Impact của bóng trong tick vừa chạy
+        self.ball = BallHandle(self)
+
+        self.time = 0.0
+        self.tick = 0
+
+    def __len__(self):
+        return len(self.handles)
+
+    def add_robot(self, team, robot_id, x, y, theta=0.0):
+        """Thêm một robot và trả về handle của nó."""
+        self.x = np.append(self.x, x)
+        self.y = np.append(self.y, y)
+        self.theta = np.append(self.theta, theta % 360)
+        self.team = np.append(self.team, np.int8(team))
+        self.robot_id = np.append(self.robot_id, np.int16(robot_id))
+        self.active = np.append(self.active, True)
+        self.has_ball = np.append(self.has_ball, False)
+
+        handle = RobotHandle(self, len(self.handles))
+        self.handles.append(handle)
+        self.version += 1
+        return handle
+
+    def remove_team(self, team):
+        """Xóa mọi robot của một team, các handle còn lại được đánh lại chỉ số."""
+        keep = self.team != team
+        for name in ('x', 'y', 'theta', 'team', 'robot_id', 'active', 'has_ball'):
+            setattr(self, name, getattr(self, name)[keep])
+
+        survivors = []
+        for handle in self.handles:
+            if keep[handle.index]:
+                handle.index = len(survivors)
+                survivors.append(handle)
+            else:
+                handle.world = None
+        self.handles = survivors
+        self.version += 1
+
+    def team_indices(self, team):
+        """Chỉ số các robot đang hoạt động của team."""
+        return np.flatnonzero((self.team == team) & self.active)
+
+    def positions(self):
+        """Mảng (n, 2) tọa độ robot (mét)."""
+        return np.column_stack((self.x, self.y))
+
+    def set_poses(self, indices, x, y, theta=None):
+        """Gán pose cho nhiều robot cùng lúc."""
+        self.x[indices] = x
+        self.y[indices] = y
+        if theta is not None:
+            self.theta[indices] = np.mod(theta, 360)
+
+    def move_robots(self, indices, new_x, new_y, where=None):
+        """
+        Đưa nhiều robot tới (new_x, new_y) cùng lúc; robot nào bước ra ngoài
+        vùng được đi (inside_field) hoặc có where=False thì đứng yên. Lưới
+        không gian được làm mới sau đó.
+
+        Returns:
+            mảng bool: robot nào đã di chuyển
+        """
+        inside = inside_field(new_x, new_y)
+        if where is not None:
+            inside &= where
+        self.x[indices] = np.where(inside, new_x, self.x[indices])
+        self.y[indices] = np.where(inside, new_y, self.y[indices])
+        self.grid.refresh()
+        return inside
+
+    def advance_robots(self, indices, vx, vy, dt):
+        """Cho robot đi tiếp với vận tốc (vx, vy) m/s trong dt giây (xem move_robots)."""
+        return self.move_robots(indices, self.x[indices] + vx * dt, self.y[indices] + vy * dt)
+
+    def step(self, dt):
+        """Tiến mô phỏng thêm dt giây (hiện tại chỉ có bóng tự chuyển động)."""
+        self.ball_events = self.ball.update(dt)
+        self.time += dt
+        self.tick += 1
+
+
+class _PoseView:
+    """Cho phép code cũ dùng robot.pose['x'] nhưng đọc/ghi thẳng vào mảng của World."""
+
+    __slots__ = ('handle',)
+
+    def __init__(self, handle):
+        self.handle = handle
+
+    def __getitem__(self, key):
+        h = self.handle
+        return float(getattr(h.world, key)[h.index])
+
+    def __setitem__(self, key, value):
+        h = self.handle
+        if key == 'theta':
+            value = value % 360
+        getattr(h.world, key)[h.index] = value
+
+    def __iter__(self):
+        return iter(('x', 'y', 'theta'))
+
+    def keys(self):
+        return ('x', 'y', 'theta')
+
+    def __repr__(self):
+        return f"{{'x': {self['x']:.2f}, 'y': {self['y']:.2f}, 'theta': {self['theta']:.2f}}}"
+
+
+class RobotHandle:
+    """
+    Handle nhẹ trỏ vào một robot trong World.
+
+    Giữ lại giao diện cũ của QGraphicsItemGroup (pose, team, robot_id,
+    has_ball, active, update) để strategy và Action chạy không cần scene.
+    """
+
+    def __init__(self, world, index):
+        self.world = world
+        self.index = index
+        self.pose = _PoseView(self)
+        self.graphic = None
+
+    @property
+    def team(self):
+        return int(self.world.team[self.index])
+
+    @property
+    def robot_id(self):
+        return int(self.world.robot_id[self.index])
+
+    @property
+    def has_ball(self):
+        return bool(self.world.has_ball[self.index])
+
+    @has_ball.setter
+    def has_ball(self, value):
+        self.world.has_ball[self.index] = value
+
+    @property
+    def active(self):
+        return bool(self.world.active[self.index])
+
+    @active.setter
+    def active(self, value):
+        self.world.active[self.index] = value
+        self.world.version += 1
+
+    def update(self):
+        """Giữ tương thích với code cũ; scene được đồng bộ bởi WorldView mỗi frame."""
+        pass
+
+    def __repr__(self):
+        return f"RobotHandle(team={self.team}, id={self.robot_id}, pose={self.pose!r})"
+
+
+class BallHandle:
+    """Giao diện giống models.ball.Ball nhưng trạng thái nằm trong World."""
+
+    def __init__(self, world):
+        self.world = world
+
+    @property
+    def x(self):
+        return float(self.world.ball_pos[0])
+
+    @property
+    def y(self):
+        return float(self.world.ball_pos[1])
+
+    @property
+    def vx(self):
+        return float(self.world.ball_vel[0])
+
+    @vx.setter
+    def vx(self, value):
+        self.world.ball_vel[0] = value
+
+    @property
+    def vy(self):
+        return float(self.world.ball_vel[1])
+
+    @vy.setter
+    def vy(self, value):
+        self.world.ball_vel[1] = value
+
+    @property
+    def radius(self):
+        return self.world.ball_radius
+
+    def get_position(self):
+        return self.x, self.y
+
+    def set_position(self, x, y):
+        self.world.ball_pos[0] = x
+        self.world.ball_pos[1] = y
+
+    def kick(self, force: float, angle_rad: float, team: int):
+        """Gán vận tốc cho bóng theo hướng và lực (xem Ball.kick)."""
+        speed = force / self.world.ball_mass
+        self.world.ball_vel[0] = speed * math.cos(angle_rad)
+        self.world.ball_vel[1] = speed * math.sin(angle_rad)
+
+    def update(self, dt):
+        """
+        Lăn bóng dt giây bằng BallPhysics (ma sát dạng đóng, va chạm liên tục
+        với robot đang hoạt động không giữ bóng, đường biên và khung thành).
+
+        Returns:
+            list[Impact] các va chạm trong bước
+        """
+        world = self.world
+        if not world.ball_vel.any():
+            return []
+        idx = np.flatnonzero(world.active & ~world.has_ball)
+        events = world.ball_physics.step(world.ball_pos, world.ball_vel, dt,
+                                         world.x[idx], world.y[idx], t0=world.time)
+        # Đổi chỉ số robot trong danh sách va chạm về chỉ số trong World
+        return [e._replace(index=int(idx[e.index])) if e.kind == 'robot' else e for e in events]
+
+
+def inside_field(x, y):
+    """(x, y) có nằm trong vùng robot được đi không (số hoặc mảng)."""
+    return (np.abs(x) <= FIELD_BOUND_X) & (np.abs(y) <= FIELD_BOUND_Y)
+
+
+def collision_free(world, index, x, y, clearance=ROBOT_SIZE + 0.05):
+    """
+    True nếu robot `index` đặt tại (x, y) không chạm robot nào khác.
+    Dùng world.grid nên lưới cần được refresh()/move() trước đó.
+    """
+    for _, d in world.grid.query(x, y, clearance, exclude=index):
+        if d < clearance:
+            return False
+    return True
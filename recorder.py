@@ -1,31 +1,39 @@
-import csv
 import time
 import os
-from PyQt5.QtCore import QTimer, Qt
-from PyQt5.QtWidgets import QGraphicsEllipseItem
-from PyQt5.QtGui import QBrush, QPen
+import numpy as np
+from PyQt5.QtCore import QTimer
+
+from recording import RecordingWriter, make_header, open_recording, load_csv, EXTENSION
+from input_log import EXTENSION as INPUT_LOG_EXTENSION, open_input_log_frames
+from models.events import events, EVENT_DTYPE, INFO
 
 
 
 class Recorder:
     def __init__(self, team1, team2, interval_ms=50):
         """
-        Ghi lại trạng thái các robot và bóng theo chu kỳ.
+        Ghi lại trạng thái các robot và bóng theo chu kỳ thời gian mô phỏng.
+
+        record() được gọi sau mỗi tick; frame được ghi khi world.time đã qua mốc
+        kế tiếp và mang đúng world.time, nên bản ghi dùng chung đồng hồ với
+        FlightRecorder và Replayer (không phụ thuộc GUI nhanh hay chậm).
+        Mỗi lần ghi chỉ sao chép pose từ World vào một frame nhị phân và đưa vào
+        hàng đợi; việc ghi đĩa do RecordingWriter làm trên thread riêng.
 
         Args:
             team1: đối tượng Team 1 (có thuộc tính `robots`)
             team2: đối tượng Team 2 (có thuộc tính `robots`)
-            ball:  đối tượng Ball (có thuộc tính `x`, `y`)
-            interval_ms (int): thời gian giữa mỗi lần ghi (ms)
+            interval_ms (int): thời gian mô phỏng giữa mỗi lần ghi (ms)
         """
         self.team1 = team1
         self.team2 = team2
-        
-        self.interval_ms = interval_ms
+        self.world = team1.world
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.save_pose_data)
+        self.interval_ms = interval_ms
+        self.next_time = 0.0
         self.saving = False
+        self.event_log = []
+        self.unsubscribe = None
 
     def start(self, filename=None):
         """Bắt đầu ghi dữ liệu"""
@@ -33,156 +41,224 @@ class Recorder:
 
         if filename is None:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"data/snapshot_{timestamp}.csv"
-
-        self.save_file = open(filename, "w", newline="")
-        self.save_writer = csv.writer(self.save_file)
-        self.start_time = time.time()
+            filename = f"data/snapshot_{timestamp}{EXTENSION}"
 
-        # Ghi header
-        header = ["Time"]
         all_robots = self.team1.robots + self.team2.robots
-        for i, robot in enumerate(all_robots):
-            header += [f"R{i}_team", f"R{i}_id", f"R{i}_x", f"R{i}_y", f"R{i}_theta"]
-        #header += ["Ball_x", "Ball_y"]
-        self.save_writer.writerow(header)
+        self.indices = np.array([robot.index for robot in all_robots], dtype=np.intp)
+        self.layout_version = self.world.version
+
+        header = make_header([r.team for r in all_robots], [r.robot_id for r in all_robots],
+                             interval_ms=self.interval_ms)
+        self.writer = RecordingWriter(filename, header)
+        self.next_time = self.world.time
+        self.filename = filename
+
+        # Sự kiện (sút, chuyền, thắng...) trong lúc ghi được lưu kèm file .events.npy
+        self.event_log = []
+        self.unsubscribe = events.subscribe(self.event_log.append, INFO)
 
-        self.timer.start(self.interval_ms)
         self.saving = True
         print(f"[Recorder] Started saving to {filename}")
 
     def stop(self):
         """Dừng ghi và đóng file"""
         if self.saving:
-            self.timer.stop()
-            self.save_file.close()
+            self.writer.close()
+            self.unsubscribe()
+            if self.event_log:
+                log = np.array([tuple(e) for e in self.event_log], dtype=EVENT_DTYPE)
+                np.save(os.path.splitext(self.filename)[0] + ".events.npy", log)
             self.saving = False
-            print(f"[Recorder] Stopped saving.")
+            print(f"[Recorder] Stopped saving ({self.writer.frames_written} frames).")
 
-    def save_pose_data(self):
-        """Ghi 1 dòng trạng thái hiện tại"""
-        now = time.time() - self.start_time
-        row = [f"{now:.2f}"]
+    def record(self):
+        """Gọi sau mỗi tick mô phỏng; ghi frame nếu đã tới mốc thời gian kế tiếp."""
+        if not self.saving or self.world.time + 1e-9 < self.next_time:
+            return
+        self.next_time += self.interval_ms / 1000.0
+        self.save_pose_data()
 
-        all_robots = self.team1.robots + self.team2.robots
-        for robot in all_robots:
-            pose = robot.pose
-            row += [robot.team, robot.robot_id,
-                    f"{pose['x']:.2f}", f"{pose['y']:.2f}", f"{pose['theta']:.2f}"]
+    def save_pose_data(self):
+        """Ghi 1 frame trạng thái hiện tại"""
+        world = self.world
+        if world.version != self.layout_version:
+            # Danh sách robot đã thay đổi (reset/replay): schema của file không còn đúng
+            print("[Recorder] Robot layout changed, stopping.")
+            self.stop()
+            return
 
-        #row += [f"{self.ball.x:.2f}", f"{self.ball.y:.2f}"]
-        self.save_writer.writerow(row)
+        frame = self.writer.new_frame()
+        frame['time'] = world.time
+        frame['ball'] = world.ball_pos
+        pose = frame['pose']
+        pose[:, 0] = world.x[self.indices]
+        pose[:, 1] = world.y[self.indices]
+        pose[:, 2] = world.theta[self.indices]
+        self.writer.write(frame)
 
 
 
 class Replayer:
-    def __init__(self, scene, team1, team2, scale, margin, robot_size):
+    MIN_SPEED = 0.25
+    MAX_SPEED = 16.0
+
+    def __init__(self, scene, team1, team2, scale, margin, robot_size, view=None):
         """
-        Phát lại trạng thái robot và bóng từ file CSV.
+        Phát lại trạng thái robot và bóng từ file .rec (hoặc CSV cũ).
+
+        File .rec được memory-map nên bộ nhớ không tăng theo độ dài bản ghi.
+        Đồng hồ phát lại chạy theo thời gian mô phỏng: mỗi lần timer gọi,
+        play_time tiến thêm speed * thời gian thực đã trôi qua và frame gần nhất
+        được hiển thị (tự bỏ qua frame khi tua nhanh, speed < 0 là phát ngược).
 
         Args:
             scene: QGraphicsScene
             team1: Team 1 object
             team2: Team 2 object
-            ball: Ball object
             scale (float): tỉ lệ pixel / mét
             margin (float): khoảng lề sân
             robot_size (float): kích thước hiển thị robot (pixel)
+            view: WorldView dùng để đồng bộ scene sau mỗi frame
         """
         self.scene = scene
         self.team1 = team1
         self.team2 = team2
-        #self.ball = ball
+        self.world = team1.world
         self.SCALE = scale
         self.MARGIN = margin
         self.ROBOT_SIZE = robot_size
+        self.view = view
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
         self.current_index = 0
+        self.frames = []
+        self.speed = 1.0
+        self.play_time = 0.0
+        self.last_wall = None
 
-    def load_csv(self, file_path):
-        """Tải dữ liệu replay từ file CSV"""
-        with open(file_path, "r") as f:
-            reader = csv.reader(f)
-            self.headers = next(reader)
-            self.frames = list(reader)
+    def load(self, file_path):
+        """
+        Tải dữ liệu replay từ file .rec (memory-map), snapshot CSV hoặc input
+        log .ilog (frame được mô phỏng lại khi cần, xem input_log.SimulatedFrames)
+        """
+        self.stop()
+        if file_path.endswith(".csv"):
+            self.header, self.frames = load_csv(file_path)
+        elif file_path.endswith(INPUT_LOG_EXTENSION):
+            self.header, self.frames = open_input_log_frames(file_path)
+        else:
+            self.header, self.frames = open_recording(file_path, mmap=True)
         self.current_index = 0
         print(f"[Replayer] Loaded {len(self.frames)} frames from {file_path}")
+        if not len(self.frames):
+            return
+
+        self.build_time_index()
 
         # Tự khởi tạo robots theo frame đầu
         self.team1.clear_robots()
         self.team2.clear_robots()
-        first_row = self.frames[0]
-        num_robots = (len(first_row) - 1 - 2) // 5
-        for i in range(num_robots):
-            idx = 1 + i * 5
-            team = int(first_row[idx])
-            robot_id = int(first_row[idx + 1])
-            x = float(first_row[idx + 2])
-            y = float(first_row[idx + 3])
-            theta = float(first_row[idx + 4])
-            color = Qt.blue if team == 1 else Qt.red
-
-            robot = self.team1.create_robot_graphic(x, y, robot_id, theta) if team == 1 \
-                    else self.team2.create_robot_graphic(x, y, robot_id, theta)
-
-            self.scene.addItem(robot)
-            (self.team1.robots if team == 1 else self.team2.robots).append(robot)
-
-        #self.ball_graphic = None
-        #self.update_ball_graphic(first_row)
-
-    '''
-    def update_ball_graphic(self, row):
-        """Vẽ bóng tại vị trí row"""
-        ball_x = float(row[-2])
-        ball_y = float(row[-1])
-        self.ball.x = ball_x
-        self.ball.y = ball_y
-
-        if self.ball_graphic:
-            self.scene.removeItem(self.ball_graphic)
-
-        radius = 0.12 * self.SCALE
-        cx = self.MARGIN + ball_x * self.SCALE
-        cy = self.MARGIN + ball_y * self.SCALE
-
-        ellipse = QGraphicsEllipseItem(cx - radius, cy - radius, 2 * radius, 2 * radius)
-        ellipse.setBrush(QBrush(Qt.white))
-        ellipse.setPen(QPen(Qt.black, 1))
-        self.scene.addItem(ellipse)
-        self.ball_graphic = ellipse
-    '''
+        first_pose = self.frames[0]['pose']
+        replay_robots = []
+        for k, info in enumerate(self.header['robots']):
+            x, y, theta = (float(v) for v in first_pose[k])
+            target_team = self.team1 if info['team'] == 1 else self.team2
+            replay_robots.append(target_team.add_robot(x, y, theta, robot_id=info['id']))
+        self.indices = np.array([r.index for r in replay_robots], dtype=np.intp)
+
+        self.play_time = self.start_time
+        self.show_frame(self.frames[0])
+
+    def build_time_index(self):
+        """
+        Chỉ mục thời gian kích thước cố định: frame được ghi gần như đều nhau nên
+        vị trí của thời điểm t được đoán bằng (t - t0) / dt rồi chỉnh trong một
+        cửa sổ nhỏ quanh đó. Không giữ mảng thời gian của mọi frame.
+        """
+        times = self.frames['time']
+        self.start_time = float(times[0])
+        self.end_time = float(times[-1])
+        n = len(self.frames)
+        self.frame_dt = (self.end_time - self.start_time) / (n - 1) if n > 1 else 0.05
+        if self.frame_dt <= 0:
+            self.frame_dt = 0.05
+
+    def index_at(self, t, window=16):
+        """Chỉ số frame cuối cùng có time <= t (O(1) nếu frame gần đều)."""
+        n = len(self.frames)
+        times = self.frames['time']
+        guess = int((t - self.start_time) / self.frame_dt)
+        guess = min(max(guess, 0), n - 1)
+
+        while True:
+            lo = max(guess - window, 0)
+            hi = min(guess + window + 1, n)
+            chunk = np.asarray(times[lo:hi])
+            k = lo + int(np.searchsorted(chunk, t, side='right')) - 1
+            if (k >= lo or lo == 0) and (k < hi - 1 or hi == n):
+                return min(max(k, 0), n - 1)
+            # Lệch nhiều hơn cửa sổ (ghi bị giật): nhảy theo hướng đó rồi thử lại
+            guess = k
+            window *= 2
+
+    def seek(self, t):
+        """Nhảy tới thời điểm t (giây, theo đồng hồ trong file)."""
+        if not len(self.frames):
+            return
+        self.play_time = min(max(t, self.start_time), self.end_time)
+        self.current_index = self.index_at(self.play_time)
+        self.show_frame(self.frames[self.current_index])
+
+    def step(self, n=1):
+        """Đi tới/lùi n frame (n < 0 là lùi)."""
+        if not len(self.frames):
+            return
+        self.current_index = min(max(self.current_index + n, 0), len(self.frames) - 1)
+        frame = self.frames[self.current_index]
+        self.play_time = float(frame['time'])
+        self.show_frame(frame)
+
+    def set_speed(self, speed):
+        """Tốc độ phát (|speed| trong [0.25, 16]); số âm là phát ngược."""
+        sign = -1.0 if speed < 0 else 1.0
+        self.speed = sign * min(max(abs(speed), self.MIN_SPEED), self.MAX_SPEED)
 
     def start(self):
-        if self.frames:
-            self.timer.start(50)
+        if len(self.frames):
+            self.last_wall = time.perf_counter()
+            self.timer.start(max(int(self.frame_dt * 1000), 10))
 
     def stop(self):
         self.timer.stop()
 
-    def update_frame(self):
-        if self.current_index >= len(self.frames):
-            self.current_index = 0  # Lặp lại từ đầu
+    def is_playing(self):
+        return self.timer.isActive()
 
-        row = self.frames[self.current_index]
-        self.current_index += 1
+    def show_frame(self, frame):
+        world = self.world
+        pose = frame['pose']
+        world.x[self.indices] = pose[:, 0]
+        world.y[self.indices] = pose[:, 1]
+        world.theta[self.indices] = pose[:, 2]
+        world.ball_pos[:] = frame['ball']
 
-        all_robots = self.team1.robots + self.team2.robots
-        for i, robot in enumerate(all_robots):
-            idx = 1 + i * 5
-            x = float(row[idx + 2])
-            y = float(row[idx + 3])
-            theta = float(row[idx + 4])
-
-            px = self.MARGIN + x * self.SCALE - self.ROBOT_SIZE / 2
-            py = self.MARGIN + y * self.SCALE - self.ROBOT_SIZE / 2
-            robot.setPos(px, py)
-            robot.setRotation(theta)
-
-            robot.pose['x'] = x
-            robot.pose['y'] = y
-            robot.pose['theta'] = theta
-
-        #self.update_ball_graphic(row)
\ No newline at end of file
+        if self.view is not None:
+            self.view.sync()
+
+    def update_frame(self):
+        now = time.perf_counter()
+        elapsed = now - self.last_wall if self.last_wall is not None else self.frame_dt
+        self.last_wall = now
+
+        t = self.play_time + self.speed * elapsed
+        if t > self.end_time:
+            t = self.start_time  # Lặp lại từ đầu
+        elif t < self.start_time:
+            t = self.end_time
+
+        self.play_time = t
+        index = self.index_at(t)
+        if index != self.current_index:
+            self.current_index = index
+            self.show_frame(self.frames[index])
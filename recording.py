@@ -0,0 +1,311 @@
+# recording.py
+"""
+Định dạng ghi hình nhị phân (.rec) và bộ ghi chạy trên thread riêng.
+
+Bố cục file:
+    MAGIC (8 byte) | độ dài header (uint32 LE) | header JSON (utf-8) | frame | frame | ...
+
+Header mô tả schema: danh sách robot (team, id) theo đúng thứ tự cột, có cột
+bóng hay không và dtype của một frame. Mỗi frame là một bản ghi kích thước cố
+định (xem frame_dtype), nên phần thân file là một mảng NumPy liên tục: có thể
+đọc thẳng bằng np.fromfile / np.memmap, và ghi thêm (append-only) theo từng
+chunk mà không cần sửa header. Frame cuối bị ghi dở (khi crash) được bỏ qua.
+
+Chuyển file CSV cũ:
+    python recording.py convert data/snapshot_20250618_005910.csv
+    python recording.py convert data/        # mọi *.csv trong thư mục
+"""
+
+import argparse
+import glob
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"RSIMREC1"
+EXTENSION = ".rec"
+
+
+def frame_dtype(num_robots):
+    """dtype của một frame: thời gian mô phỏng, vị trí bóng và pose (x, y, theta) mỗi robot."""
+    return np.dtype([
+        ('time', '<f8'),
+        ('ball', '<f4', (2,)),
+        ('pose', '<f4', (num_robots, 3)),
+    ])
+
+
+def make_header(teams, ids, **extra):
+    header = {
+        'version': 1,
+        'robots': [{'team': int(t), 'id': int(i)} for t, i in zip(teams, ids)],
+        'columns': ['time', 'ball_x', 'ball_y'] + [
+            f"R{k}_{c}" for k in range(len(teams)) for c in ('x', 'y', 'theta')],
+        'ball': True,
+    }
+    header.update(extra)
+    return header
+
+
+def write_header(f, header):
+    data = json.dumps(header).encode('utf-8')
+    f.write(MAGIC)
+    f.write(struct.pack('<I', len(data)))
+    f.write(data)
+
+
+def read_header(f):
+    """Đọc header, trả về (header dict, offset bắt đầu phần frame)."""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a recording file (bad magic)")
+    (length,) = struct.unpack('<I', f.read(4))
+    header = json.loads(f.read(length).decode('utf-8'))
+    return header, len(MAGIC) + 4 + length
+
+
+def open_recording(path, mmap=True):
+    """
+    Mở file .rec.
+
+    Returns:
+        (header, frames): frames là mảng có cấu trúc frame_dtype (memmap nếu mmap=True)
+    """
+    with open(path, 'rb') as f:
+        header, offset = read_header(f)
+    dtype = frame_dtype(len(header['robots']))
+    n_frames = (os.path.getsize(path) - offset) // dtype.itemsize
+    if n_frames == 0:
+        return header, np.zeros(0, dtype=dtype)
+    if mmap:
+        frames = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(n_frames,))
+    else:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            frames = np.fromfile(f, dtype=dtype, count=n_frames)
+    return header, frames
+
+
+class RecordingWriter:
+    """
+    Ghi frame ra file trên một thread nền.
+
+    write() chỉ đưa frame vào hàng đợi nên tick mô phỏng không bao giờ chờ ổ đĩa;
+    thread ghi gom các frame đang chờ thành một chunk rồi ghi một lần.
+    """
+
+    def __init__(self, path, header, chunk_frames=256):
+        self.path = path
+        self.dtype = frame_dtype(len(header['robots']))
+        self.chunk_frames = chunk_frames
+        self.queue = queue.SimpleQueue()
+        self.frames_written = 0
+
+        self.file = open(path, 'wb')
+        write_header(self.file, header)
+
+        self.thread = threading.Thread(target=self._run, name="RecordingWriter", daemon=True)
+        self.thread.start()
+
+    def new_frame(self):
+        return np.zeros((), dtype=self.dtype)
+
+    def write(self, frame):
+        """Đưa một frame (np.void / mảng 0 chiều frame_dtype) vào hàng đợi."""
+        self.queue.put(frame)
+
+    def _run(self):
+        buffer = np.zeros(self.chunk_frames, dtype=self.dtype)
+        running = True
+        while running:
+            item = self.queue.get()
+            n = 0
+            while True:
+                if item is None:
+                    running = False
+                    break
+                buffer[n] = item
+                n += 1
+                if n == self.chunk_frames:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if n:
+                self.file.write(buffer[:n].tobytes())
+                self.file.flush()
+                self.frames_written += n
+        self.file.close()
+
+    def close(self):
+        """Ghi nốt các frame còn trong hàng đợi rồi đóng file."""
+        self.queue.put(None)
+        self.thread.join()
+
+
+class FlightRecorder:
+    """
+    Bộ ghi "hộp đen": luôn giữ `seconds` giây gần nhất của World trong một
+    vòng đệm cấp phát sẵn, mỗi tick chỉ ghi đè một frame (không cấp phát mới).
+    dump() ghi nội dung vòng đệm ra file .rec theo đúng thứ tự thời gian.
+    """
+
+    def __init__(self, world, seconds=30.0, dt=0.05, directory="data"):
+        self.world = world
+        self.capacity = max(1, int(round(seconds / dt)))
+        self.directory = directory
+        self.layout_version = None
+        self.dump_threads = []
+        self.dumps = 0          # số lần dump, thêm vào tên file để không ghi đè nhau
+
+    def _bind(self):
+        """(Re)cấp phát vòng đệm khi danh sách robot thay đổi."""
+        world = self.world
+        self.teams = world.team.copy()
+        self.ids = world.robot_id.copy()
+        self.buffer = np.zeros(self.capacity, dtype=frame_dtype(len(world.x)))
+        self.pos = 0
+        self.count = 0
+        self.layout_version = world.version
+
+    def record(self):
+        """Chép trạng thái hiện tại của World vào vòng đệm (gọi mỗi tick)."""
+        world = self.world
+        if world.version != self.layout_version:
+            self._bind()
+
+        frame = self.buffer[self.pos]
+        frame['time'] = world.time
+        frame['ball'] = world.ball_pos
+        pose = frame['pose']
+        pose[:, 0] = world.x
+        pose[:, 1] = world.y
+        pose[:, 2] = world.theta
+
+        self.pos += 1
+        if self.pos == self.capacity:
+            self.pos = 0
+        if self.count < self.capacity:
+            self.count += 1
+
+    def snapshot(self):
+        """Bản sao các frame đang giữ, cũ nhất trước."""
+        if self.count < self.capacity:
+            return self.buffer[:self.count].copy()
+        return np.concatenate((self.buffer[self.pos:], self.buffer[:self.pos]))
+
+    def dump(self, reason="manual", path=None):
+        """
+        Ghi vòng đệm ra file trên thread nền.
+
+        Returns:
+            đường dẫn file, hoặc None nếu chưa có frame nào
+        """
+        if self.layout_version is None or self.count == 0:
+            return None
+        frames = self.snapshot()
+        if path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            name = f"flight_{timestamp}_{self.dumps:03d}_t{self.world.tick}_{reason}{EXTENSION}"
+            path = os.path.join(self.directory, name)
+        self.dumps += 1
+        header = make_header(self.teams, self.ids, trigger=reason)
+
+        def write():
+            with open(path, 'wb') as f:
+                write_header(f, header)
+                f.write(frames.tobytes())
+
+        thread = threading.Thread(target=write, name="FlightRecorderDump", daemon=True)
+        thread.start()
+        self.dump_threads = [t for t in self.dump_threads if t.is_alive()] + [thread]
+        print(f"[FlightRecorder] Dumping {len(frames)} frames ({reason}) to {path}")
+        return path
+
+    def flush(self):
+        """Chờ các lần dump đang chạy ghi xong."""
+        for thread in self.dump_threads:
+            thread.join()
+        self.dump_threads = []
+
+
+def load_csv(path):
+    """
+    Đọc file snapshot CSV cũ (định dạng của Recorder trước đây).
+
+    Returns:
+        (header, frames) giống open_recording
+    """
+    with open(path, 'r') as f:
+        columns = f.readline().strip().split(',')
+    robot_cols = [i for i, c in enumerate(columns) if c.endswith('_team')]
+    if not robot_cols:
+        raise ValueError(f"{path} is not a snapshot CSV (no *_team columns)")
+    data = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+
+    num_robots = len(robot_cols)
+    frames = np.zeros(len(data), dtype=frame_dtype(num_robots))
+    frames['time'] = data[:, 0]
+    if 'Ball_x' in columns:
+        frames['ball'][:, 0] = data[:, columns.index('Ball_x')]
+        frames['ball'][:, 1] = data[:, columns.index('Ball_y')]
+    for k, col in enumerate(robot_cols):
+        frames['pose'][:, k, :] = data[:, col + 2:col + 5]
+
+    if len(data):
+        teams = data[0, robot_cols].astype(int)
+        ids = data[0, [c + 1 for c in robot_cols]].astype(int)
+    else:
+        teams = ids = []
+    header = make_header(teams, ids, source=os.path.basename(path), ball='Ball_x' in columns)
+    return header, frames
+
+
+def convert_csv(csv_path, out_path=None):
+    """Chuyển một file CSV sang .rec, trả về đường dẫn file mới."""
+    header, frames = load_csv(csv_path)
+    if out_path is None:
+        out_path = os.path.splitext(csv_path)[0] + EXTENSION
+    with open(out_path, 'wb') as f:
+        write_header(f, header)
+        f.write(frames.tobytes())
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Công cụ cho file ghi hình .rec")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="chuyển snapshot CSV sang .rec")
+    conv.add_argument("paths", nargs="+", help="file CSV hoặc thư mục chứa snapshot_*.csv")
+    info = sub.add_parser("info", help="in header và số frame của file .rec")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        files = []
+        for p in args.paths:
+            # Chỉ file Recorder ghi; thư mục data/ còn có CSV khác (summary.csv của analytics)
+            files += sorted(glob.glob(os.path.join(p, "snapshot_*.csv"))) if os.path.isdir(p) else [p]
+        for p in files:
+            t0 = time.perf_counter()
+            try:
+                out = convert_csv(p)
+            except ValueError as e:
+                print(f"[Recording] Skipped {p}: {e}")
+                continue
+            print(f"[Recording] {p} -> {out} "
+                  f"({os.path.getsize(p)} -> {os.path.getsize(out)} bytes, {time.perf_counter() - t0:.2f}s)")
+    elif args.command == "info":
+        header, frames = open_recording(args.path)
+        print(json.dumps(header, indent=2))
+        print(f"{len(frames)} frames")
+
+
+if __name__ == "__main__":
+    main()
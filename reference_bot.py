@@ -0,0 +1,96 @@
+# reference_bot.py
+"""
+Bot mẫu chạy ngoài tiến trình, nói giao thức models/bot_protocol.py.
+
+Chỉ dùng socket + NumPy, không import gì của trình mô phỏng ngoài module
+giao thức, nên có thể dùng làm khuôn để viết bot bằng ngôn ngữ khác.
+
+- attack: robot chạy thẳng về tâm target zone, đẩy nhẹ nhau ra để không dồn cục.
+- defense: mỗi hậu vệ chặn robot tấn công gần nó nhất, đứng giữa robot đó và zone.
+
+Trình mô phỏng tự chạy bot với đường dẫn socket là tham số cuối:
+    python reference_bot.py /tmp/rbot-xxx/bot.sock
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from models.bot_protocol import (ACTIVE, BYE, CONTROLLED, STATE, connect, decode_state,
+                                 encode_command)
+
+
+def attack(robots, mine, info, speed):
+    x = robots['x'][mine].astype(float)
+    y = robots['y'][mine].astype(float)
+    dx = info['zone_cx'] - x
+    dy = info['zone_cy'] - y
+    # Tách nhau: đẩy ra khỏi đồng đội trong bán kính 1 m
+    px = x[:, None] - x[None, :]
+    py = y[:, None] - y[None, :]
+    d2 = px * px + py * py
+    near = (d2 > 0) & (d2 < 1.0)
+    dx += np.where(near, px / np.maximum(d2, 1e-6), 0).sum(axis=1)
+    dy += np.where(near, py / np.maximum(d2, 1e-6), 0).sum(axis=1)
+    return dx, dy, speed
+
+
+def defend(robots, mine, info, speed):
+    x = robots['x'][mine].astype(float)
+    y = robots['y'][mine].astype(float)
+    enemy = np.flatnonzero((robots['team'] != info['team_id']) & (robots['flags'] & ACTIVE > 0))
+    if not len(enemy):
+        return np.zeros(len(x)), np.zeros(len(x)), 0.0
+    ex = robots['x'][enemy].astype(float)
+    ey = robots['y'][enemy].astype(float)
+    nearest = np.argmin(np.hypot(ex[None, :] - x[:, None], ey[None, :] - y[:, None]), axis=1)
+    tx = (ex[nearest] + info['zone_cx']) / 2
+    ty = (ey[nearest] + info['zone_cy']) / 2
+    return tx - x, ty - y, speed
+
+
+def answer(payload, info, speed):
+    seq, _, _, robots = decode_state(payload)
+    mine = np.flatnonzero((robots['team'] == info['team_id'])
+                          & (robots['flags'] & ACTIVE > 0) & (robots['flags'] & CONTROLLED == 0))
+    if not len(mine):
+        return encode_command(seq, mine, [], [], [])
+    policy = attack if info['side'] == 'attack' else defend
+    dx, dy, v = policy(robots, mine, info, speed)
+    distance = np.hypot(dx, dy)
+    moving = distance > 0.05
+    scale = np.where(moving, v / np.maximum(distance, 1e-9), 0.0)
+    heading = np.where(moving, np.degrees(np.arctan2(dy, dx)) % 360, math.nan)
+    return encode_command(seq, mine, dx * scale, dy * scale, heading)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reference strategy bot")
+    parser.add_argument("socket", help="đường dẫn Unix socket của trình mô phỏng")
+    parser.add_argument("--name", default="Reference Bot")
+    parser.add_argument("--speed", type=float, default=1.0, help="tốc độ robot (m/s)")
+    args = parser.parse_args()
+
+    sock, reader, info, frames = connect(args.socket, args.name)
+    while True:
+        # Chỉ trả lời STATE mới nhất, bỏ các STATE đã cũ trong bộ đệm
+        latest = None
+        for kind, payload in frames:
+            if kind == BYE:
+                sock.close()
+                return
+            if kind == STATE:
+                latest = payload
+        if latest is not None:
+            sock.setblocking(True)
+            sock.sendall(answer(latest, info, args.speed))
+            sock.setblocking(False)
+        if reader.closed:
+            break
+        frames = reader.wait(1.0)
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
+import random
+
+from config import TIMESTEP
+
 class BaseAttackStrategy:
+    rate = None       # tần số apply() (Hz) cho StrategyManager, None = mỗi tick
+    budget_ms = 2.0   # ngân sách CPU mỗi lần apply() (ms)
+
     def __init__(self, team, field):
         self.team = team
         self.field = field
+        self.dt = TIMESTEP  # bước mô phỏng (s) của mỗi lần apply()
+        self.rng = random.Random()  # create_strategy gán luồng có seed riêng
 
     def apply(self):
         raise NotImplementedError("Attack strategy must implement apply()")
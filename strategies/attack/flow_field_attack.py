@@ -0,0 +1,51 @@
+import numpy as np
+
+from models.flow_field import shared_flow_field
+from .base_attack_stategy import BaseAttackStrategy
+
+
+class FlowFieldAttackStrategy(BaseAttackStrategy):
+    """
+    Tấn công theo trường hướng đi chung (models.flow_field): mỗi robot tra
+    hướng tại ô của nó thay vì tự tính đường về target zone, đối thủ là vật cản.
+
+    Trường được dùng chung theo World (shared_flow_field) nên nhiều strategy
+    hoặc nhiều lần tạo strategy trên cùng một trận không phải tính lại.
+    """
+    budget_ms = 4.0   # sửa trường khi đối thủ đổi ô có thể tốn vài ms
+
+    def __init__(self, team, field, speed=1.0):
+        """
+        Args:
+            speed (float): tốc độ di chuyển (m/s)
+        """
+        super().__init__(team, field)
+        self.speed = speed  # m/s
+        self.skip = set()   # robot đang được điều khiển bằng tay
+        self.flow.update()  # dựng trường ngay, lần tính đầy đủ không rơi vào tick đầu
+
+    @property
+    def flow(self):
+        opponent = 1 if self.team.team_id == 2 else 2
+        return shared_flow_field(self.team.world, self.field, obstacle_team=opponent)
+
+    def apply(self):
+        world = self.team.world
+        flow = self.flow
+        flow.update()
+
+        skip = {robot.index for robot in self.skip if robot.world is world}
+        idx = np.array([robot.index for robot in self.team.robots
+                        if robot.index not in skip], dtype=np.intp)
+        if not len(idx):
+            return
+        idx = idx[world.active[idx]]
+        if not len(idx):
+            return
+
+        rx = world.x[idx]
+        ry = world.y[idx]
+        ux, uy = flow.headings(rx, ry)
+        step = self.speed * self.dt
+        world.move_robots(idx, rx + ux * step, ry + uy * step)
+        world.theta[idx] = np.degrees(np.arctan2(uy, ux)) % 360
@@ -0,0 +1,77 @@
+import numpy as np
+
+from .base_attack_stategy import BaseAttackStrategy
+
+
+class PotentialFieldAttackStrategy(BaseAttackStrategy):
+    """
+    Tấn công theo trường thế: lực hút về tâm target zone, lực đẩy từ các robot khác.
+    (Chuyển từ TestWindow.update_red_team_attack trong test_xbox.py.)
+
+    Lực của mọi robot tấn công được tính cùng lúc trên mảng pose của World:
+    các cặp lân cận ứng viên lấy từ lưới không gian (world.grid.candidates),
+    rồi chỉ giữ các cặp gần hơn safe_distance, nên chi phí tỉ lệ với số cặp
+    gần nhau thay vì attackers x robots và không có vòng lặp Python.
+    Mọi robot dùng cùng một ảnh chụp pose đầu tick.
+    """
+    def __init__(self, team, field, speed=1.0, ka=1.0, kr=2.0, safe_distance=1.0):
+        """
+        Args:
+            speed (float): tốc độ di chuyển (m/s)
+            ka (float): hệ số lực hút về target zone
+            kr (float): hệ số lực đẩy, tỉ lệ 1 / khoảng cách^2
+            safe_distance (float): bán kính lân cận gây lực đẩy (m)
+        """
+        super().__init__(team, field)
+        self.speed = speed  # m/s
+        self.ka = ka
+        self.kr = kr
+        self.safe_distance = safe_distance
+        self.skip = set()   # robot đang được điều khiển bằng tay
+
+    def apply(self):
+        world = self.team.world
+        zone = self.field.target_zone
+        grid = world.grid.refresh()
+
+        skip = {robot.index for robot in self.skip if robot.world is world}
+        idx = np.array([robot.index for robot in self.team.robots
+                        if robot.index not in skip], dtype=np.intp)
+        if not len(idx):
+            return
+        idx = idx[world.active[idx]]
+        if not len(idx):
+            return
+
+        rx = world.x[idx]
+        ry = world.y[idx]
+        dx = zone.cx - rx
+        dy = zone.cy - ry
+        distance_to_target = np.hypot(dx, dy)
+        moving = distance_to_target >= 0.1
+        safe_target = np.where(moving, distance_to_target, 1.0)
+
+        fx = self.ka * dx / safe_target
+        fy = self.ka * dy / safe_target
+
+        # Lực đẩy từ robot đang hoạt động trong bán kính safe_distance
+        rows, others = grid.candidates(idx, self.safe_distance)
+        ox = rx[rows] - world.x[others]
+        oy = ry[rows] - world.y[others]
+        dist = np.hypot(ox, oy)
+        near = (dist < self.safe_distance) & (dist > 0.05)
+        if near.any():
+            rows = rows[near]
+            inv = self.kr / dist[near] ** 3     # Kr / d^2 trên vector đơn vị
+            fx += np.bincount(rows, inv * ox[near], minlength=len(idx))
+            fy += np.bincount(rows, inv * oy[near], minlength=len(idx))
+
+        total_force = np.hypot(fx, fy)
+        total_force[total_force == 0] = 1.0
+        fx /= total_force
+        fy /= total_force
+
+        move_dist = np.minimum(self.speed * self.dt, distance_to_target)
+        world.move_robots(idx, rx + move_dist * fx, ry + move_dist * fy, where=moving)
+        heading = np.degrees(np.arctan2(fy, fx)) % 360
+        world.theta[idx] = np.where(moving, heading, world.theta[idx])
@@ -1,23 +1,28 @@
 import random
 import math
 
+from config import TIMESTEP
+
 class RandomAttackStrategy:
     def __init__(self, team, field):
         self.team = team
         self.field = field
+        self.dt = TIMESTEP
+        self.speed = 1.0  # m/s
+        self.rng = random.Random()  # create_strategy gán luồng có seed riêng
 
     def apply(self):
         for robot in self.team.robots:
             if not getattr(robot, 'active', True):
                 continue
-            dx = random.uniform(-1, 1)
-            dy = random.uniform(-1, 1)
+            dx = self.rng.uniform(-1, 1)
+            dy = self.rng.uniform(-1, 1)
             norm = math.hypot(dx, dy)
             if norm == 0:
                 continue
             dx /= norm
             dy /= norm
-            step = 0.05
+            step = self.speed * self.dt
             new_x = robot.pose['x'] + dx * step
             new_y = robot.pose['y'] + dy * step
 
@@ -0,0 +1,236 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+
+from config import TIMESTEP, BOT_DEADLINE_MS, BOT_MAX_SPEED, FIELD_BOUND_X, FIELD_BOUND_Y
+from models import bot_protocol as protocol
+from models.events import events, OVERRUN, WARNING
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BotStrategy:
+    """
+    Strategy do một bot ngoài tiến trình quyết định (models/bot_protocol.py).
+
+    Trình mô phỏng mở Unix socket, chạy lệnh của bot với đường dẫn socket là
+    tham số cuối rồi chờ HELLO. Mỗi apply() gửi STATE của tick hiện tại mà
+    không chờ (pipelining) và chỉ chờ câu trả lời của tick trước, tối đa tới
+    deadline tính từ lúc gửi tick đó; nhờ vậy các bot tính song song trong
+    suốt một tick. Lệnh vận tốc mới nhất được giữ cho tới khi có lệnh mới hơn;
+    quá deadline thì robot đi tiếp theo lệnh cũ và phát OVERRUN.
+
+    Có cùng giao diện strategy (apply, dt, skip, rate, budget_ms) nên dùng
+    được với StrategyManager; gọi close() để dừng bot.
+    """
+    rate = None
+
+    def __init__(self, command, side, team, field, dt=TIMESTEP, deadline_ms=BOT_DEADLINE_MS,
+                 seed=0, max_in_flight=4, connect_timeout=10.0):
+        """
+        Args:
+            command (list): lệnh chạy bot ("{python}" = trình thông dịch hiện tại),
+                chạy trong thư mục dự án
+            side (str): 'attack' hoặc 'defense'
+            deadline_ms (float): thời gian tối đa chờ câu trả lời của một tick (ms)
+            seed (int): seed gửi cho bot trong WELCOME
+            max_in_flight (int): số STATE chưa được trả lời tối đa; quá thì bỏ tick
+            connect_timeout (float): thời gian chờ bot kết nối (s)
+        """
+        self.team = team
+        self.field = field
+        self.side = side
+        self.dt = dt
+        self.deadline_ms = deadline_ms
+        self.budget_ms = deadline_ms    # apply() chờ bot không quá deadline
+        self.max_in_flight = max_in_flight
+        self.skip = set()   # robot đang được điều khiển bằng tay
+
+        self.seq = 0
+        self.sent = {}              # seq -> thời điểm gửi, của các STATE chưa được trả lời
+        self.applied = 0            # seq của câu trả lời đang dùng
+        self.version = team.world.version
+        self.version_seq = 1        # seq đầu tiên với world.version hiện tại
+        self.command_idx = np.zeros(0, dtype=np.intp)
+        self.command_vx = self.command_vy = self.command_theta = np.zeros(0)
+
+        self.misses = 0             # số tick câu trả lời tới trễ hơn deadline
+        self.dropped = 0            # số tick không gửi vì bot còn nợ quá nhiều STATE
+        self.round_trips = deque(maxlen=4096)   # thời gian gửi -> nhận (s), các tick gần nhất
+        self.connected = False
+
+        self.directory = tempfile.mkdtemp(prefix="rbot-")
+        path = os.path.join(self.directory, "bot.sock")
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(1)
+        command = [sys.executable if part == "{python}" else part for part in command]
+        self.process = subprocess.Popen(command + [path], cwd=PROJECT_DIR)
+        try:
+            self._accept(connect_timeout, seed)
+        except Exception:
+            self.close()
+            raise
+
+    def _accept(self, timeout, seed):
+        self.server.settimeout(0.1)
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                self.sock, _ = self.server.accept()
+                break
+            except socket.timeout:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"Bot exited with code {self.process.returncode}")
+                if time.perf_counter() > deadline:
+                    raise TimeoutError("Bot did not connect")
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 16)
+        self.sock.setblocking(False)
+        self.reader = protocol.FrameReader(self.sock)
+        frames = self.reader.wait(max(deadline - time.perf_counter(), 0.1))
+        if not frames or frames[0][0] != protocol.HELLO:
+            raise ConnectionError("Bot did not send HELLO")
+        self.name = protocol.decode_hello(frames[0][1])
+        zone = self.field.target_zone
+        self._send(protocol.encode_welcome(self.team.team_id, self.side, self.dt, self.deadline_ms,
+                                           seed, FIELD_BOUND_X, FIELD_BOUND_Y, zone.cx, zone.cy))
+        self.connected = True
+
+    def _send(self, data):
+        self.sock.setblocking(True)
+        try:
+            self.sock.sendall(data)
+        finally:
+            self.sock.setblocking(False)
+
+    def apply(self):
+        world = self.team.world
+        if world.version != self.version:
+            self.version = world.version
+            self.version_seq = self.seq + 1
+            self.command_idx = np.zeros(0, dtype=np.intp)
+        if not self.connected:
+            return
+
+        skip = [robot.index for robot in self.skip if robot.world is world]
+        previous = self.seq
+        self.seq += 1
+        if len(self.sent) < self.max_in_flight:
+            self.sent[self.seq] = time.perf_counter()
+            try:
+                self._send(protocol.encode_state(world, self.seq, skip))
+            except OSError:
+                self._disconnect()
+                return
+        else:
+            self.dropped += 1
+
+        self._receive(previous)
+        self._move(world, skip)
+
+    def _receive(self, wanted):
+        """Nhận mọi câu trả lời đã tới; chờ câu trả lời cho seq `wanted` tới hết deadline của nó."""
+        frames = self.reader.poll()
+        sent = self.sent.get(wanted)
+        if sent is not None and not self._answers(frames, wanted):
+            remaining = sent + self.deadline_ms * 1e-3 - time.perf_counter()
+            while remaining > 0 and not self.reader.closed:
+                frames += self.reader.wait(remaining)
+                if self._answers(frames, wanted):
+                    break
+                remaining = sent + self.deadline_ms * 1e-3 - time.perf_counter()
+            else:
+                if not self.reader.closed:   # bot ngắt kết nối thì không tính là trễ
+                    self.misses += 1
+                    events.emit(OVERRUN, WARNING, ok=False, time=self.team.world.time,
+                                team=self.team.team_id, value=self.deadline_ms)
+        if self.reader.closed:
+            self._disconnect()
+
+        latest = None
+        now = time.perf_counter()
+        for kind, payload in frames:
+            if kind != protocol.COMMAND:
+                continue
+            seq, commands = protocol.decode_command(payload)
+            for old in [s for s in self.sent if s <= seq]:
+                sent = self.sent.pop(old)
+                if old == seq:
+                    self.round_trips.append(now - sent)
+            if seq > self.applied and seq >= self.version_seq:
+                latest = (seq, commands)
+        if latest is not None:
+            self._command(*latest)
+
+    @staticmethod
+    def _answers(frames, seq):
+        return any(kind == protocol.COMMAND and protocol.COMMAND_HEADER.unpack_from(payload)[0] >= seq
+                   for kind, payload in frames)
+
+    def _command(self, seq, commands):
+        """Nhận lệnh mới; bỏ lệnh cho robot không thuộc đội / chỉ số không hợp lệ."""
+        self.applied = seq
+        index = commands['index'].astype(np.intp)
+        own = np.array([robot.index for robot in self.team.robots], dtype=np.intp)
+        valid = np.isin(index, own)
+        vx = np.nan_to_num(commands['vx'][valid].astype(float))
+        vy = np.nan_to_num(commands['vy'][valid].astype(float))
+        speed = np.hypot(vx, vy)
+        scale = np.where(speed > BOT_MAX_SPEED, BOT_MAX_SPEED / np.maximum(speed, 1e-9), 1.0)
+        self.command_idx = index[valid]
+        self.command_vx = vx * scale
+        self.command_vy = vy * scale
+        self.command_theta = commands['theta'][valid].astype(float)
+
+    def _move(self, world, skip):
+        idx = self.command_idx
+        if not len(idx):
+            return
+        keep = world.active[idx] & ~np.isin(idx, skip)
+        idx = idx[keep]
+        world.advance_robots(idx, self.command_vx[keep], self.command_vy[keep], self.dt)
+        theta = self.command_theta[keep]
+        world.theta[idx] = np.where(np.isnan(theta), world.theta[idx], theta % 360)
+
+    def _disconnect(self):
+        if self.connected:
+            print(f"[Bot] '{self.name}' disconnected, team {self.team.team_id} robots stop")
+        self.connected = False
+        self.command_idx = np.zeros(0, dtype=np.intp)
+
+    def latency_stats(self):
+        """Phân vị thời gian gửi STATE -> nhận COMMAND (ms), None nếu chưa có câu trả lời."""
+        if not self.round_trips:
+            return None
+        values = np.array(self.round_trips) * 1e3
+        p50, p99 = np.percentile(values, (50, 99))
+        return {'count': len(values), 'p50_ms': float(p50), 'p99_ms': float(p99),
+                'max_ms': float(values.max()), 'misses': self.misses, 'dropped': self.dropped}
+
+    def close(self):
+        """Gửi BYE, dừng tiến trình bot và xóa socket (gọi được nhiều lần)."""
+        if self.process is None:
+            return
+        if self.connected:
+            try:
+                self._send(protocol.frame(protocol.BYE))
+            except OSError:
+                pass
+        self.connected = False
+        for sock in (getattr(self, 'sock', None), self.server):
+            if sock is not None:
+                sock.close()
+        try:
+            self.process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            self.process.terminate()
+            self.process.wait()
+        self.process = None
+        shutil.rmtree(self.directory, ignore_errors=True)
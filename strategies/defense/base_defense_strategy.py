@@ -1,4 +1,11 @@
+import random
+
+from config import TIMESTEP
+
 class BaseDefenseStrategy:
+    rate = None       # tần số apply() (Hz) cho StrategyManager, None = mỗi tick
+    budget_ms = 2.0   # ngân sách CPU mỗi lần apply() (ms)
+
     def __init__(self, team, field):
         """
         Base class for all defense strategies.
@@ -7,6 +14,8 @@ class BaseDefenseStrategy:
         """
         self.team = team
         self.field = field
+        self.dt = TIMESTEP  # bước mô phỏng (s) của mỗi lần apply()
+        self.rng = random.Random()  # create_strategy gán luồng có seed riêng
 
     def apply(self):
         """
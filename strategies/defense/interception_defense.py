@@ -0,0 +1,144 @@
+import math
+
+import numpy as np
+
+from models.assignment import solve_assignment
+from models.win_evaluator import BLOCK_DISTANCE
+from .base_defense_strategy import BaseDefenseStrategy
+
+
+class InterceptionDefenseStrategy(BaseDefenseStrategy):
+    """
+    Phòng thủ chặn đường: mỗi hậu vệ được gán một robot tấn công và chạy tới
+    điểm chặn trên đoạn thẳng từ robot đó tới tâm target zone.
+
+    Phép gán là bài toán phân công chi phí nhỏ nhất (models.assignment) trên
+    ma trận (hậu vệ x mục tiêu): chi phí = quãng đường hậu vệ tới điểm chặn
+    + khoảng cách của robot tấn công tới zone, nên khi thiếu hậu vệ các robot
+    gần zone nhất được ưu tiên. Hậu vệ dư đứng gác trên cung quanh zone.
+
+    Phép gán được giữ nguyên giữa các tick và chỉ giải lại khi danh sách robot
+    đổi hoặc ma trận chi phí lệch quá resolve_threshold so với lần giải gần
+    nhất; phép gán mới chỉ thay phép gán cũ nếu tốt hơn ít nhất chừng đó,
+    tránh hậu vệ đổi mục tiêu qua lại. Khi giải lại với cùng danh sách robot,
+    thuật toán Hungary bắt đầu từ thế vị cột của lần giải trước (warm start).
+    """
+    rate = 10.0   # Hz; giữa hai lần chạy hậu vệ đi tiếp theo lệnh cũ (StrategyManager)
+
+    def __init__(self, team, field, speed=1.0, block_distance=0.8 * BLOCK_DISTANCE,
+                 guard_radius=2.5, resolve_threshold=0.3):
+        """
+        Args:
+            speed (float): tốc độ di chuyển (m/s)
+            block_distance (float): điểm chặn cách robot tấn công chừng này về phía zone (m);
+                phải nhỏ hơn BLOCK_DISTANCE thì hậu vệ đứng ở đó mới tính là chặn
+            guard_radius (float): bán kính cung gác của hậu vệ dư quanh tâm zone (m)
+            resolve_threshold (float): độ lệch chi phí (m) làm phép gán được giải lại
+        """
+        super().__init__(team, field)
+        self.speed = speed  # m/s
+        self.block_distance = block_distance
+        self.guard_radius = guard_radius
+        self.resolve_threshold = resolve_threshold
+        self.skip = set()   # robot đang được điều khiển bằng tay
+
+        self.solves = 0         # số lần đã chạy solve_assignment (để đo tỉ lệ giữ phép gán)
+        self._key = None        # (world.version, hậu vệ, robot tấn công) của lần giải gần nhất
+        self._solved_cost = None
+        self._assignment = None  # cột mục tiêu của từng hậu vệ
+        self._potentials = None  # thế vị cột của lần giải gần nhất
+
+    def reset(self):
+        """Bỏ phép gán đang giữ, tick sau sẽ giải lại từ đầu."""
+        self._key = None
+        self._solved_cost = None
+        self._assignment = None
+        self._potentials = None
+
+    def _targets(self, world, attackers, n_defenders):
+        """Điểm chặn của từng robot tấn công, cộng thêm điểm gác nếu dư hậu vệ."""
+        zone = self.field.target_zone
+        ax = world.x[attackers]
+        ay = world.y[attackers]
+        dx = zone.cx - ax
+        dy = zone.cy - ay
+        threat = np.hypot(dx, dy)
+        safe = np.where(threat > 0, threat, 1.0)
+        lead = np.minimum(self.block_distance, threat)
+        tx = ax + dx / safe * lead
+        ty = ay + dy / safe * lead
+
+        extra = n_defenders - len(attackers)
+        if extra > 0:
+            # Cung gác hướng về giữa sân, chia đều trong +-60 độ
+            facing = math.atan2(-zone.cy, -zone.cx) if (zone.cx or zone.cy) else math.pi
+            angles = facing + np.linspace(-math.pi / 3, math.pi / 3, extra + 2)[1:-1]
+            tx = np.concatenate((tx, zone.cx + self.guard_radius * np.cos(angles)))
+            ty = np.concatenate((ty, zone.cy + self.guard_radius * np.sin(angles)))
+            threat = np.concatenate((threat, np.zeros(extra)))
+        return tx, ty, threat
+
+    def apply(self):
+        world = self.team.world
+
+        skip = {robot.index for robot in self.skip if robot.world is world}
+        idx = np.array([robot.index for robot in self.team.robots
+                        if robot.index not in skip], dtype=np.intp)
+        if not len(idx):
+            return
+        idx = idx[world.active[idx]]
+        attackers = np.flatnonzero((world.team != self.team.team_id) & world.active)
+        if not len(idx):
+            return
+
+        tx, ty, threat = self._targets(world, attackers, len(idx))
+        if not len(tx):
+            return
+        rx = world.x[idx]
+        ry = world.y[idx]
+        cost = np.hypot(tx[None, :] - rx[:, None], ty[None, :] - ry[:, None]) + threat[None, :]
+
+        key = (world.version, idx.tobytes(), attackers.tobytes())
+        if key != self._key:
+            self._solve(cost, keep=False)
+            self._key = key
+        elif np.abs(cost - self._solved_cost).max() > self.resolve_threshold:
+            self._solve(cost, keep=True)
+
+        assigned = self._assignment >= 0
+        if not assigned.any():
+            return
+        movers = idx[assigned]
+        cols = self._assignment[assigned]
+        mx = rx[assigned]
+        my = ry[assigned]
+        dx = tx[cols] - mx
+        dy = ty[cols] - my
+        distance = np.hypot(dx, dy)
+        moving = distance >= 0.05
+        safe = np.where(moving, distance, 1.0)
+
+        step = np.minimum(self.speed * self.dt, distance)
+        world.move_robots(movers, mx + dx / safe * step, my + dy / safe * step, where=moving)
+        heading = np.degrees(np.arctan2(dy, dx)) % 360
+        world.theta[movers] = np.where(moving, heading, world.theta[movers])
+
+    def _solve(self, cost, keep):
+        """
+        Giải lại phép gán; keep=True (cùng danh sách robot) thì warm start từ thế
+        vị cũ và giữ phép gán cũ nếu cái mới không tốt hơn đủ nhiều.
+        """
+        self.solves += 1
+        if not keep or self._potentials is None:
+            self._potentials = np.zeros(max(cost.shape))
+        rows, cols = solve_assignment(cost, self._potentials)
+        assignment = np.full(cost.shape[0], -1, dtype=np.intp)
+        assignment[rows] = cols
+
+        if keep and self._assignment is not None:
+            old = self._assignment >= 0
+            old_total = cost[old.nonzero()[0], self._assignment[old]].sum()
+            if old_total - cost[rows, cols].sum() < self.resolve_threshold:
+                assignment = self._assignment
+        self._assignment = assignment
+        self._solved_cost = cost
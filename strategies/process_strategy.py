@@ -0,0 +1,217 @@
+import gc
+import multiprocessing
+import time
+
+import numpy as np
+
+from config import TIMESTEP
+from models.shared_world import SharedSnapshot, CommandMailbox
+
+POLL_INTERVAL = 0.0002   # chu kỳ worker / tiến trình chính kiểm tra seq mới (s)
+
+
+def _build_world(slot, field):
+    """Dựng World + Team trong worker theo ảnh chụp (cùng chỉ số robot với tiến trình chính)."""
+    from models.team import Team
+    from models.world import World
+
+    world = World()
+    teams = {team_id: Team(team_id, None, field.MARGIN, world=world) for team_id in (1, 2)}
+    n = int(slot['n'])
+    for i in range(n):
+        teams[int(slot['team'][i])].add_robot(float(slot['x'][i]), float(slot['y'][i]),
+                                              float(slot['theta'][i]), int(slot['robot_id'][i]))
+    return world, teams
+
+
+def _worker_main(snapshot_name, mailbox_name, name, side, team_id):
+    """
+    Vòng lặp của tiến trình worker: chờ ảnh chụp mới, chạy strategy trên đó,
+    ghi pose kết quả vào hộp thư. Pose của World trong worker chính là các
+    mảng của ngăn hộp thư, nên strategy ghi thẳng câu trả lời tại chỗ.
+    """
+    import random
+    from config import SCALE
+    from models.field import Field
+    from strategies.strategy_manager import create_strategy
+
+    snapshot = SharedSnapshot(snapshot_name)
+    mailbox = CommandMailbox(mailbox_name)
+    field = Field(SCALE)
+    parent = multiprocessing.parent_process()
+    world = teams = strategy = out = slot = None
+    version = None
+    last = -1
+    idle = 0
+    try:
+        while not snapshot.header['stop']:
+            slot = snapshot.read()
+            if slot is None or int(slot['seq']) == last:
+                idle += 1
+                if idle % 5000 == 0 and parent is not None and not parent.is_alive():
+                    break       # tiến trình chính đã chết mà không kịp close()
+                time.sleep(POLL_INTERVAL)
+                continue
+            idle = 0
+            seq = int(slot['seq'])
+            n = int(slot['n'])
+            if world is None:
+                seed = int(slot['seed'])
+                random.seed(seed)
+                np.random.seed(seed % 2**32)
+            if world is None or int(slot['version']) != version:
+                version = int(slot['version'])
+                world, teams = _build_world(slot, field)
+                strategy = create_strategy(name, side, teams[team_id], field, seed=seed)
+
+            out = mailbox.begin(seq)
+            out['x0'][:n] = out['x'][:n] = slot['x'][:n]
+            out['y0'][:n] = out['y'][:n] = slot['y'][:n]
+            out['theta'][:n] = slot['theta'][:n]
+            world.x = out['x'][:n]
+            world.y = out['y'][:n]
+            world.theta = out['theta'][:n]
+            world.active[:] = slot['active'][:n]
+            world.has_ball[:] = slot['has_ball'][:n]
+            world.ball_pos[:] = slot['ball_pos']
+            world.ball_vel[:] = slot['ball_vel']
+            world.time = float(slot['time'])
+            dt = float(slot['dt'])
+            strategy.dt = dt
+            if hasattr(strategy, 'skip'):
+                strategy.skip = {world.handles[i] for i in np.flatnonzero(slot['skip'][:n]).tolist()}
+            if not snapshot.valid(slot, seq):
+                continue        # ảnh chụp bị ghi đè khi đang đọc, lấy cái mới hơn
+            last = seq
+
+            world.grid.refresh()
+            strategy.apply()
+            out['dt'] = dt
+            mailbox.commit(out, seq)
+    finally:
+        # Bỏ mọi view trên bộ nhớ chia sẻ (World có vòng tham chiếu với grid) trước khi đóng
+        world = teams = strategy = out = slot = None
+        gc.collect()
+        snapshot.close()
+        mailbox.close()
+
+
+class ProcessStrategy:
+    """
+    Chạy một strategy đã đăng ký (xem create_strategy) trong tiến trình riêng.
+
+    Mỗi lần apply() chỉ ghi ảnh chụp World vào bộ nhớ chia sẻ (SharedSnapshot)
+    và đọc câu trả lời mới nhất trong hộp thư (CommandMailbox), nên luồng GUI
+    không phải chờ strategy tính toán.
+
+    - async: câu trả lời cho ảnh chụp tick k được áp dụng từ tick kế tiếp dưới
+      dạng vận tốc (đổi từ pose đầu vào / đầu ra), robot giữ vận tốc đó cho tới
+      khi có câu trả lời mới hơn.
+    - lockstep: apply() chờ worker trả lời đúng ảnh chụp vừa ghi rồi gán pose,
+      kết quả chỉ phụ thuộc seed (dùng cho batch cần lặp lại được).
+
+    Có cùng giao diện strategy (apply, dt, skip, rate, budget_ms) nên dùng
+    được trực tiếp với StrategyManager; gọi close() để dừng worker.
+    """
+
+    def __init__(self, name, side, team, field, dt=TIMESTEP, lockstep=False, seed=0,
+                 timeout=10.0):
+        """
+        Args:
+            name (str): tên strategy trong ATTACK_STRATEGIES / DEFENSE_STRATEGIES
+            side (str): 'attack' hoặc 'defense'
+            lockstep (bool): chờ câu trả lời mỗi tick (tất định)
+            seed (int): seed của random / np.random trong worker
+            timeout (float): thời gian chờ tối đa một câu trả lời ở chế độ lockstep (s)
+        """
+        from strategies.strategy_manager import ATTACK_STRATEGIES, DEFENSE_STRATEGIES
+        registry = ATTACK_STRATEGIES if side == 'attack' else DEFENSE_STRATEGIES
+        strategy_class = registry[name]
+        self.rate = getattr(strategy_class, 'rate', None)
+        self.budget_ms = getattr(strategy_class, 'budget_ms', 2.0)
+
+        self.name = name
+        self.team = team
+        self.field = field
+        self.dt = dt
+        self.lockstep = lockstep
+        self.seed = seed
+        self.timeout = timeout
+        self.skip = set()   # robot đang được điều khiển bằng tay
+
+        self.seq = 0
+        self.applied = -1           # seq của câu trả lời đang dùng
+        self.version_seq = 1        # seq đầu tiên với world.version hiện tại
+        self.version = team.world.version
+        self.command_idx = np.zeros(0, dtype=np.intp)
+        self.command_vx = self.command_vy = self.command_theta = np.zeros(0)
+
+        self.snapshot = SharedSnapshot()
+        self.mailbox = CommandMailbox()
+        context = multiprocessing.get_context('spawn')
+        self.process = context.Process(
+            target=_worker_main, daemon=True,
+            args=(self.snapshot.name, self.mailbox.name, name, side, team.team_id))
+        self.process.start()
+
+    def apply(self):
+        world = self.team.world
+        if world.version != self.version:
+            self.version = world.version
+            self.version_seq = self.seq + 1
+            self.command_idx = np.zeros(0, dtype=np.intp)
+
+        skip = [robot.index for robot in self.skip if robot.world is world]
+        self.seq += 1
+        self.snapshot.publish(world, self.seq, self.dt, self.seed, skip)
+        if self.lockstep:
+            self._wait(self.seq)
+
+        n = len(world.x)
+        command = self.mailbox.read(n)
+        idx = np.array([robot.index for robot in self.team.robots
+                        if robot.index not in skip], dtype=np.intp)
+        idx = idx[world.active[idx]] if len(idx) else idx
+        if command is not None and command[0] > self.applied and command[0] >= self.version_seq:
+            seq, dt, x0, y0, x, y, theta = command
+            self.applied = seq
+            if self.lockstep:
+                world.x[idx] = x[idx]
+                world.y[idx] = y[idx]
+                world.theta[idx] = theta[idx]
+                world.grid.refresh()
+                return
+            moved = (x[idx] != x0[idx]) | (y[idx] != y0[idx])
+            self.command_idx = idx[moved]
+            self.command_vx = (x[self.command_idx] - x0[self.command_idx]) / dt
+            self.command_vy = (y[self.command_idx] - y0[self.command_idx]) / dt
+            self.command_theta = theta[self.command_idx]
+
+        if self.lockstep or not len(self.command_idx):
+            return
+        keep = np.isin(self.command_idx, idx)
+        cmd = self.command_idx[keep]
+        world.advance_robots(cmd, self.command_vx[keep], self.command_vy[keep], self.dt)
+        world.theta[cmd] = self.command_theta[keep]
+
+    def _wait(self, seq):
+        deadline = time.perf_counter() + self.timeout
+        while self.mailbox.latest < seq:
+            if not self.process.is_alive():
+                raise RuntimeError(f"Strategy worker '{self.name}' exited")
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Strategy worker '{self.name}' did not answer tick {seq}")
+            time.sleep(POLL_INTERVAL)
+
+    def close(self):
+        """Dừng worker và giải phóng bộ nhớ chia sẻ (gọi được nhiều lần)."""
+        if self.snapshot is None:
+            return
+        self.snapshot.header['stop'] = 1
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.snapshot.close()
+        self.mailbox.close()
+        self.snapshot = self.mailbox = None
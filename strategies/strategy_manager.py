@@ -1,21 +1,247 @@
+import random
+import time
+
+import numpy as np
+
+from config import TIMESTEP, BOT_COMMANDS
+from models.events import events, OVERRUN, WARNING
 from strategies.attack.random_attack import RandomAttackStrategy
+from strategies.attack.potential_field_attack import PotentialFieldAttackStrategy
+from strategies.attack.flow_field_attack import FlowFieldAttackStrategy
 from strategies.defense.random_defense import RandomDefenseStrategy
+from strategies.defense.interception_defense import InterceptionDefenseStrategy
+
+# Tên hiển thị (combo box / dòng lệnh) -> lớp strategy
+ATTACK_STRATEGIES = {
+    "Random": RandomAttackStrategy,
+    "Potential Field": PotentialFieldAttackStrategy,
+    "Flow Field": FlowFieldAttackStrategy,
+}
+DEFENSE_STRATEGIES = {
+    "Random": RandomDefenseStrategy,
+    "Interception": InterceptionDefenseStrategy,
+}
+
+DEFAULT_BUDGET_MS = 2.0   # ngân sách CPU mỗi lần apply() nếu strategy không khai báo
+MAX_RUNS_PER_TICK = 8     # giới hạn số lần chạy trong một tick với strategy tần số cao
+
+def new_seed():
+    """Seed mới cho một trận, khác nhau giữa các lần chạy."""
+    return random.SystemRandom().randrange(2**31)
+
+
+def create_strategy(name, side, team, field, dt=TIMESTEP, process=None, seed=None):
+    """
+    Tạo strategy theo tên cho phía 'attack' hoặc 'defense', None nếu không có.
+
+    process = "async" / "lockstep" chạy strategy trong tiến trình riêng
+    (ProcessStrategy, seed cho random của tiến trình đó); None = trong tiến trình này.
+    Tên trong BOT_COMMANDS là bot ngoài tiến trình (BotStrategy), dùng cho cả hai phía.
+    Strategy trong tiến trình có luồng ngẫu nhiên riêng `rng` lấy từ (tên, phía,
+    đội, seed), không dùng module random chung, nên lặp lại được theo seed;
+    seed=None thì lấy seed mới (new_seed), mỗi lần tạo chạy khác nhau.
+    """
+    if seed is None:
+        seed = new_seed()
+    if name in BOT_COMMANDS:
+        from strategies.bot_strategy import BotStrategy
+        return BotStrategy(BOT_COMMANDS[name], side, team, field, dt, seed=seed)
+    registry = ATTACK_STRATEGIES if side == 'attack' else DEFENSE_STRATEGIES
+    strategy_class = registry.get(name)
+    if strategy_class is None:
+        return None
+    if process:
+        from strategies.process_strategy import ProcessStrategy
+        return ProcessStrategy(name, side, team, field, dt, lockstep=process == "lockstep", seed=seed)
+    strategy = strategy_class(team, field)
+    strategy.dt = dt
+    strategy.rng = random.Random(f"{name}:{side}:{team.team_id}:{seed}")
+    return strategy
+
+
+class ScheduledStrategy:
+    """Một strategy trong StrategyManager: lịch chạy, lệnh gần nhất và thống kê."""
+
+    def __init__(self, strategy, rate, budget_ms):
+        self.strategy = strategy
+        self.name = type(strategy).__name__
+        self.rate = rate                # Hz thời gian mô phỏng, None = mỗi tick
+        self.budget_ms = budget_ms
+        self.next_time = 0.0            # thời điểm mô phỏng của lần chạy kế tiếp
+        self.debt = 0.0                 # thời gian vượt ngân sách chưa trả (s CPU)
+
+        # Lệnh gần nhất: vận tốc (m/s) của các robot mà strategy đã di chuyển
+        self.command_idx = np.zeros(0, dtype=np.intp)
+        self.command_version = -1       # world.version lúc đo lệnh (chỉ số robot còn đúng)
+        self.command_vx = np.zeros(0)
+        self.command_vy = np.zeros(0)
+
+        self.runs = 0
+        self.replays = 0                # số tick chỉ lặp lại lệnh cũ
+        self.overruns = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def report(self):
+        return {
+            'name': self.name,
+            'rate': self.rate,
+            'budget_ms': self.budget_ms,
+            'runs': self.runs,
+            'replays': self.replays,
+            'overruns': self.overruns,
+            'mean_ms': self.total_time * 1e3 / self.runs if self.runs else 0.0,
+            'max_ms': self.max_time * 1e3,
+        }
+
 
 class StrategyManager:
-    def __init__(self, team_blue, team_red, field):
-        self.team_blue = team_blue
-        self.team_red = team_red
-        self.field = field
+    """
+    Bộ lập lịch đa tần số cho các strategy, gọi step() một lần mỗi tick.
+
+    Mỗi strategy khai báo `rate` (Hz, None = mỗi tick) và `budget_ms` (CPU
+    mỗi lần apply()), có thể ghi đè khi add(). Strategy tần số cao chạy nhiều
+    lần trong một tick với dt nhỏ hơn; strategy tần số thấp chỉ chạy ở các
+    tick đến hạn. Ở các tick còn lại robot tiếp tục theo lệnh gần nhất (vận
+    tốc đo được từ lần apply() trước), nên vòng lặp không phải chờ planner.
+
+    Mỗi lần apply() được đo thời gian; vượt budget_ms là một overrun (ghi
+    thống kê và phát sự kiện OVERRUN mức WARNING). Khi enforce_budgets bật,
+    phần vượt được cộng vào "nợ" và strategy bỏ lượt (giữ lệnh cũ) cho tới
+    khi trả hết nợ, thay vì làm chậm mọi tick. Chạy headless cần lặp lại
+    được theo seed thì tắt enforce_budgets: overrun vẫn được đo và báo.
+    """
+
+    def __init__(self, dt=TIMESTEP, enforce_budgets=True):
+        """
+        Args:
+            dt (float): bước mô phỏng mỗi lần step() (s)
+            enforce_budgets (bool): bỏ lượt strategy đã vượt ngân sách
+        """
+        self.dt = dt
+        self.enforce_budgets = enforce_budgets
+        self.entries = []
+        self.time = 0.0
+
+    def add(self, strategy, rate=None, budget_ms=None):
+        """
+        Thêm strategy (bỏ qua None). rate / budget_ms mặc định lấy từ thuộc
+        tính cùng tên của strategy.
+
+        Returns:
+            ScheduledStrategy hoặc None
+        """
+        if strategy is None:
+            return None
+        if rate is None:
+            rate = getattr(strategy, 'rate', None)
+        if budget_ms is None:
+            budget_ms = getattr(strategy, 'budget_ms', DEFAULT_BUDGET_MS)
+        entry = ScheduledStrategy(strategy, rate, budget_ms)
+        entry.next_time = self.time
+        self.entries.append(entry)
+        return entry
+
+    def remove(self, strategy):
+        for entry in self.entries:
+            if entry.strategy is strategy and hasattr(strategy, 'close'):
+                strategy.close()
+        self.entries = [e for e in self.entries if e.strategy is not strategy]
+
+    def clear(self):
+        """Bỏ mọi strategy (đóng strategy chạy ở tiến trình riêng)."""
+        for entry in self.entries:
+            if hasattr(entry.strategy, 'close'):
+                entry.strategy.close()
+        self.entries = []
+        self.time = 0.0
+
+    def _due_runs(self, entry):
+        """Số lần strategy đến hạn chạy trong tick [time, time + dt)."""
+        if not entry.rate:
+            return 1
+        period = 1.0 / entry.rate
+        end = self.time + self.dt - 1e-9
+        runs = 0
+        while entry.next_time <= end and runs < MAX_RUNS_PER_TICK:
+            entry.next_time += period
+            runs += 1
+        if entry.next_time <= end:          # tụt lại quá xa: bỏ các lần lỡ
+            entry.next_time = self.time + self.dt
+        return runs
+
+    def step(self):
+        """Chạy các strategy đến hạn trong tick này, các robot còn lại giữ lệnh cũ."""
+        for entry in self.entries:
+            runs = self._due_runs(entry)
+            if runs and self.enforce_budgets and entry.debt > 0:
+                entry.debt = max(entry.debt - entry.budget_ms * 1e-3 * runs, 0.0)
+                runs = 0
+            if runs:
+                self._run(entry, runs)
+            else:
+                entry.replays += 1
+                self._replay(entry, self.dt)
+        self.time += self.dt
+
+    def _run(self, entry, runs):
+        strategy = entry.strategy
+        world = strategy.team.world
+        idx = np.array([robot.index for robot in strategy.team.robots], dtype=np.intp)
+        sub_dt = self.dt / runs
+        budget = entry.budget_ms * 1e-3
+        saved_dt = strategy.dt
+        strategy.dt = sub_dt
+
+        spent = 0.0
+        done = 0
+        try:
+            while done < runs:
+                x0 = world.x[idx]
+                y0 = world.y[idx]
+                t0 = time.perf_counter()
+                strategy.apply()
+                elapsed = time.perf_counter() - t0
+                done += 1
+                spent += elapsed
+                self._record(entry, elapsed, strategy)
+                if done < runs and spent > budget * runs:
+                    break
+        finally:
+            strategy.dt = saved_dt
 
-        self.attack_strategy = RandomAttackStrategy(self.team_red, self.field)
-        self.defense_strategy = RandomDefenseStrategy(self.team_blue, self.field)
+        moved = (world.x[idx] != x0) | (world.y[idx] != y0)
+        entry.command_idx = idx[moved]
+        entry.command_version = world.version
+        entry.command_vx = (world.x[entry.command_idx] - x0[moved]) / sub_dt
+        entry.command_vy = (world.y[entry.command_idx] - y0[moved]) / sub_dt
+        if done < runs:
+            # Hết ngân sách giữa tick: phần còn lại đi theo lệnh vừa đo
+            self._replay(entry, sub_dt * (runs - done))
 
-    def set_attack_strategy(self, strategy_class):
-        self.attack_strategy = strategy_class(self.team_red, self.field)
+    def _record(self, entry, elapsed, strategy):
+        entry.runs += 1
+        entry.total_time += elapsed
+        entry.max_time = max(entry.max_time, elapsed)
+        over = elapsed - entry.budget_ms * 1e-3
+        if over > 0:
+            entry.overruns += 1
+            entry.debt += over
+            events.emit(OVERRUN, WARNING, ok=False, time=strategy.team.world.time,
+                        team=strategy.team.team_id, value=elapsed * 1e3)
 
-    def set_defense_strategy(self, strategy_class):
-        self.defense_strategy = strategy_class(self.team_blue, self.field)
+    def _replay(self, entry, dt):
+        """Tiếp tục lệnh gần nhất trong dt giây (bỏ robot đang điều khiển tay / đã tắt)."""
+        idx = entry.command_idx
+        world = entry.strategy.team.world
+        if not len(idx) or entry.command_version != world.version:
+            return
+        keep = world.active[idx]
+        skip = getattr(entry.strategy, 'skip', None)
+        if skip:
+            keep &= ~np.isin(idx, [robot.index for robot in skip])
+        world.advance_robots(idx[keep], entry.command_vx[keep], entry.command_vy[keep], dt)
 
-    def apply_strategies(self):
-        self.attack_strategy.apply()
-        self.defense_strategy.apply()
+    def report(self):
+        """Thống kê mỗi strategy: số lần chạy / lặp lệnh / overrun, thời gian (ms)."""
+        return [entry.report() for entry in self.entries]
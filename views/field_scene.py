@@ -0,0 +1,68 @@
+# views/field_scene.py
+
+from PyQt5.QtWidgets import QGraphicsScene
+from PyQt5.QtGui import QPainter, QPixmap
+from PyQt5.QtCore import Qt, QRectF
+
+
+class FieldScene(QGraphicsScene):
+    """
+    Scene có lớp sân tĩnh được vẽ sẵn.
+
+    Các item của Field.draw (đường kẻ, vòng tròn, khung thành, target zone...)
+    nằm trong một scene phụ và chỉ được render một lần vào pixmap nền, theo
+    đúng kích thước pixel trên màn hình. Pixmap được giữ lại theo khóa
+    (SCALE, kích thước thiết bị) nên chỉ vẽ lại khi đổi kích thước cửa sổ.
+    Scene chính chỉ còn các item động (robot, bóng), nên khi robot di chuyển
+    view chỉ cần vẽ lại vùng bị thay đổi.
+    """
+
+    def __init__(self, field, parent=None):
+        super().__init__(parent)
+        self.field = field
+        self.static_scene = QGraphicsScene()
+        field.draw(self.static_scene)
+
+        rect = QRectF(0, 0, *field.get_dimensions())
+        self.static_scene.setSceneRect(rect)
+        self.setSceneRect(rect)
+        # Item động di chuyển mỗi frame: bỏ chỉ mục BSP cho rẻ hơn
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+
+        self.background_key = None
+        self.background = None
+
+    def background_pixmap(self, width, height, ratio):
+        """Pixmap của lớp sân tĩnh ở kích thước thiết bị width x height (pixel)."""
+        key = (self.field.SCALE, width, height, ratio)
+        if key != self.background_key:
+            pixmap = QPixmap(width, height)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            self.static_scene.render(painter, QRectF(0, 0, width, height), self.sceneRect(),
+                                     Qt.IgnoreAspectRatio)
+            painter.end()
+            pixmap.setDevicePixelRatio(ratio)
+            self.background = pixmap
+            self.background_key = key
+        return self.background
+
+    def drawBackground(self, painter, rect):
+        scene_rect = self.sceneRect()
+        device_rect = painter.transform().mapRect(scene_rect)
+        ratio = painter.device().devicePixelRatioF()
+        width = max(1, round(device_rect.width() * ratio))
+        height = max(1, round(device_rect.height() * ratio))
+
+        pixmap = self.background_pixmap(width, height, ratio)
+        # Chỉ chép phần nền nằm trong vùng cần vẽ lại
+        exposed = rect.intersected(scene_rect)
+        if exposed.isEmpty():
+            return
+        sx = width / scene_rect.width()
+        sy = height / scene_rect.height()
+        source = QRectF((exposed.x() - scene_rect.x()) * sx, (exposed.y() - scene_rect.y()) * sy,
+                        exposed.width() * sx, exposed.height() * sy)
+        painter.drawPixmap(exposed, pixmap, source)
@@ -0,0 +1,174 @@
+# views/world_view.py
+
+import numpy as np
+
+
+class WorldView:
+    """
+    Lớp đồng bộ hiển thị: đọc trạng thái từ World và đẩy sang các graphic trên scene.
+
+    Mỗi thực thể (robot, bóng, lớp phủ target zone) có đúng một graphic tồn tại
+    suốt đời, không bao giờ bị xóa/tạo lại trong vòng lặp. sync() so trạng thái
+    mới với giá trị đã áp dụng ở frame trước và chỉ gọi setPos/setRotation/
+    setVisible cho những gì thực sự thay đổi; scene gom các thay đổi đó và vẽ
+    lại một lần ở frame tiếp theo.
+
+    Gọi sync() đúng một lần mỗi frame, sau khi mô phỏng đã cập nhật xong.
+    Khi mô phỏng chạy bước cố định, gọi capture() trước mỗi tick rồi
+    sync(alpha) để vẽ vị trí nội suy giữa tick trước và tick hiện tại.
+    """
+
+    def __init__(self, world, scale, margin, robot_size, scene=None, zone=None):
+        """
+        Args:
+            world: đối tượng World
+            scale (float): tỉ lệ pixel / mét
+            margin (float): khoảng lề sân (pixel)
+            robot_size (float): kích thước hiển thị robot (pixel)
+            scene: QGraphicsScene để tạo graphic bóng và lớp phủ zone (None = chỉ robot)
+            zone: TargetZone được tô sáng khi set_zone_active(True)
+        """
+        self.world = world
+        self.scale = scale
+        self.margin = margin
+        self.robot_size = robot_size
+        self.prev_x = self.prev_y = self.prev_theta = None
+        self.prev_ball = world.ball_pos.copy()
+        self.prev_version = None
+
+        # Giá trị đã áp dụng lên graphic ở lần sync trước (dirty check)
+        self.applied_version = None
+        self.applied_px = self.applied_py = self.applied_theta = self.applied_active = None
+        self.applied_ball = None
+        self.zone_active = False
+        self.applied_zone_active = None
+
+        self.ball_graphic = None
+        self.zone_graphic = None
+        if scene is not None:
+            self.ball_graphic = self.create_ball_graphic(scene)
+            if zone is not None:
+                self.zone_graphic = self.create_zone_graphic(scene, zone)
+
+    def create_ball_graphic(self, scene):
+        from PyQt5.QtWidgets import QGraphicsEllipseItem, QGraphicsItem
+        from PyQt5.QtGui import QBrush, QPen, QColor
+        from PyQt5.QtCore import Qt
+
+        r = self.world.ball_radius * self.scale
+        graphic = QGraphicsEllipseItem(-r, -r, 2 * r, 2 * r)
+        graphic.setBrush(QBrush(QColor("orange")))
+        graphic.setPen(QPen(Qt.black, 1))
+        graphic.setZValue(1)  # bóng luôn nằm trên robot
+        graphic.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        scene.addItem(graphic)
+        return graphic
+
+    def create_zone_graphic(self, scene, zone):
+        """Lớp phủ tô sáng target zone khi có robot đỏ bên trong (mặc định ẩn)."""
+        from PyQt5.QtGui import QBrush, QPen, QColor
+        from PyQt5.QtCore import Qt
+        from zones.target_zone_drawer import draw_target_zone
+
+        graphic = draw_target_zone(scene, zone, self.scale, self.margin,
+                                   pen=QPen(Qt.NoPen), brush=QBrush(QColor(255, 0, 0, 90)))
+        if graphic is not None:
+            graphic.setZValue(-1)  # nằm dưới robot
+            graphic.setVisible(False)
+        return graphic
+
+    def set_zone_active(self, active):
+        """Bật/tắt lớp phủ target zone; được áp dụng ở lần sync() kế tiếp."""
+        self.zone_active = bool(active)
+
+    def to_pixels(self, x, y):
+        """Đổi tọa độ mét (gốc giữa sân) sang góc trên-trái của graphic robot."""
+        px = self.margin + (x + 11.0) * self.scale - self.robot_size / 2
+        py = self.margin + (y + 7.0) * self.scale - self.robot_size / 2
+        return px, py
+
+    def capture(self):
+        """Lưu pose hiện tại làm mốc nội suy (gọi ngay trước mỗi tick)."""
+        world = self.world
+        np.copyto(self.prev_ball, world.ball_pos)
+        if self.prev_version == world.version and self.prev_x.shape == world.x.shape:
+            np.copyto(self.prev_x, world.x)
+            np.copyto(self.prev_y, world.y)
+            np.copyto(self.prev_theta, world.theta)
+        else:
+            self.prev_x = world.x.copy()
+            self.prev_y = world.y.copy()
+            self.prev_theta = world.theta.copy()
+            self.prev_version = world.version
+
+    def interpolated(self, alpha):
+        """Pose (x, y, theta) ở vị trí alpha giữa mốc capture() và World hiện tại."""
+        world = self.world
+        if alpha >= 1.0 or self.prev_version != world.version or self.prev_x.shape != world.x.shape:
+            return world.x, world.y, world.theta
+        x = self.prev_x + (world.x - self.prev_x) * alpha
+        y = self.prev_y + (world.y - self.prev_y) * alpha
+        # Góc quay theo đường ngắn nhất (359° -> 1° đi qua 0°)
+        dtheta = (world.theta - self.prev_theta + 180.0) % 360.0 - 180.0
+        theta = self.prev_theta + dtheta * alpha
+        return x, y, theta
+
+    def sync(self, alpha=1.0):
+        """
+        Args:
+            alpha (float): 1 = vẽ đúng trạng thái World; < 1 = nội suy từ mốc capture()
+        """
+        world = self.world
+        x, y, theta = self.interpolated(alpha)
+        px, py = self.to_pixels(x, y)
+        active = world.active
+
+        if self.applied_version != world.version or self.applied_px.shape != px.shape:
+            # Danh sách robot đã đổi: áp dụng lại toàn bộ
+            changed = np.arange(len(px))
+            vis_changed = changed
+            self.applied_version = world.version
+        else:
+            moved = (px != self.applied_px) | (py != self.applied_py)
+            turned = theta != self.applied_theta
+            vis_changed = np.flatnonzero(active != self.applied_active)
+            changed = np.flatnonzero(moved | turned)
+        self.applied_px = px.copy()
+        self.applied_py = py.copy()
+        self.applied_theta = np.array(theta, dtype=np.float64)
+        self.applied_active = active.copy()
+
+        handles = world.handles
+        for i in vis_changed.tolist():
+            graphic = handles[i].graphic
+            if graphic is not None:
+                graphic.setVisible(bool(active[i]))
+        if len(changed):
+            pxl, pyl, thl = px[changed].tolist(), py[changed].tolist(), self.applied_theta[changed].tolist()
+            for k, i in enumerate(changed.tolist()):
+                graphic = handles[i].graphic
+                if graphic is None:
+                    continue
+                graphic.setPos(pxl[k], pyl[k])
+                graphic.setRotation(thl[k])
+
+        self.sync_ball(alpha)
+
+        if self.zone_graphic is not None and self.zone_active != self.applied_zone_active:
+            self.zone_graphic.setVisible(self.zone_active)
+            self.applied_zone_active = self.zone_active
+
+    def sync_ball(self, alpha):
+        if self.ball_graphic is None:
+            return
+        ball = self.world.ball_pos
+        if alpha < 1.0:
+            bx = self.prev_ball[0] + (ball[0] - self.prev_ball[0]) * alpha
+            by = self.prev_ball[1] + (ball[1] - self.prev_ball[1]) * alpha
+        else:
+            bx, by = ball[0], ball[1]
+        pos = (float(self.margin + (bx + 11.0) * self.scale),
+               float(self.margin + (by + 7.0) * self.scale))
+        if pos != self.applied_ball:
+            self.ball_graphic.setPos(*pos)
+            self.applied_ball = pos
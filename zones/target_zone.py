@@ -1,26 +1,58 @@
 # zones/target_zone.py
 
 import math
+import numpy as np
 
 class TargetZone:
     """
     Lớp cơ sở cho các loại vùng target zone.
-    Các lớp con cần cài đặt hàm contains().
+    Các lớp con cần cài đặt hàm contains(), và nên cài đặt _contains_arrays()
+    cùng bbox = (x_min, y_min, x_max, y_max) để contains_many() chạy vector hóa.
     """
+    bbox = (-math.inf, -math.inf, math.inf, math.inf)
+
     def contains(self, x, y):
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def _contains_arrays(self, xs, ys):
+        """Phiên bản mảng 1 chiều của contains(); mặc định gọi contains() từng điểm."""
+        return np.fromiter((self.contains(x, y) for x, y in zip(xs.tolist(), ys.tolist())),
+                           dtype=bool, count=len(xs))
+
+    def contains_many(self, xs, ys):
+        """
+        contains() cho cả mảng điểm, dùng được cho một frame (n,) lẫn cả quỹ đạo (frames, n).
+
+        Điểm nằm ngoài bbox bị loại ngay, chỉ các điểm còn lại mới được kiểm tra chính xác.
+
+        Returns:
+            np.ndarray bool cùng shape với xs, ys (sau broadcast)
+        """
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=np.float64),
+                                     np.asarray(ys, dtype=np.float64))
+        x_min, y_min, x_max, y_max = self.bbox
+        candidate = (xs >= x_min) & (xs <= x_max) & (ys >= y_min) & (ys <= y_max)
+
+        result = np.zeros(xs.shape, dtype=bool)
+        if candidate.any():
+            result[candidate] = self._contains_arrays(xs[candidate], ys[candidate])
+        return result
+
 
 class CircleZone(TargetZone):
     def __init__(self, center_x, center_y, radius):
         self.cx = center_x
         self.cy = center_y
         self.radius = radius
+        self.bbox = (center_x - radius, center_y - radius, center_x + radius, center_y + radius)
 
     def contains(self, x, y):
         dist = math.hypot(self.cx - x, self.cy - y)
         return dist <= self.radius
 
+    def _contains_arrays(self, xs, ys):
+        return np.hypot(self.cx - xs, self.cy - ys) <= self.radius
+
 
 class RectangleZone(TargetZone):
     def __init__(self, center_x, center_y, width, height):
@@ -28,11 +60,16 @@ class RectangleZone(TargetZone):
         self.cy = center_y
         self.w = width
         self.h = height
+        self.bbox = (center_x - width/2, center_y - height/2, center_x + width/2, center_y + height/2)
 
     def contains(self, x, y):
         return (self.cx - self.w/2 <= x <= self.cx + self.w/2 and
                 self.cy - self.h/2 <= y <= self.cy + self.h/2)
 
+    def _contains_arrays(self, xs, ys):
+        # bbox trùng với hình chữ nhật nên mọi điểm đã qua bbox đều nằm trong zone
+        return np.ones(len(xs), dtype=bool)
+
 
 class DiamondZone(TargetZone):
     def __init__(self, center_x, center_y, width, height):
@@ -40,12 +77,16 @@ class DiamondZone(TargetZone):
         self.cy = center_y
         self.w = width
         self.h = height
+        self.bbox = (center_x - width/2, center_y - height/2, center_x + width/2, center_y + height/2)
 
     def contains(self, x, y):
         dx = abs(x - self.cx) / (self.w / 2)
         dy = abs(y - self.cy) / (self.h / 2)
         return dx + dy <= 1
 
+    def _contains_arrays(self, xs, ys):
+        return np.abs(xs - self.cx) / (self.w / 2) + np.abs(ys - self.cy) / (self.h / 2) <= 1
+
 
 class SemiCircleZone(TargetZone):
     """
@@ -61,6 +102,20 @@ class SemiCircleZone(TargetZone):
         self.radius = radius
         self.direction = direction
 
+        x_min, y_min = center_x - radius, center_y - radius
+        x_max, y_max = center_x + radius, center_y + radius
+        if direction == 'right':
+            x_min = center_x
+        elif direction == 'left':
+            x_max = center_x
+        elif direction == 'up':
+            y_min = center_y
+        elif direction == 'down':
+            y_max = center_y
+        else:
+            x_min, y_min, x_max, y_max = math.inf, math.inf, -math.inf, -math.inf
+        self.bbox = (x_min, y_min, x_max, y_max)
+
     def contains(self, x, y):
         dist = math.hypot(self.cx - x, self.cy - y)
         if dist > self.radius:
@@ -76,3 +131,7 @@ class SemiCircleZone(TargetZone):
             return y <= self.cy
         else:
             return False
+
+    def _contains_arrays(self, xs, ys):
+        # Nửa mặt phẳng đã được bbox xử lý, chỉ còn kiểm tra bán kính
+        return np.hypot(self.cx - xs, self.cy - ys) <= self.radius
@@ -6,9 +6,12 @@ from PyQt5.QtCore import Qt
 
 from zones.target_zone import CircleZone, RectangleZone, DiamondZone, SemiCircleZone
 
-def draw_target_zone(scene, target_zone, scale, margin):
-    pen = QPen(QColor(255, 0, 0), 2, Qt.DashLine)
-    brush = QBrush(QColor(255, 255, 0, 100))
+def draw_target_zone(scene, target_zone, scale, margin, pen=None, brush=None):
+    """Thêm hình target zone vào scene và trả về item đã tạo (None nếu không rõ loại zone)."""
+    if pen is None:
+        pen = QPen(QColor(255, 0, 0), 2, Qt.DashLine)
+    if brush is None:
+        brush = QBrush(QColor(255, 255, 0, 100))
 
     if isinstance(target_zone, CircleZone):
         cx_pix = margin + (target_zone.cx + 11.0) * scale
@@ -20,6 +23,7 @@ def draw_target_zone(scene, target_zone, scale, margin):
         ellipse.setPen(pen)
         ellipse.setBrush(brush)
         scene.addItem(ellipse)
+        return ellipse
 
     elif isinstance(target_zone, RectangleZone):
         cx_pix = margin + (target_zone.cx + 11.0) * scale
@@ -31,6 +35,7 @@ def draw_target_zone(scene, target_zone, scale, margin):
         rect.setPen(pen)
         rect.setBrush(brush)
         scene.addItem(rect)
+        return rect
 
     elif isinstance(target_zone, DiamondZone):
         cx_pix = margin + (target_zone.cx + 11.0) * scale
@@ -49,6 +54,7 @@ def draw_target_zone(scene, target_zone, scale, margin):
         diamond.setPen(pen)
         diamond.setBrush(brush)
         scene.addItem(diamond)
+        return diamond
 
     elif isinstance(target_zone, SemiCircleZone):
         cx_pix = margin + (target_zone.cx + 11.0) * scale
@@ -79,6 +85,8 @@ def draw_target_zone(scene, target_zone, scale, margin):
         semi.setPen(pen)
         semi.setBrush(brush)
         scene.addItem(semi)
+        return semi
 
     else:
         print("Unknown target zone type!")
+        return None